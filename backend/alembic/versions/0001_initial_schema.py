@@ -0,0 +1,214 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('customers',
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('business_name', sa.String(length=200), nullable=False),
+    sa.Column('customer_type', sa.String(length=50), nullable=True),
+    sa.Column('contact_person', sa.String(length=100), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('location', sa.String(length=200), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('customer_id')
+    )
+    op.create_index('ix_customers_customer_id', 'customers', ['customer_id'], unique=False)
+
+    op.create_table('order_statuses',
+    sa.Column('status_id', sa.Integer(), nullable=False),
+    sa.Column('status_name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('status_id'),
+    sa.UniqueConstraint('status_name')
+    )
+    op.create_index('ix_order_statuses_status_id', 'order_statuses', ['status_id'], unique=False)
+
+    op.create_table('product_categories',
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('category_name', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('category_id'),
+    sa.UniqueConstraint('category_name')
+    )
+    op.create_index('ix_product_categories_category_id', 'product_categories', ['category_id'], unique=False)
+
+    op.create_table('staff',
+    sa.Column('staff_id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=False),
+    sa.Column('role', sa.String(length=100), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('staff_id')
+    )
+    op.create_index('ix_staff_staff_id', 'staff', ['staff_id'], unique=False)
+
+    op.create_table('suppliers',
+    sa.Column('supplier_id', sa.Integer(), nullable=False),
+    sa.Column('supplier_name', sa.String(length=200), nullable=False),
+    sa.Column('supplier_type', sa.String(length=500), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('location', sa.String(length=200), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('supplier_id')
+    )
+    op.create_index('ix_suppliers_supplier_id', 'suppliers', ['supplier_id'], unique=False)
+
+    op.create_table('orders',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('order_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('order_status', sa.String(length=50), nullable=True),
+    sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['staff.staff_id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.customer_id'], ),
+    sa.PrimaryKeyConstraint('order_id')
+    )
+    op.create_index('ix_orders_order_id', 'orders', ['order_id'], unique=False)
+
+    op.create_table('procurements',
+    sa.Column('procurement_id', sa.Integer(), nullable=False),
+    sa.Column('supplier_id', sa.Integer(), nullable=False),
+    sa.Column('procurement_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('total_cost', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('recorded_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['recorded_by'], ['staff.staff_id'], ),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.supplier_id'], ),
+    sa.PrimaryKeyConstraint('procurement_id')
+    )
+    op.create_index('ix_procurements_procurement_id', 'procurements', ['procurement_id'], unique=False)
+
+    op.create_table('products',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('product_name', sa.String(length=200), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('unit_of_measure', sa.String(length=20), nullable=True),
+    sa.Column('perishability_days', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['product_categories.category_id'], ),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index('ix_products_product_id', 'products', ['product_id'], unique=False)
+
+    op.create_table('deliveries',
+    sa.Column('delivery_id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('delivery_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('delivery_status', sa.String(length=50), nullable=True),
+    sa.Column('delivered_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['delivered_by'], ['staff.staff_id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ),
+    sa.PrimaryKeyConstraint('delivery_id')
+    )
+    op.create_index('ix_deliveries_delivery_id', 'deliveries', ['delivery_id'], unique=False)
+
+    op.create_table('inventory_movements',
+    sa.Column('movement_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('movement_type', sa.String(length=20), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('reference_id', sa.Integer(), nullable=True),
+    sa.Column('movement_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('recorded_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.ForeignKeyConstraint(['recorded_by'], ['staff.staff_id'], ),
+    sa.PrimaryKeyConstraint('movement_id')
+    )
+    op.create_index('ix_inventory_movements_movement_id', 'inventory_movements', ['movement_id'], unique=False)
+
+    op.create_table('order_items',
+    sa.Column('order_item_id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.PrimaryKeyConstraint('order_item_id')
+    )
+    op.create_index('ix_order_items_order_item_id', 'order_items', ['order_item_id'], unique=False)
+
+    op.create_table('payments',
+    sa.Column('payment_id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('amount_paid', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('payment_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ),
+    sa.PrimaryKeyConstraint('payment_id')
+    )
+    op.create_index('ix_payments_payment_id', 'payments', ['payment_id'], unique=False)
+
+    op.create_table('procurement_items',
+    sa.Column('procurement_item_id', sa.Integer(), nullable=False),
+    sa.Column('procurement_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('unit_cost', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['procurement_id'], ['procurements.procurement_id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.PrimaryKeyConstraint('procurement_item_id')
+    )
+    op.create_index('ix_procurement_items_procurement_item_id', 'procurement_items', ['procurement_item_id'], unique=False)
+
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_procurement_items_procurement_item_id', table_name='procurement_items')
+    op.drop_table('procurement_items')
+    op.drop_index('ix_payments_payment_id', table_name='payments')
+    op.drop_table('payments')
+    op.drop_index('ix_order_items_order_item_id', table_name='order_items')
+    op.drop_table('order_items')
+    op.drop_index('ix_inventory_movements_movement_id', table_name='inventory_movements')
+    op.drop_table('inventory_movements')
+    op.drop_index('ix_deliveries_delivery_id', table_name='deliveries')
+    op.drop_table('deliveries')
+    op.drop_index('ix_products_product_id', table_name='products')
+    op.drop_table('products')
+    op.drop_index('ix_procurements_procurement_id', table_name='procurements')
+    op.drop_table('procurements')
+    op.drop_index('ix_orders_order_id', table_name='orders')
+    op.drop_table('orders')
+    op.drop_index('ix_suppliers_supplier_id', table_name='suppliers')
+    op.drop_table('suppliers')
+    op.drop_index('ix_staff_staff_id', table_name='staff')
+    op.drop_table('staff')
+    op.drop_index('ix_product_categories_category_id', table_name='product_categories')
+    op.drop_table('product_categories')
+    op.drop_index('ix_order_statuses_status_id', table_name='order_statuses')
+    op.drop_table('order_statuses')
+    op.drop_index('ix_customers_customer_id', table_name='customers')
+    op.drop_table('customers')
@@ -0,0 +1,45 @@
+"""stock balances
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_balances',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('stock_in', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('stock_out', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+
+    # Seed balances from the existing ledger (same rules as app.services.stock)
+    op.execute("""
+        INSERT INTO stock_balances (product_id, stock_in, stock_out)
+        SELECT product_id,
+               SUM(CASE WHEN movement_type = 'IN' THEN quantity ELSE 0 END),
+               SUM(CASE WHEN movement_type IN ('OUT', 'SPOILAGE') THEN quantity ELSE 0 END)
+        FROM inventory_movements
+        GROUP BY product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stock_balances')
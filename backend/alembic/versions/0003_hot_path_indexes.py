@@ -0,0 +1,42 @@
+"""hot path indexes
+
+Composite indexes for the stock aggregation, customer order history, order
+item lookups and keyset pagination on orders and movements.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # On Postgres quantity rides along as an INCLUDE column so stock sums are index-only
+    op.create_index('ix_inventory_movements_product_type', 'inventory_movements',
+                    ['product_id', 'movement_type'], unique=False, postgresql_include=['quantity'])
+    op.create_index('ix_inventory_movements_date_id', 'inventory_movements',
+                    ['movement_date', 'movement_id'], unique=False)
+    op.create_index('ix_orders_customer_date', 'orders', ['customer_id', 'order_date'], unique=False)
+    op.create_index('ix_orders_date_id', 'orders', ['order_date', 'order_id'], unique=False)
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_date_id', table_name='orders')
+    op.drop_index('ix_orders_customer_date', table_name='orders')
+    op.drop_index('ix_inventory_movements_date_id', table_name='inventory_movements')
+    op.drop_index('ix_inventory_movements_product_type', table_name='inventory_movements')
@@ -0,0 +1,33 @@
+"""order child indexes
+
+Index payments and deliveries by order_id so embedding them in order
+responses (selectinload ... WHERE order_id IN (...)) doesn't scan.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_payments_order_id', 'payments', ['order_id'], unique=False)
+    op.create_index('ix_deliveries_order_id', 'deliveries', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deliveries_order_id', table_name='deliveries')
+    op.drop_index('ix_payments_order_id', table_name='payments')
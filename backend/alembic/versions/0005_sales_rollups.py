@@ -0,0 +1,63 @@
+"""sales rollups
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rollup_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('high_water', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('daily_customer_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.customer_id'], ),
+    sa.PrimaryKeyConstraint('day', 'customer_id')
+    )
+    op.create_index('ix_daily_customer_rollups_customer_day', 'daily_customer_rollups', ['customer_id', 'day'], unique=False)
+    op.create_table('daily_sales_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.customer_id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.PrimaryKeyConstraint('day', 'product_id', 'customer_id')
+    )
+    op.create_index('ix_daily_sales_rollups_product_day', 'daily_sales_rollups', ['product_id', 'day'], unique=False)
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'], unique=False)
+    op.create_index('ix_orders_updated_at', 'orders', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_updated_at', table_name='orders')
+    op.drop_index('ix_orders_created_at', table_name='orders')
+    op.drop_index('ix_daily_sales_rollups_product_day', table_name='daily_sales_rollups')
+    op.drop_table('daily_sales_rollups')
+    op.drop_index('ix_daily_customer_rollups_customer_day', table_name='daily_customer_rollups')
+    op.drop_table('daily_customer_rollups')
+    op.drop_table('rollup_watermarks')
@@ -0,0 +1,38 @@
+"""stock checkpoints
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_checkpoints',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('checkpoint_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('stock_in', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('stock_out', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.PrimaryKeyConstraint('product_id', 'checkpoint_at')
+    )
+    # Checkpoints are backfilled by `python -m app.services.stock checkpoint`
+    op.create_index('ix_inventory_movements_product_date', 'inventory_movements', ['product_id', 'movement_date'], unique=False, postgresql_include=['movement_type', 'quantity'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_movements_product_date', table_name='inventory_movements')
+    op.drop_table('stock_checkpoints')
@@ -0,0 +1,31 @@
+"""procurement status
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # every existing procurement was recorded on receipt
+    op.add_column('procurements', sa.Column('status', sa.String(length=20), server_default='received', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # SQLite can only drop columns by copying the table
+    with op.batch_alter_table('procurements', schema=None) as batch_op:
+        batch_op.drop_column('status')
@@ -0,0 +1,63 @@
+"""inventory lots
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('inventory_lots',
+    sa.Column('lot_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('movement_id', sa.Integer(), nullable=False),
+    sa.Column('received_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('quantity_received', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('quantity_remaining', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['movement_id'], ['inventory_movements.movement_id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.PrimaryKeyConstraint('lot_id'),
+    sa.UniqueConstraint('movement_id')
+    )
+    op.create_index('ix_inventory_lots_expires_at', 'inventory_lots', ['expires_at'], unique=False)
+    op.create_index('ix_inventory_lots_lot_id', 'inventory_lots', ['lot_id'], unique=False)
+    op.create_index('ix_inventory_lots_product_expiry', 'inventory_lots', ['product_id', 'expires_at'], unique=False)
+    op.create_table('inventory_lot_allocations',
+    sa.Column('allocation_id', sa.Integer(), nullable=False),
+    sa.Column('lot_id', sa.Integer(), nullable=False),
+    sa.Column('movement_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['lot_id'], ['inventory_lots.lot_id'], ),
+    sa.ForeignKeyConstraint(['movement_id'], ['inventory_movements.movement_id'], ),
+    sa.PrimaryKeyConstraint('allocation_id')
+    )
+    op.create_index('ix_inventory_lot_allocations_allocation_id', 'inventory_lot_allocations', ['allocation_id'], unique=False)
+    op.create_index('ix_inventory_lot_allocations_lot_id', 'inventory_lot_allocations', ['lot_id'], unique=False)
+    op.create_index('ix_inventory_lot_allocations_movement_id', 'inventory_lot_allocations', ['movement_id'], unique=False)
+    # Lots for existing movements are built by `python -m app.services.lots rebuild`
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_lot_allocations_movement_id', table_name='inventory_lot_allocations')
+    op.drop_index('ix_inventory_lot_allocations_lot_id', table_name='inventory_lot_allocations')
+    op.drop_index('ix_inventory_lot_allocations_allocation_id', table_name='inventory_lot_allocations')
+    op.drop_table('inventory_lot_allocations')
+    op.drop_index('ix_inventory_lots_product_expiry', table_name='inventory_lots')
+    op.drop_index('ix_inventory_lots_lot_id', table_name='inventory_lots')
+    op.drop_index('ix_inventory_lots_expires_at', table_name='inventory_lots')
+    op.drop_table('inventory_lots')
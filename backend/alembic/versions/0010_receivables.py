@@ -0,0 +1,73 @@
+"""receivables
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('customer_balances',
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('billed_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('amount_paid', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('outstanding', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.customer_id'], ),
+    sa.PrimaryKeyConstraint('customer_id')
+    )
+    op.create_table('order_balances',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('order_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('billed_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('amount_paid', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('outstanding', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.customer_id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ),
+    sa.PrimaryKeyConstraint('order_id')
+    )
+    op.create_index('ix_order_balances_customer_id', 'order_balances', ['customer_id'], unique=False)
+    op.create_index('ix_order_balances_outstanding_date', 'order_balances', ['outstanding', 'order_date'], unique=False)
+
+    # Seed balances from existing orders and payments (same rules as app.services.receivables)
+    op.execute("""
+        INSERT INTO order_balances (order_id, customer_id, order_date, billed_amount, amount_paid, outstanding)
+        SELECT order_id, customer_id, order_date, billed, paid, billed - paid
+        FROM (
+            SELECT o.order_id, o.customer_id, o.order_date,
+                   CASE WHEN o.order_status = 'cancelled' THEN 0 ELSE COALESCE(o.total_amount, 0) END AS billed,
+                   COALESCE(p.paid, 0) AS paid
+            FROM orders o
+            LEFT JOIN (SELECT order_id, SUM(amount_paid) AS paid FROM payments GROUP BY order_id) p
+                ON p.order_id = o.order_id
+        ) balances
+    """)
+    op.execute("""
+        INSERT INTO customer_balances (customer_id, billed_amount, amount_paid, outstanding)
+        SELECT customer_id, SUM(billed_amount), SUM(amount_paid), SUM(outstanding)
+        FROM order_balances
+        GROUP BY customer_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_balances_outstanding_date', table_name='order_balances')
+    op.drop_index('ix_order_balances_customer_id', table_name='order_balances')
+    op.drop_table('order_balances')
+    op.drop_table('customer_balances')
@@ -0,0 +1,39 @@
+"""search trigram indexes
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the gin_trgm_ops indexes need pg_trgm; other databases get plain indexes
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_customers_business_name_trgm', 'customers', ['business_name'], unique=False, postgresql_using='gin', postgresql_ops={'business_name': 'gin_trgm_ops'})
+    op.create_index('ix_customers_location_trgm', 'customers', ['location'], unique=False, postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+    op.create_index('ix_products_product_name_trgm', 'products', ['product_name'], unique=False, postgresql_using='gin', postgresql_ops={'product_name': 'gin_trgm_ops'})
+    op.create_index('ix_suppliers_location_trgm', 'suppliers', ['location'], unique=False, postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+    op.create_index('ix_suppliers_supplier_name_trgm', 'suppliers', ['supplier_name'], unique=False, postgresql_using='gin', postgresql_ops={'supplier_name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_suppliers_supplier_name_trgm', table_name='suppliers')
+    op.drop_index('ix_suppliers_location_trgm', table_name='suppliers')
+    op.drop_index('ix_products_product_name_trgm', table_name='products')
+    op.drop_index('ix_customers_location_trgm', table_name='customers')
+    op.drop_index('ix_customers_business_name_trgm', table_name='customers')
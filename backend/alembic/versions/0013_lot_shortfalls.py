@@ -0,0 +1,33 @@
+"""lot shortfalls
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 20:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, Sequence[str], None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # an allocation without a lot records stock an OUT/SPOILAGE movement took that no lot held;
+    # existing lots predate shortfall tracking, so run `python -m app.services.lots rebuild` to record them
+    with op.batch_alter_table('inventory_lot_allocations', schema=None) as batch_op:
+        batch_op.alter_column('lot_id', existing_type=sa.Integer(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM inventory_lot_allocations WHERE lot_id IS NULL")
+    with op.batch_alter_table('inventory_lot_allocations', schema=None) as batch_op:
+        batch_op.alter_column('lot_id', existing_type=sa.Integer(), nullable=False)
@@ -0,0 +1,173 @@
+"""Read-through cache for reference data, with HTTP validators.
+
+Reference data (categories, products, customers, suppliers) is read far more
+often than it changes. Responses are cached as rendered JSON together with an
+ETag and Last-Modified, so a conditional request that matches the cached entry
+is answered with 304 without touching the database.
+
+Entries are keyed by a per-namespace version plus the item id or the query
+string; a write bumps the version so every cached item and page of the
+namespace is skipped at once. The key is taken before the database is read,
+so a response loaded while a write commits is stored under the old version
+and never served.
+
+CACHE_URL selects the backend: "memory://" (per-process LRU with TTL, the
+default) or "redis://..." to share entries between workers.
+"""
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Optional, Tuple
+
+from cachetools import TTLCache
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.serialization import dumps
+
+try:
+    import redis
+except ImportError:  # optional, only needed for a shared cache
+    redis = None
+
+
+class MemoryCache:
+    """In-process LRU cache with a TTL on every entry"""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self._entries = TTLCache(maxsize=max_entries, ttl=ttl)
+        # Versions must never be evicted, or stale list entries could come back
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, entry: dict):
+        with self._lock:
+            self._entries[key] = entry
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def version(self, namespace: str) -> int:
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisCache:
+    """Cache shared by every worker, stored in Redis"""
+
+    def __init__(self, url: str, ttl: int, prefix: str = "erp:cache:"):
+        if redis is None:
+            raise RuntimeError("CACHE_URL points at Redis but the redis package is not installed")
+        self._client = redis.Redis.from_url(url)
+        self._ttl = ttl
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[dict]:
+        raw = self._client.get(self._prefix + key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, entry: dict):
+        self._client.set(self._prefix + key, json.dumps(entry), ex=self._ttl)
+
+    def delete(self, *keys: str):
+        if keys:
+            self._client.delete(*(self._prefix + key for key in keys))
+
+    def version(self, namespace: str) -> int:
+        return int(self._client.get(self._prefix + "version:" + namespace) or 0)
+
+    def bump(self, namespace: str):
+        self._client.incr(self._prefix + "version:" + namespace)
+
+    def clear(self):
+        for key in self._client.scan_iter(self._prefix + "*"):
+            self._client.delete(key)
+
+
+def build_cache():
+    if settings.CACHE_URL.startswith("redis"):
+        return RedisCache(settings.CACHE_URL, settings.CACHE_TTL)
+    return MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL)
+
+
+cache = build_cache()
+
+
+def item_key(namespace: str, item_id) -> str:
+    return f"{namespace}:item:v{cache.version(namespace)}:{item_id}"
+
+
+def list_key(namespace: str, request: Request) -> str:
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return f"{namespace}:list:v{cache.version(namespace)}:{query}"
+
+
+def invalidate(namespace: str, *item_ids):
+    """Drop the cached items that changed and skip every other entry in the namespace"""
+    cache.delete(*(item_key(namespace, item_id) for item_id in item_ids))
+    cache.bump(namespace)
+
+
+def _not_modified(request: Request, entry: dict) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or entry["etag"] in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(entry["last_modified"]) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _respond(request: Request, entry: dict) -> Response:
+    headers = {
+        "ETag": entry["etag"],
+        "Last-Modified": formatdate(entry["last_modified"], usegmt=True),
+        # clients may keep a copy but must revalidate it
+        "Cache-Control": "no-cache",
+        **entry["headers"],
+    }
+    if _not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def cached_response(request: Request, key: str, load: Callable[[], Tuple[object, dict]]) -> Response:
+    """Serve a JSON response from the cache, calling load() to fill it on a miss.
+
+    load returns (content, extra_headers); content is anything dumps() accepts,
+    normally *Read schema(s) or rows_to_dicts() output. Exceptions from load
+    (such as a 404) are not cached.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        content, headers = load()
+        body = dumps(content)
+        entry = {
+            "body": body.decode(),
+            "etag": '"' + hashlib.sha1(body).hexdigest() + '"',
+            "last_modified": time.time(),
+            "headers": headers or {},
+        }
+        cache.set(key, entry)
+    return _respond(request, entry)
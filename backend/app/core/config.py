@@ -5,6 +5,50 @@ class Settings(BaseSettings):
     #Database
     DATABASE_URL: str
 
+    #Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+
+    #Reference data cache: "memory://" (per process) or "redis://host:6379/0" (shared)
+    CACHE_URL: str = "memory://"
+    CACHE_TTL: int = 300  # seconds
+    CACHE_MAX_ENTRIES: int = 10000
+
+    # Run route handlers on the async engine (asyncpg / aiosqlite)
+    USE_ASYNC_DB: bool = False
+
+    #Stock checkpoints for point-in-time stock: "day" or "month"
+    STOCK_CHECKPOINT_PERIOD: str = "month"
+
+    #Demand forecasting: "moving_average", "seasonal" or "catboost"
+    FORECAST_METHOD: str = "seasonal"
+    FORECAST_HORIZON_DAYS: int = 7
+    FORECAST_HISTORY_DAYS: int = 112
+
+    #Replenishment suggestions (in days of forecast demand)
+    REPLENISHMENT_LEAD_DAYS: int = 1  # order to delivery
+    REPLENISHMENT_REVIEW_DAYS: int = 7  # how long one order should last
+    REPLENISHMENT_SAFETY_DAYS: float = 1.0
+
+    #Search: word similarity (0-1) a match needs, and how long the in-process index lives (seconds)
+    SEARCH_MIN_SIMILARITY: float = 0.5
+    SEARCH_INDEX_TTL: int = 300
+
+    #Log requests slower than this (ms) with the SQL they ran; unset disables the log
+    SLOW_REQUEST_MS: Optional[int] = None
+
+    #Per-route SQL budgets (statements and rows per request): "off", "warn" (log) or "raise" (fail the request)
+    QUERY_BUDGET_MODE: str = "warn"
+
+    #Background jobs: worker threads per process, jobs allowed to wait or run at once, where file results go and for how many days
+    JOB_WORKERS: int = 2
+    JOB_QUEUE_LIMIT: int = 20
+    JOB_OUTPUT_DIR: str = "job_output"
+    JOB_OUTPUT_RETENTION_DAYS: int = 7
+
     #API SETTINGS
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Terra Foods EMS"
@@ -1,20 +1,29 @@
-from app.core.database import engine, Base
-
-# Import all models so they're registered with Base
-from app.models.product import Product, ProductCategory
-from app.models.supplier import Supplier
-from app.models.customer import Customer
-from app.models.staff import Staff
-from app.models.procurement import Procurement, ProcurementItem
-from app.models.order import Order, OrderItem, OrderStatus
-from app.models.inventory import InventoryMovement
-from app.models.delivery import Delivery
-from app.models.payment import Payment
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.core.database import engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Revision that matches the schema init_db used to build with create_all
+PRE_ALEMBIC_REVISION = "0001"
 
 def init_db():
-    """Create all tables in the database"""
-    Base.metadata.create_all(bind=engine)
-    print("✅ All tables created successfully!")
+    """Bring the database schema up to date by running the Alembic migrations"""
+    config = Config(str(ALEMBIC_INI))
+
+    # Databases created before migrations existed have the tables but no
+    # alembic_version; mark them as the initial schema so only newer
+    # migrations run.
+    tables = inspect(engine).get_table_names()
+    if "products" in tables and "alembic_version" not in tables:
+        command.stamp(config, PRE_ALEMBIC_REVISION)
+
+    command.upgrade(config, "head")
+    print("✅ Database schema is up to date!")
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
@@ -0,0 +1,354 @@
+"""Request and SQL metrics in Prometheus text format.
+
+MetricsMiddleware times every request and records it per route template
+(/api/v1/orders/{order_id}, not the concrete path) with its status code,
+alongside the number of requests in flight. SQLAlchemy cursor events count the
+statements each request issues and the time spent in them; the request is
+found through a context variable, which reaches the threadpool (sync
+handlers) and AsyncSession.run_sync (async mode) alike.
+
+With SLOW_REQUEST_MS set, requests slower than that are logged together with
+the SQL they ran. Numbers are per process, like the pool statistics, which
+are exported alongside.
+
+Routers and routes declare a QueryBudget: the most statements and rows (rows
+fetched by SELECTs plus rows written) one request may use. QUERY_BUDGET_MODE
+decides what going over does: "warn" logs the request with its SQL, "raise"
+fails it with QueryBudgetExceeded as soon as it happens (for tests and CI,
+where an N+1 should break the build), "off" ignores budgets. count_queries()
+applies a budget to a block of code outside a request.
+"""
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# statements kept per request for the slow-request log
+MAX_CAPTURED_STATEMENTS = 50
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus exposes it"""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: str) -> list:
+        lines, total = [], 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {total}")
+        return lines
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more SQL, or touched more rows, than its budget allows"""
+
+
+class QueryBudget:
+    """Most SQL statements and rows one request may use; None leaves a limit open.
+
+    A FastAPI dependency: pass it in a router's or route's dependencies (a
+    route's own budget overrides its router's), or use @query_budget.
+    """
+
+    def __init__(self, statements: Optional[int] = None, rows: Optional[int] = None):
+        self.statements = statements
+        self.rows = rows
+
+    async def __call__(self, request: Request):
+        stats = _current_request.get()
+        if stats is not None:
+            stats.budget = self
+            stats.subject = f"{request.method} {request.url.path}"
+
+
+def query_budget(statements: Optional[int] = None, rows: Optional[int] = None):
+    """Give one route its own budget. Goes below the @router decorator; DatabaseRoute picks it up."""
+    def decorate(endpoint):
+        endpoint.query_budget = QueryBudget(statements, rows)
+        return endpoint
+    return decorate
+
+
+class RequestStats:
+    """SQL issued while serving one request"""
+
+    def __init__(self, capture: bool, enforce: bool = False):
+        self.statements = 0
+        self.rows = 0  # rows fetched plus rows inserted, updated or deleted
+        self.db_seconds = 0.0
+        self.captured = [] if capture else None
+        self.budget = None
+        self.enforce = enforce  # raise QueryBudgetExceeded once over budget
+        self.subject = "request"
+
+    def record(self, statement: str, seconds: float, rows: int):
+        self.statements += 1
+        self.rows += rows
+        self.db_seconds += seconds
+        if self.captured is not None and len(self.captured) < MAX_CAPTURED_STATEMENTS:
+            self.captured.append((seconds, statement))
+        if self.enforce:
+            self.check()
+
+    def fetched(self, rows: int):
+        self.rows += rows
+        if self.enforce and rows:
+            self.check()
+
+    def over_budget(self) -> list:
+        """What the request went over, e.g. ["12 SQL statements (budget 10)"]"""
+        if self.budget is None:
+            return []
+        over = []
+        if self.budget.statements is not None and self.statements > self.budget.statements:
+            over.append(f"{self.statements} SQL statements (budget {self.budget.statements})")
+        if self.budget.rows is not None and self.rows > self.budget.rows:
+            over.append(f"{self.rows} rows (budget {self.budget.rows})")
+        return over
+
+    def check(self):
+        over = self.over_budget()
+        if over:
+            self.enforce = False  # report once; the rollback and cleanup still run
+            raise QueryBudgetExceeded("\n".join([f"{self.subject} went over its query budget: {', '.join(over)}"]
+                                                 + _statement_lines(self)))
+
+
+_current_request = contextvars.ContextVar("current_request", default=None)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = defaultdict(int)  # (method, route, status) -> count
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))  # (method, route)
+        self.statements = defaultdict(lambda: Histogram(STATEMENT_BUCKETS))  # (method, route), per request
+        self.db_seconds = defaultdict(float)  # (method, route)
+        self.untracked_statements = 0  # outside any request: startup, CLIs, background work
+
+    def start(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[(method, route, status)] += 1
+            self.latency[(method, route)].observe(seconds)
+            self.statements[(method, route)].observe(stats.statements)
+            self.db_seconds[(method, route)] += stats.db_seconds
+
+    def attach(self, engine):
+        """Count statements run on a (sync) engine towards the current request"""
+        def before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        def after(conn, cursor, statement, parameters, context, executemany):
+            seconds = time.perf_counter() - conn.info["query_started"].pop()
+            stats = _current_request.get()
+            if stats is not None:
+                written = 0
+                if context is not None and context.is_crud:
+                    written = max(cursor.rowcount, 0)
+                elif context is not None and cursor.description is not None:
+                    # the result reads its rows from context.cursor, so they are counted as they are fetched
+                    context.cursor = _CountingCursor(cursor, stats)
+                stats.record(statement, seconds, written)
+            else:
+                with self._lock:
+                    self.untracked_statements += 1
+
+        event.listen(engine, "before_cursor_execute", before)
+        event.listen(engine, "after_cursor_execute", after)
+
+    def render(self, pools: dict) -> str:
+        """Everything in Prometheus text exposition format"""
+        lines = [
+            "# HELP http_requests_in_flight Requests being served right now",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        with self._lock:
+            lines.append(f"http_requests_in_flight {self.in_flight}")
+            lines += ["# HELP http_requests_total Requests served, by route and status",
+                      "# TYPE http_requests_total counter"]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+            lines += ["# HELP http_request_duration_seconds Request latency, by route",
+                      "# TYPE http_request_duration_seconds histogram"]
+            for key, histogram in sorted(self.latency.items()):
+                lines += histogram.lines("http_request_duration_seconds", _labels(*key))
+            lines += ["# HELP http_request_db_statements SQL statements issued per request, by route",
+                      "# TYPE http_request_db_statements histogram"]
+            for key, histogram in sorted(self.statements.items()):
+                lines += histogram.lines("http_request_db_statements", _labels(*key))
+            lines += ["# HELP http_request_db_seconds_total Time spent running SQL, by route",
+                      "# TYPE http_request_db_seconds_total counter"]
+            for key, seconds in sorted(self.db_seconds.items()):
+                lines.append(f"http_request_db_seconds_total{{{_labels(*key)}}} {seconds:.6f}")
+            lines += ["# HELP db_untracked_statements_total SQL statements run outside a request",
+                      "# TYPE db_untracked_statements_total counter",
+                      f"db_untracked_statements_total {self.untracked_statements}"]
+
+        for name, snapshot in pools.items():
+            for key, value in snapshot.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f'db_pool_{key}{{engine="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.latency.clear()
+            self.statements.clear()
+            self.db_seconds.clear()
+            self.untracked_statements = 0
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+metrics = Metrics()
+
+
+class _CountingCursor:
+    """A DBAPI cursor that adds the rows fetched through it to a request's stats"""
+
+    def __init__(self, cursor, stats: RequestStats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._stats.fetched(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._stats.fetched(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.fetched(len(rows))
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+@contextmanager
+def count_queries(statements: Optional[int] = None, rows: Optional[int] = None):
+    """Count the SQL run inside the block; with limits, enforce them like QUERY_BUDGET_MODE=raise.
+
+        with count_queries(statements=3) as stats:
+            list_orders(...)
+        assert stats.rows <= 100
+    """
+    stats = RequestStats(capture=True, enforce=True)
+    stats.budget = QueryBudget(statements, rows)
+    stats.subject = "block"
+    token = _current_request.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_request.reset(token)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and SQL per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        budgets = settings.QUERY_BUDGET_MODE
+        stats = RequestStats(capture=settings.SLOW_REQUEST_MS is not None or budgets != "off",
+                             enforce=budgets == "raise")
+        token = _current_request.set(stats)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - start
+            _current_request.reset(token)
+            metrics.finish(scope["method"], _route_template(scope), status, seconds, stats)
+            if settings.SLOW_REQUEST_MS is not None and seconds * 1000 >= settings.SLOW_REQUEST_MS:
+                _log_slow_request(scope, status, seconds, stats)
+            elif budgets == "warn" and stats.over_budget():
+                logger.warning("\n".join([f"{stats.subject} went over its query budget: {', '.join(stats.over_budget())}"]
+                                          + _statement_lines(stats)))
+
+
+def _route_template(scope) -> str:
+    """The matched route with its router prefix, e.g. /api/v1/orders/{order_id}.
+
+    The router leaves the matched route in the scope. Depending on the FastAPI
+    version its path may lack the include_router prefix, so the prefix is taken
+    from the request path, which has the same number of segments as the route
+    after it. Unmatched paths share one label to keep the series bounded.
+    """
+    route_path = getattr(scope.get("route"), "path", None)
+    if not route_path:
+        return UNMATCHED_ROUTE
+    segments = scope["path"].split("/")
+    prefix = "/".join(segments[:len(segments) - len(route_path.split("/")) + 1])
+    return prefix + route_path
+
+
+def _log_slow_request(scope, status: int, seconds: float, stats: RequestStats):
+    path = scope["path"] + (f"?{scope['query_string'].decode()}" if scope.get("query_string") else "")
+    over = stats.over_budget()
+    lines = [f"Slow request: {scope['method']} {path} -> {status} in {seconds * 1000:.1f}ms, "
+             f"{stats.statements} SQL statements in {stats.db_seconds * 1000:.1f}ms"
+             + (f", over its query budget: {', '.join(over)}" if over else "")]
+    logger.warning("\n".join(lines + _statement_lines(stats)))
+
+
+def _statement_lines(stats: RequestStats) -> list:
+    lines = [f"  [{seconds * 1000:.1f}ms] {' '.join(statement.split())}" for seconds, statement in stats.captured]
+    if stats.statements > len(stats.captured):
+        lines.append(f"  ... {stats.statements - len(stats.captured)} more")
+    return lines
@@ -0,0 +1,96 @@
+"""Live connection pool statistics.
+
+Counts pool events (connects, closes, checkouts, invalidations) and times how
+long callers wait for a connection, so pool size and overflow can be tuned
+from what the workers actually see. Numbers are per process.
+"""
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.pool = None
+
+    def _incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def attach(self, engine):
+        """Listen to pool events on a (sync) engine"""
+        self.pool = engine.pool
+        event.listen(engine, "connect", lambda *args: self._incr("connects"))
+        event.listen(engine, "close", lambda *args: self._incr("closes"))
+        event.listen(engine, "close_detached", lambda *args: self._incr("closes"))
+        event.listen(engine, "invalidate", lambda *args: self._incr("invalidations"))
+        event.listen(engine, "checkout", lambda *args: self._incr("checkouts"))
+        event.listen(engine, "checkin", lambda *args: self._incr("checkins"))
+        # the pool is replaced on engine.dispose(); keep reporting the live one
+        event.listen(engine, "engine_disposed", lambda e: setattr(self, "pool", e.pool))
+
+    def snapshot(self) -> dict:
+        uptime = time.time() - self.started
+        with self._lock:
+            stats = {
+                "uptime_seconds": round(uptime, 1),
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(1000 * self.wait_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max, 3),
+                # connections opened per minute; high churn means the pool is too small or recycles too often
+                "churn_per_minute": round(60 * self.connects / uptime, 2) if uptime else 0.0,
+            }
+        pool = self.pool
+        stats["pool_class"] = type(pool).__name__ if pool is not None else None
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            })
+        return stats
+
+
+def monitored_pool_class(base, stats: PoolStats):
+    """Subclass a QueuePool so time spent waiting in checkout is recorded"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return base._do_get(self)
+        except exc.TimeoutError:
+            stats._incr("timeouts")
+            raise
+        finally:
+            stats.record_wait(time.perf_counter() - start)
+
+    return type(f"Monitored{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+sync_pool_stats = PoolStats("sync")
+async_pool_stats = PoolStats("async")
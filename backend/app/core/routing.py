@@ -0,0 +1,61 @@
+"""Route class that moves handlers onto the async engine behind a setting.
+
+Handlers are written once against a sync Session. With USE_ASYNC_DB enabled,
+every handler that depends on get_db is wrapped in an `async def` that takes an
+AsyncSession instead and runs the original body through AsyncSession.run_sync.
+The DB I/O then awaits on the event loop (asyncpg/aiosqlite) rather than
+blocking one of FastAPI's threadpool workers per request.
+
+It also applies a handler's @query_budget, after any budget of its router.
+"""
+import inspect
+
+from fastapi import Depends
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
+
+
+def _db_parameter(signature: inspect.Signature):
+    for param in signature.parameters.values():
+        if isinstance(param.default, DependsParam) and param.default.dependency is get_db:
+            return param
+    return None
+
+
+def run_on_async_session(endpoint):
+    """Wrap a sync get_db handler so it runs on an AsyncSession"""
+    if inspect.iscoroutinefunction(endpoint):
+        return endpoint
+    signature = inspect.signature(endpoint)
+    db_param = _db_parameter(signature)
+    if db_param is None:
+        return endpoint
+
+    async def handler(*args, **kwargs):
+        async_db = kwargs.pop(db_param.name)
+        return await async_db.run_sync(
+            lambda db: endpoint(*args, **{db_param.name: db}, **kwargs)
+        )
+
+    handler.__signature__ = signature.replace(parameters=[
+        param.replace(default=Depends(get_async_db)) if param is db_param else param
+        for param in signature.parameters.values()
+    ])
+    handler.__name__ = endpoint.__name__
+    handler.__qualname__ = endpoint.__qualname__
+    handler.__doc__ = endpoint.__doc__
+    handler.__module__ = endpoint.__module__
+    return handler
+
+
+class DatabaseRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        budget = getattr(endpoint, "query_budget", None)
+        if budget is not None:
+            kwargs["dependencies"] = [*(kwargs.get("dependencies") or []), Depends(budget)]
+        if settings.USE_ASYNC_DB:
+            endpoint = run_on_async_session(endpoint)
+        super().__init__(path, endpoint, **kwargs)
@@ -0,0 +1,91 @@
+"""Fast JSON for list endpoints: rows straight from the database, rendered by orjson.
+
+The usual path for a list endpoint loads full ORM objects (identity map,
+instance state, attribute instrumentation) and then validates each one again
+through its *Read schema (response_model) before encoding it. Rows read from
+typed columns need neither. read_columns() selects only the columns a *Read
+schema exposes, and RowsResponse renders the row tuples with orjson, skipping
+the ORM and Pydantic entirely.
+
+dumps() writes values the way the *Read schemas do (Decimals as strings, UTC
+datetimes with a Z), so a fast-path response carries the same JSON the schema
+path would have returned.
+
+Clients that need only a few fields pass ?fields=id,name,...; parse_fields()
+checks them against the schema and read_columns() then selects just those
+columns, so the SELECT, the serialization and the payload all shrink.
+"""
+from decimal import Decimal
+from typing import Iterable, Optional
+
+import orjson
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """JSON-encode content: plain data, rows turned into dicts, or *Read schemas"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def parse_fields(fields: Optional[str], schema) -> Optional[list]:
+    """?fields=a,b as field names of a *Read schema, in the schema's order; None means all of them"""
+    requested = {part.strip() for part in (fields or "").split(",") if part.strip()}
+    if not requested:
+        return None
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field: {', '.join(sorted(unknown))}")
+    return [name for name in schema.model_fields if name in requested]
+
+
+def read_columns(model, schema, fields: Optional[list] = None, keep: Iterable = ()) -> list:
+    """The model's columns behind a *Read schema's fields (or just the given ones), in field order.
+
+    keep adds columns the caller needs on every row without returning them,
+    such as the sort key that pagination builds the next cursor from.
+    """
+    names = list(fields or schema.model_fields)
+    return [getattr(model, name) for name in names] + [column for column in keep if column.key not in names]
+
+
+def rows_to_dicts(rows: list, fields: Optional[list] = None) -> list:
+    """Row tuples from a column query as dicts keyed by column name (only fields, when given)"""
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    if fields is None:
+        return [dict(zip(keys, row)) for row in rows]
+    positions = [keys.index(name) for name in fields]
+    return [{name: row[position] for name, position in zip(fields, positions)} for row in rows]
+
+
+class FastJSONResponse(Response):
+    """JSON rendered by dumps()"""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+class RowsResponse(FastJSONResponse):
+    """JSON array of rows from read_columns(), rendered without a schema pass"""
+
+    def __init__(self, rows: Iterable, headers: Optional[dict] = None, fields: Optional[list] = None, **kwargs):
+        super().__init__(content=rows_to_dicts(list(rows), fields), headers=headers, **kwargs)
+
+
+class RowResponse(FastJSONResponse):
+    """A single row from read_columns() as a JSON object"""
+
+    def __init__(self, row, fields: Optional[list] = None, **kwargs):
+        super().__init__(content=rows_to_dicts([row], fields)[0], **kwargs)
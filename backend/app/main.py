@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from app.core import database
 from app.core.config import settings
-from app.routes import products, suppliers, customers, orders, inventory
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.pool_stats import async_pool_stats, sync_pool_stats
+from app.routes import products, suppliers, customers, orders, payments, deliveries, inventory, procurements, reports, search, admin, exports, jobs
+from app.services.jobs import job_runner
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop background jobs with the process; they are marked cancelled
+    await run_in_threadpool(job_runner.shutdown)
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
@@ -16,14 +31,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Latency, status and SQL counts per route, served at /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(products.router, prefix=settings.API_V1_STR)
 app.include_router(suppliers.router, prefix=settings.API_V1_STR)
 app.include_router(customers.router, prefix=settings.API_V1_STR)
 app.include_router(orders.router, prefix=settings.API_V1_STR)
+app.include_router(payments.router, prefix=settings.API_V1_STR)
+app.include_router(deliveries.router, prefix=settings.API_V1_STR)
 app.include_router(inventory.router, prefix=settings.API_V1_STR)
+app.include_router(procurements.router, prefix=settings.API_V1_STR)
+app.include_router(reports.router, prefix=settings.API_V1_STR)
+app.include_router(search.router, prefix=settings.API_V1_STR)
+app.include_router(exports.router, prefix=settings.API_V1_STR)
+app.include_router(jobs.router, prefix=settings.API_V1_STR)
+app.include_router(admin.router, prefix=settings.API_V1_STR)
 
 # Root endpoint
 @app.get("/")
@@ -38,4 +65,12 @@ def read_roof():
 # Health check
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "system": "Terra Foods EMS"}
\ No newline at end of file
+    return {"status": "healthy", "system": "Terra Foods EMS"}
+
+# Prometheus scrape endpoint (per worker process)
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    pools = {"sync": sync_pool_stats.snapshot()}
+    if database._async_engine is not None:
+        pools["async"] = async_pool_stats.snapshot()
+    return PlainTextResponse(metrics.render(pools), media_type="text/plain; version=0.0.4")
@@ -5,6 +5,9 @@ from app.models.customer import Customer
 from app.models.staff import Staff
 from app.models.procurement import Procurement, ProcurementItem
 from app.models.order import Order, OrderItem, OrderStatus
-from app.models.inventory import InventoryMovement
+from app.models.inventory import InventoryMovement, StockBalance, StockCheckpoint, InventoryLot, InventoryLotAllocation
 from app.models.delivery import Delivery
-from app.models.payment import Payment
\ No newline at end of file
+from app.models.payment import Payment
+from app.models.reporting import DailySalesRollup, DailyCustomerRollup, RollupWatermark
+from app.models.receivable import OrderBalance, CustomerBalance
+from app.models.job import Job
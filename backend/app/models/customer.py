@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Customer(Base):
     __tablename__ = "customers"
+    __table_args__ = (
+        # trigram indexes for /search (pg_trgm; a plain index elsewhere)
+        Index("ix_customers_business_name_trgm", "business_name", postgresql_using="gin", postgresql_ops={"business_name": "gin_trgm_ops"}),
+        Index("ix_customers_location_trgm", "location", postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"}),
+    )
 
     customer_id = Column(Integer, primary_key=True, index=True)
     business_name = Column(String(200), nullable=False)
@@ -1,13 +1,21 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Delivery(Base):
     __tablename__ = "deliveries"
+    __table_args__ = (
+        Index("ix_deliveries_order_id", "order_id"),
+        # a day's deliveries for the scheduler and the list filter
+        Index("ix_deliveries_date_status", "delivery_date", "delivery_status"),
+    )
     
     delivery_id = Column(Integer, primary_key=True, index=True)
     order_id = Column(Integer, ForeignKey("orders.order_id"), nullable=False)
     delivery_date = Column(DateTime(timezone=True), nullable=False)
     delivery_status = Column(String(50), default="pending")
     delivered_by = Column(Integer, ForeignKey("staff.staff_id"))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    order = relationship("Order", back_populates="deliveries")
@@ -1,9 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class InventoryMovement(Base):
     __tablename__ = "inventory_movements"
+    __table_args__ = (
+        # stock aggregation by product and type; quantity is carried in the index so Postgres can answer from it alone
+        Index("ix_inventory_movements_product_type", "product_id", "movement_type", postgresql_include=["quantity"]),
+        # list_movements keyset pagination
+        Index("ix_inventory_movements_date_id", "movement_date", "movement_id"),
+        # point-in-time stock replays one product's movements after a checkpoint
+        Index("ix_inventory_movements_product_date", "product_id", "movement_date",
+              postgresql_include=["movement_type", "quantity"]),
+    )
     
     movement_id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.product_id"), nullable=False)
@@ -12,4 +21,51 @@ class InventoryMovement(Base):
     reference_id = Column(Integer)  # order_id or procurement_id
     movement_date = Column(DateTime(timezone=True), nullable=False)
     recorded_by = Column(Integer, ForeignKey("staff.staff_id"))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class StockBalance(Base):
+    __tablename__ = "stock_balances"
+
+    # One row per product, maintained alongside inventory_movements
+    product_id = Column(Integer, ForeignKey("products.product_id"), primary_key=True)
+    stock_in = Column(Numeric(14, 2), nullable=False, default=0)  # IN
+    stock_out = Column(Numeric(14, 2), nullable=False, default=0)  # OUT + SPOILAGE
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class StockCheckpoint(Base):
+    __tablename__ = "stock_checkpoints"
+
+    # Totals of every movement dated before checkpoint_at (i.e. the closing
+    # balance of the day or month that ends there)
+    product_id = Column(Integer, ForeignKey("products.product_id"), primary_key=True)
+    checkpoint_at = Column(DateTime(timezone=True), primary_key=True)
+    stock_in = Column(Numeric(14, 2), nullable=False, default=0)  # IN
+    stock_out = Column(Numeric(14, 2), nullable=False, default=0)  # OUT + SPOILAGE
+
+class InventoryLot(Base):
+    __tablename__ = "inventory_lots"
+    __table_args__ = (
+        # lots expiring soon
+        Index("ix_inventory_lots_expires_at", "expires_at"),
+        # FEFO: a product's open lots by expiry
+        Index("ix_inventory_lots_product_expiry", "product_id", "expires_at"),
+    )
+
+    # One lot per IN movement; OUT and SPOILAGE movements draw from lots first-expired-first-out
+    lot_id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.product_id"), nullable=False)
+    movement_id = Column(Integer, ForeignKey("inventory_movements.movement_id"), nullable=False, unique=True)
+    received_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True))  # received_at + perishability_days; NULL if the product doesn't spoil
+    quantity_received = Column(Numeric(10, 2), nullable=False)
+    quantity_remaining = Column(Numeric(10, 2), nullable=False)
+
+class InventoryLotAllocation(Base):
+    __tablename__ = "inventory_lot_allocations"
+
+    # How much of a lot an OUT/SPOILAGE movement took, so deleting the movement can give it back.
+    # Without a lot it is a shortfall: stock the product didn't have, which its next receipt settles.
+    allocation_id = Column(Integer, primary_key=True, index=True)
+    lot_id = Column(Integer, ForeignKey("inventory_lots.lot_id"), index=True)
+    movement_id = Column(Integer, ForeignKey("inventory_movements.movement_id"), nullable=False, index=True)
+    quantity = Column(Numeric(10, 2), nullable=False)
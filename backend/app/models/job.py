@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, JSON, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # the job list and fail-stale: queued/running jobs, newest first
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
+
+    # Background work submitted through /jobs and run by app.services.jobs
+    job_id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    params = Column(JSON, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    progress = Column(Float, nullable=False, default=0)  # 0-1
+    progress_message = Column(String(255))
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    result = Column(JSON)  # JSON summary; file results carry their path
+    error = Column(Text)
+    worker = Column(String(100))  # host:pid that ran it
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -10,6 +11,15 @@ class OrderStatus(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # orders for a customer by date
+        Index("ix_orders_customer_date", "customer_id", "order_date"),
+        # list_orders keyset pagination
+        Index("ix_orders_date_id", "order_date", "order_id"),
+        # incremental refresh of the sales rollups
+        Index("ix_orders_created_at", "created_at"),
+        Index("ix_orders_updated_at", "updated_at"),
+    )
 
     order_id = Column(Integer, primary_key=True, index=True)
     customer_id = Column(Integer, ForeignKey("customers.customer_id"), nullable=False)
@@ -20,10 +30,23 @@ class Order(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Load these explicitly (selectinload/joinedload) when a response needs them.
+    # passive_deletes leaves child rows to the database's foreign keys.
+    customer = relationship("Customer")
+    items = relationship("OrderItem", back_populates="order", passive_deletes=True)
+    payments = relationship("Payment", back_populates="order", passive_deletes=True)
+    deliveries = relationship("Delivery", back_populates="order", passive_deletes=True)
+
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+    )
+
     order_item_id = Column(Integer, primary_key=True, index=True)
     order_id = Column(Integer, ForeignKey("orders.order_id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.product_id"), nullable=False)
     quantity = Column(Numeric(10, 2), nullable=False)
-    unit_price = Column(Numeric(10, 2), nullable=False)
\ No newline at end of file
+    unit_price = Column(Numeric(10, 2), nullable=False)
+
+    order = relationship("Order", back_populates="items")
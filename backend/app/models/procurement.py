@@ -9,6 +9,7 @@ class Procurement(Base):
     supplier_id = Column(Integer, ForeignKey("suppliers.supplier_id"), nullable=False)
     procurement_date = Column(DateTime(timezone=True), nullable=False)
     total_cost = Column(Numeric(10, 2))
+    status = Column(String(20), nullable=False, default="received", server_default="received")  # draft, received, cancelled
     recorded_by = Column(Integer, ForeignKey("staff.staff_id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -11,6 +11,10 @@ class ProductCategory(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # trigram index for /search (pg_trgm; a plain index elsewhere)
+        Index("ix_products_product_name_trgm", "product_name", postgresql_using="gin", postgresql_ops={"product_name": "gin_trgm_ops"}),
+    )
 
     product_id = Column(Integer, primary_key=True, index=True)
     product_name = Column(String(200), nullable=True)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Numeric, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class OrderBalance(Base):
+    __tablename__ = "order_balances"
+    __table_args__ = (
+        # aging report: only orders with money still owed, by age
+        Index("ix_order_balances_outstanding_date", "outstanding", "order_date"),
+        Index("ix_order_balances_customer_id", "customer_id"),
+    )
+
+    # One row per order, maintained alongside orders and payments
+    order_id = Column(Integer, ForeignKey("orders.order_id"), primary_key=True)
+    customer_id = Column(Integer, ForeignKey("customers.customer_id"), nullable=False)
+    order_date = Column(DateTime(timezone=True), nullable=False)
+    billed_amount = Column(Numeric(14, 2), nullable=False, default=0)  # total_amount, 0 once cancelled
+    amount_paid = Column(Numeric(14, 2), nullable=False, default=0)
+    outstanding = Column(Numeric(14, 2), nullable=False, default=0)  # billed_amount - amount_paid
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class CustomerBalance(Base):
+    __tablename__ = "customer_balances"
+
+    # Totals of the customer's order_balances
+    customer_id = Column(Integer, ForeignKey("customers.customer_id"), primary_key=True)
+    billed_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    amount_paid = Column(Numeric(14, 2), nullable=False, default=0)
+    outstanding = Column(Numeric(14, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
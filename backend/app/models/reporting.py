@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Numeric, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollups"
+    __table_args__ = (
+        Index("ix_daily_sales_rollups_product_day", "product_id", "day"),
+    )
+
+    # Sales per day, product and customer; order_count is orders containing the product
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.product_id"), primary_key=True)
+    customer_id = Column(Integer, ForeignKey("customers.customer_id"), primary_key=True)
+    quantity = Column(Numeric(14, 2), nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
+
+class DailyCustomerRollup(Base):
+    __tablename__ = "daily_customer_rollups"
+    __table_args__ = (
+        Index("ix_daily_customer_rollups_customer_day", "customer_id", "day"),
+    )
+
+    # Sales per day and customer, so order counts add up without double counting
+    day = Column(Date, primary_key=True)
+    customer_id = Column(Integer, ForeignKey("customers.customer_id"), primary_key=True)
+    quantity = Column(Numeric(14, 2), nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(50), primary_key=True)
+    high_water = Column(DateTime(timezone=True))  # latest orders.created_at/updated_at folded in
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
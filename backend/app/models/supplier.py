@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Supplier(Base):
     __tablename__ = "suppliers"
+    __table_args__ = (
+        # trigram indexes for /search (pg_trgm; a plain index elsewhere)
+        Index("ix_suppliers_supplier_name_trgm", "supplier_name", postgresql_using="gin", postgresql_ops={"supplier_name": "gin_trgm_ops"}),
+        Index("ix_suppliers_location_trgm", "location", postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"}),
+    )
 
     supplier_id = Column(Integer, primary_key=True, index=True)
     supplier_name = Column(String(200), nullable=False)
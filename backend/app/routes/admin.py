@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+
+from app.core import database
+from app.core.pool_stats import async_pool_stats, sync_pool_stats
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/pool")
+def get_pool_stats():
+    """Live connection pool statistics for this worker process"""
+    return {
+        "sync": sync_pool_stats.snapshot(),
+        # The async engine only exists once an async session has been used
+        "async": async_pool_stats.snapshot() if database._async_engine is not None else None,
+    }
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from app.core.cache import cached_response, invalidate, item_key
 from app.core.database import get_db
+from app.core.metrics import QueryBudget
+from app.core.routing import DatabaseRoute
+from app.core.serialization import RowResponse, RowsResponse, parse_fields, read_columns
 from app.models.customer import Customer
 from app.schemas.customer import CustomerCreate, CustomerRead, CustomerUpdate
+from app.services.search import index_record, unindex_record
+from app.utils.pagination import next_cursor_headers, paginate
 
-router = APIRouter(prefix="/customers", tags=["Customers"])
+router = APIRouter(
+    prefix="/customers", tags=["Customers"], route_class=DatabaseRoute,
+    dependencies=[Depends(QueryBudget(statements=10, rows=1000))],
+)
 
 @router.post("/", response_model=CustomerRead, status_code=201)
 def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
@@ -15,21 +24,39 @@ def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
     db.add(db_customer)
     db.commit()
     db.refresh(db_customer)
+    index_record("customer", db_customer)
     return db_customer
 
 @router.get("/", response_model = List[CustomerRead])
-def list_customers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all customers"""
-    customers = db.query(Customer).offset(skip).limit(limit).all()
-    return customers 
+def list_customers(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get all customers (pass the X-Next-Cursor header back as cursor); fields=... returns only those fields"""
+    selected = parse_fields(fields, CustomerRead)
+    columns = read_columns(Customer, CustomerRead, selected, keep=[Customer.customer_id])
+    rows, next_cursor = paginate(db.query(*columns), [Customer.customer_id], limit, skip, cursor)
+    return RowsResponse(rows, headers=next_cursor_headers(next_cursor), fields=selected)
 
 @router.get("/{customer_id}", response_model=CustomerRead)
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
-    """Get a single cutomer by ID"""
-    customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
-    if not customer: 
-        raise HTTPException(status_code=404, detail="Customer not found")
-    return customer
+def get_customer(customer_id: int, request: Request, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get a single cutomer by ID, optionally only some fields=..."""
+    selected = parse_fields(fields, CustomerRead)
+    if selected is not None:
+        row = db.query(*read_columns(Customer, CustomerRead, selected)).filter(Customer.customer_id == customer_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Customer not found")
+        return RowResponse(row)
+
+    def load():
+        customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
+        if not customer: 
+            raise HTTPException(status_code=404, detail="Customer not found")
+        return CustomerRead.model_validate(customer), {}
+    return cached_response(request, item_key("customers", customer_id), load)
 
 @router.put("/{customer_id}", response_model=CustomerRead)
 def update_customer(customer_id: int, customer_update: CustomerUpdate, db: Session = Depends(get_db)):
@@ -39,11 +66,13 @@ def update_customer(customer_id: int, customer_update: CustomerUpdate, db: Sessi
         raise HTTPException(status_code=404, detail="Customer not found")
     
     update_data = customer_update.dict(exclude_unset=True)
-    for key, value in update_data.item():
+    for key, value in update_data.items():
         setattr(db_customer, key, value)
 
     db.commit()
     db.refresh(db_customer)
+    index_record("customer", db_customer)
+    invalidate("customers", customer_id)
     return db_customer
 
 @router.delete("/{customer_id}", status_code=204)
@@ -55,4 +84,6 @@ def delete_customer(customer_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_customer)
     db.commit()
+    unindex_record("customer", customer_id)
+    invalidate("customers", customer_id)
     return None
\ No newline at end of file
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.core.routing import DatabaseRoute
+from app.core.serialization import RowResponse, RowsResponse, parse_fields, read_columns
+from app.models.delivery import Delivery
+from app.schemas.delivery import DeliveryRead, DeliveryScheduleRead, DeliveryUpdate
+from app.services.delivery_scheduler import schedule_deliveries
+from app.utils.pagination import next_cursor_headers, paginate
+
+router = APIRouter(prefix="/deliveries", tags=["Deliveries"], route_class=DatabaseRoute)
+
+@router.get("/", response_model=List[DeliveryRead])
+def list_deliveries(
+    delivery_date: Optional[date] = None,
+    delivery_status: Optional[str] = None,
+    delivered_by: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get deliveries, optionally for one day, status or staff member (pass the X-Next-Cursor header back as cursor);
+    fields=... returns only those fields"""
+    selected = parse_fields(fields, DeliveryRead)
+    query = db.query(*read_columns(Delivery, DeliveryRead, selected, keep=[Delivery.delivery_id]))
+    if delivery_date is not None:
+        start = datetime.combine(delivery_date, time.min, tzinfo=timezone.utc)
+        query = query.filter(Delivery.delivery_date >= start, Delivery.delivery_date < start + timedelta(days=1))
+    if delivery_status is not None:
+        query = query.filter(Delivery.delivery_status == delivery_status)
+    if delivered_by is not None:
+        query = query.filter(Delivery.delivered_by == delivered_by)
+    rows, next_cursor = paginate(query, [Delivery.delivery_id], limit, skip, cursor)
+    return RowsResponse(rows, headers=next_cursor_headers(next_cursor), fields=selected)
+
+@router.post("/schedule", response_model=DeliveryScheduleRead)
+def schedule(
+    delivery_date: date,
+    reassign: bool = False,
+    create_missing: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Assign the day's pending deliveries to active logistics staff, grouped by customer location"""
+    return schedule_deliveries(db, delivery_date, reassign=reassign, create_missing=create_missing)
+
+@router.get("/{delivery_id}", response_model=DeliveryRead)
+def get_delivery(delivery_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get a single delivery by ID, optionally only some fields=..."""
+    selected = parse_fields(fields, DeliveryRead)
+    row = db.query(*read_columns(Delivery, DeliveryRead, selected)).filter(Delivery.delivery_id == delivery_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Delivery not found")
+    return RowResponse(row)
+
+@router.put("/{delivery_id}", response_model=DeliveryRead)
+def update_delivery(delivery_id: int, delivery_update: DeliveryUpdate, db: Session = Depends(get_db)):
+    """Update a delivery (status, date or who delivers it)"""
+    db_delivery = db.query(Delivery).filter(Delivery.delivery_id == delivery_id).first()
+    if not db_delivery:
+        raise HTTPException(status_code=404, detail="Delivery not found")
+
+    update_data = delivery_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_delivery, key, value)
+
+    db.commit()
+    db.refresh(db_delivery)
+    return db_delivery
@@ -0,0 +1,32 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional
+
+from app.core.database import SessionLocal
+from app.services.exports import ExportFormat, ExportKind, MEDIA_TYPES, stream_export
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+@router.get("/{kind}")
+def export_history(
+    kind: ExportKind,
+    format: ExportFormat = ExportFormat.csv,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    """Stream orders, order items or inventory movements as CSV or NDJSON"""
+    def generate():
+        # Streaming outlives the request scope, so the export owns its session
+        db = SessionLocal()
+        try:
+            yield from stream_export(db, kind, format, start_date, end_date)
+        finally:
+            db.close()
+
+    filename = f"{kind.value}.{format.value}"
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
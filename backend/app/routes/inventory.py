@@ -1,29 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from sqlalchemy import func as sql_func
-from typing import List
+from typing import List, Optional
+from datetime import date, datetime, timedelta, timezone
+import json
 
-from app.core.database import get_db
-from app.models.inventory import InventoryMovement
-from app.schemas.inventory import InventoryMovementCreate, InventoryMovementRead, InventoryMovementUpdate
+from app.core.database import get_db, SessionLocal
+from app.core.metrics import QueryBudget, query_budget
+from app.core.routing import DatabaseRoute
+from app.core.serialization import RowsResponse, parse_fields, read_columns
+from app.models.inventory import InventoryLot, InventoryMovement
+from app.schemas.imports import ImportReport
+from app.schemas.inventory import InventoryMovementCreate, InventoryMovementRead, InventoryMovementUpdate, StockLevelRead, InventoryLotRead
+from app.services.imports import ImportFormat, ImportKind, import_upload
+from app.services.lots import apply_movement_lots, release_movement_lots
+from app.services.stock import apply_movement, get_stock_balance, iter_stock_snapshot
+from app.utils.pagination import next_cursor_headers, paginate
+from app.utils.uploads import spool_request_body
 
-router = APIRouter(prefix="/inventory", tags=["Inventory"])
+router = APIRouter(
+    prefix="/inventory", tags=["Inventory"], route_class=DatabaseRoute,
+    dependencies=[Depends(QueryBudget(statements=15, rows=2000))],
+)
 
 @router.post("/movements", response_model=InventoryMovementRead, status_code=201)
 def create_movement(movement: InventoryMovementCreate, db: Session = Depends(get_db)):
     """Create a new inventory movement"""
     db_movement = InventoryMovement(**movement.dict())
     db.add(db_movement)
+    apply_movement(db, db_movement)
+    db.flush()
+    apply_movement_lots(db, [{**movement.dict(), "movement_id": db_movement.movement_id}])
     db.commit()
     db.refresh(db_movement)
     return db_movement
 
+@router.post("/movements/import", response_model=ImportReport)
+@query_budget(statements=None, rows=None)  # scales with the upload
+async def import_movements(request: Request, format: ImportFormat = ImportFormat.csv):
+    """Bulk import movements from a CSV or NDJSON request body; bad rows are reported, not fatal"""
+    upload = await spool_request_body(request)
+    return await run_in_threadpool(import_upload, ImportKind.movements, upload, format)
+
 @router.get("/movements", response_model=List[InventoryMovementRead])
-def list_movements(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all inventory movements"""
-    movements = db.query(InventoryMovement).offset(skip).limit(limit).all()
-    return movements
+def list_movements(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get all inventory movements by movement date (pass the X-Next-Cursor header back as cursor);
+    fields=... returns only those fields"""
+    selected = parse_fields(fields, InventoryMovementRead)
+    order_by = [InventoryMovement.movement_date, InventoryMovement.movement_id]
+    rows, next_cursor = paginate(
+        db.query(*read_columns(InventoryMovement, InventoryMovementRead, selected, keep=order_by)),
+        order_by, limit, skip, cursor
+    )
+    return RowsResponse(rows, headers=next_cursor_headers(next_cursor), fields=selected)
 
 @router.get("/movements?{movement_id}", response_model=InventoryMovementRead)
 def get_movement(movement_id: int, db: Session = Depends(get_db)):
@@ -33,28 +71,52 @@ def get_movement(movement_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Movement not found")
     return movement
 
-@router.get("/stock{product_id}")
-def get_current_stock(product_id: int, db: Session = Depends(get_db)):
-    """Get current stock level for a product"""
-    # Calculate stock: IN movements - OUT/SPOILAGE movements
-    stock_in = db.query(func.sum(InventoryMovement.quantity)).filter(
-        InventoryMovement.product_id == product_id,
-        InventoryMovement.movement_type == 'IN'
-    ).scalar() or 0
+@router.get("/stock", response_model=List[StockLevelRead])
+def get_stock_snapshot(
+    product_ids: Optional[List[int]] = Query(None),
+    category_id: Optional[int] = None,
+    as_of: Optional[date] = None,
+    stream: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Get current stock (or closing stock on as_of) for every product (or a filtered set)"""
+    if not stream:
+        return list(iter_stock_snapshot(db, product_ids=product_ids, category_id=category_id, as_of=as_of))
 
-    stock_out = db.query(func.sum(InventoryMovement.quantity)).filter(
-        InventoryMovement.product_id == product_id,
-        InventoryMovement.movement_type.in_(['OUT', 'SPOILAGE'])
-    ).scalar() or 0
+    def generate():
+        # The request session may be closed before streaming starts, so use our own
+        stream_db = SessionLocal()
+        try:
+            for level in iter_stock_snapshot(stream_db, product_ids=product_ids, category_id=category_id, as_of=as_of):
+                yield json.dumps(level) + "\n"
+        finally:
+            stream_db.close()
 
-    current_stock = stock_in - stock_out
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/stock{product_id}")
+def get_current_stock(product_id: int, as_of: Optional[date] = None, db: Session = Depends(get_db)):
+    """Get current stock level for a product, or its closing stock on as_of"""
+    # Read from the maintained balance (or the nearest checkpoint) instead of summing the movement ledger
+    return get_stock_balance(db, product_id, as_of=as_of)
 
-    return {
-        "product_id": product_id,
-        "current_stock": float(current_stock),
-        "stock_in": float(stock_in),
-        "stock_out": float(stock_out)
-    }
+@router.get("/lots/expiring", response_model=List[InventoryLotRead])
+def list_expiring_lots(
+    days: int = 3,
+    product_id: Optional[int] = None,
+    limit: int = 100,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Open lots expiring within the next N days (already expired ones first), earliest expiry first"""
+    selected = parse_fields(fields, InventoryLotRead)
+    query = db.query(*read_columns(InventoryLot, InventoryLotRead, selected)).filter(
+        InventoryLot.expires_at <= datetime.now(timezone.utc) + timedelta(days=days),
+        InventoryLot.quantity_remaining > 0,
+    )
+    if product_id is not None:
+        query = query.filter(InventoryLot.product_id == product_id)
+    return RowsResponse(query.order_by(InventoryLot.expires_at, InventoryLot.lot_id).limit(limit).all(), fields=selected)
 
 @router.delete("/movements/{movement_id}", status_code=204)
 def delete_movement(movement_id: int, db: Session = Depends(get_db)):
@@ -63,6 +125,8 @@ def delete_movement(movement_id: int, db: Session = Depends(get_db)):
     if not db_movement:
         raise HTTPException(status_code=404, detail="Movement not found")
     
+    apply_movement(db, db_movement, reverse=True)
+    release_movement_lots(db, db_movement)
     db.delete(db_movement)
     db.commit()
     return None
\ No newline at end of file
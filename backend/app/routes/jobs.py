@@ -0,0 +1,87 @@
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.core.routing import DatabaseRoute
+from app.core.serialization import FastJSONResponse
+from app.models.job import Job
+from app.schemas.job import JobCreate, JobRead
+from app.services.jobs import JOB_KINDS, SUCCEEDED, JobQueueFull, job_runner
+from app.utils.pagination import paginate, set_next_cursor
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=DatabaseRoute)
+
+def _get_job(db: Session, job_id: int) -> Job:
+    job = db.query(Job).filter(Job.job_id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/", response_model=JobRead, status_code=202)
+def submit_job(job: JobCreate, db: Session = Depends(get_db)):
+    """Queue a recomputation or export; poll GET /jobs/{job_id} until it has finished"""
+    try:
+        return job_runner.submit(db, job.kind, job.params)
+    except ValidationError as exc:
+        errors = exc.errors(include_url=False, include_context=False)
+        raise HTTPException(status_code=422, detail=[{**e, "loc": ["body", "params", *e["loc"]]} for e in errors])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except JobQueueFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "30"})
+
+@router.get("/", response_model=List[JobRead])
+def list_jobs(
+    response: Response,
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get jobs, optionally by status or kind (pass the X-Next-Cursor header back as cursor)"""
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    jobs, next_cursor = paginate(query, [Job.job_id], limit, skip, cursor)
+    set_next_cursor(response, next_cursor)
+    return [job_runner.describe(job) for job in jobs]
+
+@router.get("/kinds")
+def list_job_kinds():
+    """The job kinds and the JSON schema of each one's params"""
+    return {
+        name: {"description": run.__doc__, "params": params.model_json_schema()}
+        for name, (params, run) in JOB_KINDS.items()
+    }
+
+@router.get("/{job_id}", response_model=JobRead)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Get a job's status and progress"""
+    return job_runner.describe(_get_job(db, job_id))
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: int, db: Session = Depends(get_db)):
+    """Get a finished job's result: the exported file, or its JSON summary"""
+    job = _get_job(db, job_id)
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}, not {SUCCEEDED}")
+    result = job.result or {}
+    if "file" in result:
+        if not os.path.exists(result["file"]):
+            raise HTTPException(status_code=410, detail="The job's output file is gone")
+        return FileResponse(result["file"], media_type=result["media_type"], filename=result["filename"])
+    return FastJSONResponse(result)
+
+@router.post("/{job_id}/cancel", response_model=JobRead)
+def cancel_job(job_id: int, db: Session = Depends(get_db)):
+    """Cancel a job; a running one stops at its next progress report"""
+    return job_runner.cancel(db, _get_job(db, job_id))
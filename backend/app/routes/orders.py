@@ -1,44 +1,154 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.metrics import QueryBudget, query_budget
+from app.core.routing import DatabaseRoute
+from app.core.serialization import FastJSONResponse, RowResponse, RowsResponse, parse_fields, read_columns
 from app.models.order import Order, OrderItem
-from app.schemas.order import OrderCreate, OrderRead, OrderUpdate
+from app.schemas.customer import CustomerRead
+from app.schemas.delivery import DeliveryRead
+from app.schemas.order import OrderCreate, OrderRead, OrderUpdate, OrderBulkCreate, OrderBulkResponse, OrderDetailRead, OrderItemRead
+from app.schemas.payment import PaymentRead
+from app.services.orders import bulk_create_orders
+from app.services.receivables import remove_order_balance, sync_order_balance
+from app.services.sales_rollups import order_day, rebuild_days
+from app.utils.pagination import next_cursor_headers, paginate, set_next_cursor
 
-router = APIRouter(prefix="/orders", tags=["orders"])
+router = APIRouter(
+    prefix="/orders", tags=["orders"], route_class=DatabaseRoute,
+    dependencies=[Depends(QueryBudget(statements=20, rows=2000))],
+)
+
+# ?include= values and the relationship each one embeds
+ORDER_INCLUDES = {
+    "items": "items",
+    "payments": "payments",
+    "delivery": "deliveries",
+    "deliveries": "deliveries",
+    "customer": "customer",
+}
+
+# schema of each embedded relation, for responses trimmed with ?fields=
+RELATION_SCHEMAS = {
+    "items": OrderItemRead,
+    "payments": PaymentRead,
+    "deliveries": DeliveryRead,
+    "customer": CustomerRead,
+}
+
+def _parse_include(include: Optional[str]) -> set:
+    requested = {part.strip() for part in (include or "").split(",") if part.strip()}
+    unknown = requested - set(ORDER_INCLUDES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    return {ORDER_INCLUDES[part] for part in requested}
+
+def _include_options(relations: set, fields: Optional[list] = None) -> list:
+    """Eager loads for the embedded relations: one extra query per collection, a join for the customer.
+    With fields, only those columns of the order itself are loaded."""
+    options = [selectinload(getattr(Order, rel)) for rel in ("items", "payments", "deliveries") if rel in relations]
+    if "customer" in relations:
+        options.append(joinedload(Order.customer))
+    if fields is not None:
+        # order_date too: list pages build their next cursor from it
+        options.append(load_only(*read_columns(Order, OrderRead, fields, keep=[Order.order_date])))
+    return options
+
+def _order_detail(order: Order, relations: set) -> OrderDetailRead:
+    data = OrderRead.model_validate(order).model_dump()
+    data.update({rel: getattr(order, rel) for rel in relations})
+    return OrderDetailRead.model_validate(data, from_attributes=True)
+
+def _trimmed_order_detail(order: Order, relations: set, fields: list) -> dict:
+    """The requested fields of an order (loaded with load_only) plus its embedded relations"""
+    data = {field: getattr(order, field) for field in fields}
+    for rel in relations:
+        value, schema = getattr(order, rel), RELATION_SCHEMAS[rel]
+        if isinstance(value, list):
+            data[rel] = [schema.model_validate(v) for v in value]
+        else:
+            data[rel] = schema.model_validate(value) if value is not None else None
+    return data
 
 @router.post("/", response_model=OrderRead, status_code=201)
 def create_order(order: OrderCreate, db: Session = Depends(get_db)):
     """Created a new order with items"""
-    order_data = order.dict(exclude={'oder_items'})
+    order_data = order.dict(exclude={'order_items'})
     db_order = Order(**order_data)
     db.add(db_order)
     db.flush()
 
-    for item in order.order_items:
-        db_item = OrderItem(
-            order_id=db_order.order_id
-            **item.dict()        
-        )
+    db.add_all([
+        OrderItem(order_id=db_order.order_id, **item.dict())
+        for item in order.order_items
+    ])
+    sync_order_balance(db, db_order)
 
     db.commit()
     db.refresh(db_order)
     return db_order
 
-@router.get("/", response_model=List[OrderRead])
-def list_orders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all orders"""
-    orders = db.query(Order).offset(skip).limit(limit).all()
-    return orders
+@router.post("/bulk", response_model=OrderBulkResponse)
+@query_budget(statements=None, rows=None)  # scales with the batch: one balance update per customer
+def create_orders_bulk(payload: OrderBulkCreate, db: Session = Depends(get_db)):
+    """Create many orders in one transaction, reporting success per order"""
+    results = bulk_create_orders(db, payload.orders)
+    created = sum(1 for r in results if r["success"])
+    return {"created": created, "failed": len(results) - created, "results": results}
 
-@router.get("/{order_id}", response_model=OrderRead)
-def get_order(order_id: int, db: Session = Depends(get_db)):
-    """Get a single order by ID"""
-    order = db.query(Order).filter(Order.order_id == order_id).first()
+@router.get("/", response_model=List[OrderDetailRead], response_model_exclude_unset=True)
+def list_orders(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get all orders by order date (pass the X-Next-Cursor header back as cursor).
+
+    include=items,payments,delivery,customer embeds related records using a
+    fixed number of queries per page; fields=order_id,order_status,... returns
+    only those fields of each order.
+    """
+    relations = _parse_include(include)
+    selected = parse_fields(fields, OrderRead)
+    order_by = [Order.order_date, Order.order_id]
+    if not relations:
+        # nothing embedded: plain rows, no ORM objects or schema validation
+        columns = read_columns(Order, OrderRead, selected, keep=order_by)
+        rows, next_cursor = paginate(db.query(*columns), order_by, limit, skip, cursor)
+        return RowsResponse(rows, headers=next_cursor_headers(next_cursor), fields=selected)
+
+    query = db.query(Order).options(*_include_options(relations, selected))
+    orders, next_cursor = paginate(query, order_by, limit, skip, cursor)
+    if selected is not None:
+        return FastJSONResponse([_trimmed_order_detail(order, relations, selected) for order in orders],
+                                headers=next_cursor_headers(next_cursor))
+    set_next_cursor(response, next_cursor)
+    return [_order_detail(order, relations) for order in orders]
+
+@router.get("/{order_id}", response_model=OrderDetailRead, response_model_exclude_unset=True)
+def get_order(order_id: int, include: Optional[str] = None, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get a single order by ID, optionally with include=items,payments,delivery,customer
+    and only some fields=... of the order"""
+    relations = _parse_include(include)
+    selected = parse_fields(fields, OrderRead)
+    if selected is not None and not relations:
+        row = db.query(*read_columns(Order, OrderRead, selected)).filter(Order.order_id == order_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Order not found")
+        return RowResponse(row)
+
+    order = db.query(Order).options(*_include_options(relations, selected)).filter(Order.order_id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    if selected is not None:
+        return FastJSONResponse(_trimmed_order_detail(order, relations, selected))
+    return _order_detail(order, relations)
 
 @router.put("/{order_id}", response_model = OrderRead)
 def update_oder(order_id: int, order_update: OrderUpdate, db: Session = Depends(get_db)):
@@ -48,8 +158,14 @@ def update_oder(order_id: int, order_update: OrderUpdate, db: Session = Depends(
         raise HTTPException(status_code=404, detail="Order not found")
     
     update_data = order_update.dict(exclude_unset=True)
+    # the incremental rollup refresh only sees the order's new day
+    old_day = order_day(db, order_id) if "order_date" in update_data else None
     for key, value in update_data.items():
         setattr(db_order, key, value)
+    sync_order_balance(db, db_order)
+    if old_day is not None:
+        db.flush()
+        rebuild_days(db, [old_day])
 
     db.commit()
     db.refresh(db_order)
@@ -62,6 +178,10 @@ def delete_order(order_id: int, db: Session = Depends(get_db)):
     if not db_order:
         raise HTTPException(status_code=404, detail="Order not found")
     
+    day = order_day(db, order_id)
+    remove_order_balance(db, order_id)
     db.delete(db_order)
+    db.flush()
+    rebuild_days(db, [day])
     db.commit()
     return None 
\ No newline at end of file
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.core.routing import DatabaseRoute
+from app.core.serialization import RowResponse, RowsResponse, parse_fields, read_columns
+from app.models.order import Order
+from app.models.payment import Payment
+from app.schemas.payment import PaymentCreate, PaymentRead
+from app.services.receivables import apply_payment
+from app.utils.pagination import next_cursor_headers, paginate
+
+router = APIRouter(prefix="/payments", tags=["Payments"], route_class=DatabaseRoute)
+
+@router.post("/", response_model=PaymentRead, status_code=201)
+def create_payment(payment: PaymentCreate, db: Session = Depends(get_db)):
+    """Record a payment against an order and update its outstanding balance"""
+    if not db.query(Order.order_id).filter(Order.order_id == payment.order_id).first():
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    db_payment = Payment(**payment.dict())
+    db.add(db_payment)
+    db.flush()
+    apply_payment(db, db_payment.order_id, db_payment.amount_paid)
+
+    db.commit()
+    db.refresh(db_payment)
+    return db_payment
+
+@router.get("/", response_model=List[PaymentRead])
+def list_payments(
+    order_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get payments, optionally for one order (pass the X-Next-Cursor header back as cursor);
+    fields=... returns only those fields"""
+    selected = parse_fields(fields, PaymentRead)
+    query = db.query(*read_columns(Payment, PaymentRead, selected, keep=[Payment.payment_id]))
+    if order_id is not None:
+        query = query.filter(Payment.order_id == order_id)
+    rows, next_cursor = paginate(query, [Payment.payment_id], limit, skip, cursor)
+    return RowsResponse(rows, headers=next_cursor_headers(next_cursor), fields=selected)
+
+@router.get("/{payment_id}", response_model=PaymentRead)
+def get_payment(payment_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get a single payment by ID, optionally only some fields=..."""
+    selected = parse_fields(fields, PaymentRead)
+    row = db.query(*read_columns(Payment, PaymentRead, selected)).filter(Payment.payment_id == payment_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    return RowResponse(row)
+
+@router.delete("/{payment_id}", status_code=204)
+def delete_payment(payment_id: int, db: Session = Depends(get_db)):
+    """Delete a payment recorded by mistake; the order owes that amount again"""
+    db_payment = db.query(Payment).filter(Payment.payment_id == payment_id).first()
+    if not db_payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+
+    apply_payment(db, db_payment.order_id, -db_payment.amount_paid)
+    db.delete(db_payment)
+    db.commit()
+    return None
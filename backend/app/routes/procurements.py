@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.core.routing import DatabaseRoute
+from app.models.procurement import Procurement
+from app.schemas.imports import ImportReport
+from app.schemas.procurement import ProcurementDraftsRead, ProcurementRead, ProcurementSuggestionRead
+from app.services.imports import ImportFormat, ImportKind, import_upload
+from app.services.replenishment import CANCELLED, DRAFT, RECEIVED, close_draft, suggest_replenishment, write_draft_procurements
+from app.utils.uploads import spool_request_body
+
+router = APIRouter(prefix="/procurements", tags=["Procurements"], route_class=DatabaseRoute)
+
+@router.post("/items/import", response_model=ImportReport)
+async def import_procurement_items(request: Request, format: ImportFormat = ImportFormat.csv):
+    """Bulk import procurement lines from a CSV or NDJSON request body; bad rows are reported, not fatal"""
+    upload = await spool_request_body(request)
+    return await run_in_threadpool(import_upload, ImportKind.procurement_items, upload, format)
+
+@router.get("/suggestions", response_model=List[ProcurementSuggestionRead])
+def get_procurement_suggestions(category_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Products at or below their reorder point and how much to order, capped by shelf life"""
+    return suggest_replenishment(db, category_id=category_id)
+
+@router.post("/suggestions/drafts", response_model=ProcurementDraftsRead, status_code=201)
+def create_draft_procurements(recorded_by: Optional[int] = None, db: Session = Depends(get_db)):
+    """Write the current suggestions as draft procurements, one per supplier"""
+    return write_draft_procurements(db, recorded_by=recorded_by)
+
+def _close_draft(db: Session, procurement_id: int, status: str) -> Procurement:
+    procurement = db.query(Procurement).filter(Procurement.procurement_id == procurement_id).first()
+    if not procurement:
+        raise HTTPException(status_code=404, detail="Procurement not found")
+    if procurement.status != DRAFT or not close_draft(db, procurement_id, status):
+        db.refresh(procurement)
+        raise HTTPException(status_code=409, detail=f"Procurement is {procurement.status}, not a {DRAFT}")
+    db.refresh(procurement)
+    return procurement
+
+@router.post("/{procurement_id}/receive", response_model=ProcurementRead)
+def receive_procurement(procurement_id: int, db: Session = Depends(get_db)):
+    """Mark a draft procurement as received; it no longer counts as on order"""
+    return _close_draft(db, procurement_id, RECEIVED)
+
+@router.post("/{procurement_id}/cancel", response_model=ProcurementRead)
+def cancel_procurement(procurement_id: int, db: Session = Depends(get_db)):
+    """Cancel a draft procurement that will not be placed; its products can be suggested again"""
+    return _close_draft(db, procurement_id, CANCELLED)
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from app.core.cache import cached_response, invalidate, item_key, list_key
 from app.core.database import get_db
+from app.core.metrics import QueryBudget
+from app.core.routing import DatabaseRoute
+from app.core.serialization import RowResponse, parse_fields, read_columns, rows_to_dicts
 from app.models.product import Product, ProductCategory
 from app.schemas.product import (
     ProductCreate, ProductRead, ProductUpdate,
     ProductCategoryCreate, ProductCategoryRead
 )
+from app.services.search import index_record, unindex_record
+from app.utils.pagination import next_cursor_headers, paginate
 
-router = APIRouter(prefix="/products", tags=["Products"])
+router = APIRouter(
+    prefix="/products", tags=["Products"], route_class=DatabaseRoute,
+    dependencies=[Depends(QueryBudget(statements=10, rows=1000))],
+)
 
 #Product Category Endpoints
 
@@ -20,12 +29,16 @@ def create_category(category: ProductCategoryCreate, db: Session = Depends(get_d
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    invalidate("categories")
     return db_category
 
 @router.get("/categories", response_model=List[ProductCategoryRead])
-def list_categories(db: Session = Depends(get_db)):
+def list_categories(request: Request, db: Session = Depends(get_db)):
     """Get all product categories"""
-    return db.query(ProductCategory).all()
+    def load():
+        categories = db.query(ProductCategory).all()
+        return [ProductCategoryRead.model_validate(c) for c in categories], {}
+    return cached_response(request, list_key("categories", request), load)
 
 # PRODUCT ENDPOINTS
 
@@ -36,26 +49,51 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
+    index_record("product", db_product)
+    invalidate("products")
     return db_product
 
 @router.get("/", response_model=List[ProductRead])
-def list_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all products with pagination"""
-    products = db.query(Product).offset(skip).limit(limit).all()
-    return products
+def list_products(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get all products with pagination (pass the X-Next-Cursor header back as cursor).
+
+    fields=product_id,product_name,... returns only those fields.
+    """
+    selected = parse_fields(fields, ProductRead)
+    def load():
+        columns = read_columns(Product, ProductRead, selected, keep=[Product.product_id])
+        rows, next_cursor = paginate(db.query(*columns), [Product.product_id], limit, skip, cursor)
+        return rows_to_dicts(rows, selected), next_cursor_headers(next_cursor)
+    return cached_response(request, list_key("products", request), load)
 
 @router.get("/{product_id}", response_model=ProductRead)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    """Get a single product by ID"""
-    product = db.query(Product).filter(Product.product_id ==product_id).first()
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return product
+def get_product(product_id: int, request: Request, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get a single product by ID, optionally only some fields=..."""
+    selected = parse_fields(fields, ProductRead)
+    if selected is not None:
+        row = db.query(*read_columns(Product, ProductRead, selected)).filter(Product.product_id == product_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return RowResponse(row)
+
+    def load():
+        product = db.query(Product).filter(Product.product_id ==product_id).first()
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return ProductRead.model_validate(product), {}
+    return cached_response(request, item_key("products", product_id), load)
 
 @router.put("/{product_id}", response_model=ProductRead)
 def update_product(product_id: int, product_update: ProductUpdate = Body(...), db: Session = Depends(get_db)):
     """Update a product"""
-    db_product = db.query(Product).filter(product_id == product_id).first()
+    db_product = db.query(Product).filter(Product.product_id == product_id).first()
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
@@ -66,6 +104,8 @@ def update_product(product_id: int, product_update: ProductUpdate = Body(...), d
 
     db.commit()
     db.refresh(db_product)
+    index_record("product", db_product)
+    invalidate("products", product_id)
     return db_product
 
 @router.delete("/{product_id}", status_code=204)
@@ -73,8 +113,10 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
     """Delete a Product"""
     db_product = db.query(Product).filter(Product.product_id == product_id).first()
     if not db_product:
-        raise HTTPException(status_code=404, datail="Product not found")
+        raise HTTPException(status_code=404, detail="Product not found")
     
     db.delete(db_product)
     db.commit()
+    unindex_record("product", product_id)
+    invalidate("products", product_id)
     return None
\ No newline at end of file
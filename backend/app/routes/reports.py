@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.core.routing import DatabaseRoute
+from app.models.receivable import CustomerBalance, OrderBalance
+from app.models.reporting import DailyCustomerRollup, DailySalesRollup
+from app.schemas.reporting import (
+    CustomerBalanceRead, CustomerSalesRead, DailySalesRead, DemandForecastRead, OrderBalanceRead, ProductSalesRead,
+    ReceivablesAgingRead, RollupRefreshRead,
+)
+from app.services.forecasting import ForecastMethod, forecast_demand
+from app.services.receivables import receivables_aging
+from app.services.sales_rollups import refresh_sales_rollups
+
+router = APIRouter(prefix="/reports", tags=["Reports"], route_class=DatabaseRoute)
+
+# All sales reports read from the rollup tables only; refresh them to pick up new orders.
+
+def _date_range(query, column, start_date: Optional[date], end_date: Optional[date]):
+    if start_date is not None:
+        query = query.filter(column >= start_date)
+    if end_date is not None:
+        query = query.filter(column <= end_date)
+    return query
+
+@router.get("/sales/daily", response_model=List[DailySalesRead])
+def sales_by_day(start_date: Optional[date] = None, end_date: Optional[date] = None, db: Session = Depends(get_db)):
+    """Revenue, quantity and order count per day"""
+    query = db.query(
+        DailyCustomerRollup.day,
+        func.sum(DailyCustomerRollup.quantity).label("quantity"),
+        func.sum(DailyCustomerRollup.revenue).label("revenue"),
+        func.sum(DailyCustomerRollup.order_count).label("order_count"),
+    )
+    query = _date_range(query, DailyCustomerRollup.day, start_date, end_date)
+    return query.group_by(DailyCustomerRollup.day).order_by(DailyCustomerRollup.day).all()
+
+@router.get("/sales/by-product", response_model=List[ProductSalesRead])
+def sales_by_product(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Top products by revenue (order_count is orders containing the product)"""
+    revenue = func.sum(DailySalesRollup.revenue).label("revenue")
+    query = db.query(
+        DailySalesRollup.product_id,
+        func.sum(DailySalesRollup.quantity).label("quantity"),
+        revenue,
+        func.sum(DailySalesRollup.order_count).label("order_count"),
+    )
+    query = _date_range(query, DailySalesRollup.day, start_date, end_date)
+    return query.group_by(DailySalesRollup.product_id).order_by(revenue.desc()).limit(limit).all()
+
+@router.get("/sales/by-customer", response_model=List[CustomerSalesRead])
+def sales_by_customer(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Top customers by revenue"""
+    revenue = func.sum(DailyCustomerRollup.revenue).label("revenue")
+    query = db.query(
+        DailyCustomerRollup.customer_id,
+        func.sum(DailyCustomerRollup.quantity).label("quantity"),
+        revenue,
+        func.sum(DailyCustomerRollup.order_count).label("order_count"),
+    )
+    query = _date_range(query, DailyCustomerRollup.day, start_date, end_date)
+    return query.group_by(DailyCustomerRollup.customer_id).order_by(revenue.desc()).limit(limit).all()
+
+@router.post("/sales/refresh", response_model=RollupRefreshRead)
+def refresh_sales(full: bool = False, db: Session = Depends(get_db)):
+    """Fold orders changed since the last refresh into the rollups (full=true rebuilds everything)"""
+    return refresh_sales_rollups(db, full=full)
+
+@router.get("/demand-forecast", response_model=List[DemandForecastRead])
+def demand_forecast(
+    product_ids: Optional[List[int]] = Query(None),
+    method: Optional[ForecastMethod] = None,
+    origin: Optional[date] = None,
+    refresh: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Forecast daily demand per product from origin (default today); results are cached per run"""
+    try:
+        forecast = forecast_demand(db, method=method, origin=origin, refresh=refresh)
+    except (RuntimeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return list(forecast.rows(product_ids))
+
+# Receivables read the maintained order_balances / customer_balances tables.
+
+@router.get("/receivables/aging", response_model=List[ReceivablesAgingRead])
+def receivables_aging_report(as_of: Optional[date] = None, customer_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Outstanding amount per customer in 0-30, 31-60, 61-90 and 90+ day buckets as of a day (default today)"""
+    return receivables_aging(db, as_of=as_of, customer_id=customer_id)
+
+@router.get("/receivables/customers", response_model=List[CustomerBalanceRead])
+def customer_balances(min_outstanding: Optional[float] = None, limit: int = 100, db: Session = Depends(get_db)):
+    """Customers by outstanding balance, largest first"""
+    query = db.query(CustomerBalance)
+    if min_outstanding is not None:
+        query = query.filter(CustomerBalance.outstanding >= min_outstanding)
+    return query.order_by(CustomerBalance.outstanding.desc()).limit(limit).all()
+
+@router.get("/receivables/orders/{order_id}", response_model=OrderBalanceRead)
+def order_balance(order_id: int, db: Session = Depends(get_db)):
+    """What an order was billed, what has been paid and what is still owed"""
+    balance = db.query(OrderBalance).filter(OrderBalance.order_id == order_id).first()
+    if not balance:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return balance
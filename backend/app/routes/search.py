@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.core.routing import DatabaseRoute
+from app.schemas.search import SearchResultRead
+from app.services.search import SEARCH_ENTITIES, search
+
+router = APIRouter(prefix="/search", tags=["Search"], route_class=DatabaseRoute)
+
+def _parse_types(types: Optional[str]) -> Optional[set]:
+    requested = {part.strip() for part in (types or "").split(",") if part.strip()}
+    unknown = requested - set(SEARCH_ENTITIES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown type: {', '.join(sorted(unknown))}")
+    return requested or None
+
+@router.get("/", response_model=List[SearchResultRead])
+def search_records(
+    q: str = Query(..., min_length=2, max_length=100),
+    types: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Typo-tolerant search over product, customer and supplier names and locations, best match first.
+
+    types=product,customer,supplier limits the search to some of them.
+    """
+    return search(db, q, entities=_parse_types(types), limit=limit)
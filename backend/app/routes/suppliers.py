@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from app.core.cache import cached_response, invalidate, item_key
 from app.core.database import get_db
+from app.core.metrics import QueryBudget
+from app.core.routing import DatabaseRoute
+from app.core.serialization import RowResponse, RowsResponse, parse_fields, read_columns
 from app.models.supplier import Supplier
 from app.schemas.supplier import SupplierCreate, SupplierRead, SupplierUpdate
+from app.services.search import index_record, unindex_record
+from app.utils.pagination import next_cursor_headers, paginate
 
-router = APIRouter(prefix="/suppliers", tags=["Suppliers"])
+router = APIRouter(
+    prefix="/suppliers", tags=["Suppliers"], route_class=DatabaseRoute,
+    dependencies=[Depends(QueryBudget(statements=10, rows=1000))],
+)
 
 @router.post("/", response_model=SupplierRead, status_code=201)
 def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_db)):
@@ -15,21 +24,39 @@ def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_db)):
     db.add(db_supplier)
     db.commit()
     db.refresh(db_supplier)
+    index_record("supplier", db_supplier)
     return db_supplier
 
 @router.get("/", response_model=List[SupplierRead])
-def list_suppliers(skip: int = 0, limit: int=100, db: Session = Depends(get_db)):
-        """Get all suppliers with pagination"""
-        suppliers = db.query(Supplier).offset(skip).limit(limit).all()
-        return suppliers
+def list_suppliers(
+        skip: int = 0,
+        limit: int=100,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        db: Session = Depends(get_db)
+):
+        """Get all suppliers with pagination (pass the X-Next-Cursor header back as cursor); fields=... returns only those fields"""
+        selected = parse_fields(fields, SupplierRead)
+        columns = read_columns(Supplier, SupplierRead, selected, keep=[Supplier.supplier_id])
+        rows, next_cursor = paginate(db.query(*columns), [Supplier.supplier_id], limit, skip, cursor)
+        return RowsResponse(rows, headers=next_cursor_headers(next_cursor), fields=selected)
 
 @router.get("/{supplier_id}", response_model=SupplierRead)
-def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
-      """Get a single supplier by ID"""
-      supplier = db.query(Supplier).filter(Supplier.supplier_id == supplier_id).first()
-      if not supplier:
-            raise HTTPException(status_code=404, detail="Supplier not found")
-      return supplier
+def get_supplier(supplier_id: int, request: Request, fields: Optional[str] = None, db: Session = Depends(get_db)):
+      """Get a single supplier by ID, optionally only some fields=..."""
+      selected = parse_fields(fields, SupplierRead)
+      if selected is not None:
+            row = db.query(*read_columns(Supplier, SupplierRead, selected)).filter(Supplier.supplier_id == supplier_id).first()
+            if not row:
+                  raise HTTPException(status_code=404, detail="Supplier not found")
+            return RowResponse(row)
+
+      def load():
+            supplier = db.query(Supplier).filter(Supplier.supplier_id == supplier_id).first()
+            if not supplier:
+                  raise HTTPException(status_code=404, detail="Supplier not found")
+            return SupplierRead.model_validate(supplier), {}
+      return cached_response(request, item_key("suppliers", supplier_id), load)
 
 @router.put("/{supplier_id}", response_model=SupplierRead)
 def update_supplier(supplier_id: int, supplier_update: SupplierUpdate, db: Session = Depends(get_db)):
@@ -38,12 +65,14 @@ def update_supplier(supplier_id: int, supplier_update: SupplierUpdate, db: Sessi
       if not db_supplier:
             raise HTTPException(status_code=404, detail="Supplier not found")
       
-      update_data = supplier_update.update.dict(exclude_unset=True)
+      update_data = supplier_update.dict(exclude_unset=True)
       for key, value in update_data.items():
             setattr(db_supplier, key, value)
 
       db.commit()
       db.refresh(db_supplier)
+      index_record("supplier", db_supplier)
+      invalidate("suppliers", supplier_id)
       return db_supplier
 
 @router.delete("/{supplier_id}", status_code=204)
@@ -55,4 +84,6 @@ def delete_supplier(supplier_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_supplier)
     db.commit()
+    unindex_record("supplier", supplier_id)
+    invalidate("suppliers", supplier_id)
     return None
\ No newline at end of file
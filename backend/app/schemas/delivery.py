@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+
+class DeliveryRead(BaseModel):
+    delivery_id: int
+    order_id: int
+    delivery_date: datetime
+    delivery_status: Optional[str]
+    delivered_by: Optional[int]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class DeliveryUpdate(BaseModel):
+    delivery_date: Optional[datetime] = None
+    delivery_status: Optional[str] = None
+    delivered_by: Optional[int] = None
+
+class StaffDeliveryPlan(BaseModel):
+    staff_id: int
+    load: int  # stops that day, including ones assigned earlier
+    delivery_ids: List[int]  # assigned by this run
+
+class DeliveryScheduleRead(BaseModel):
+    delivery_date: date
+    created: int
+    assigned: int
+    unassigned: int  # no active logistics staff to take them
+    staff: List[StaffDeliveryPlan]
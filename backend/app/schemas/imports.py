@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import List
+
+class ImportRejection(BaseModel):
+    line: int
+    errors: List[str]
+
+class ImportReport(BaseModel):
+    inserted: int
+    rejected: List[ImportRejection]
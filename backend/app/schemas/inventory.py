@@ -6,7 +6,7 @@ from decimal import Decimal
 class InventoryMovementCreate(BaseModel):
     product_id: int
     movement_type: str
-    quatity: Decimal
+    quantity: Decimal
     reference_id: Optional[int] = None
     movement_date: datetime
     recorded_by: Optional[int] = None
@@ -31,4 +31,22 @@ class InventoryMovementRead(BaseModel):
 
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class StockLevelRead(BaseModel):
+    product_id: int
+    current_stock: float
+    stock_in: float
+    stock_out: float
+
+class InventoryLotRead(BaseModel):
+    lot_id: int
+    product_id: int
+    movement_id: int
+    received_at: datetime
+    expires_at: Optional[datetime]
+    quantity_received: Decimal
+    quantity_remaining: Decimal
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+# Schema for submitting a job; params depend on the kind (see GET /jobs/kinds)
+class JobCreate(BaseModel):
+    kind: str
+    params: dict = {}
+
+# Schema for reading a job's status (the result has its own endpoint)
+class JobRead(BaseModel):
+    job_id: int
+    kind: str
+    params: dict
+    status: str
+    progress: float
+    progress_message: Optional[str]
+    cancel_requested: bool
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
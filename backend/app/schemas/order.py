@@ -3,6 +3,10 @@ from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
 
+from app.schemas.customer import CustomerRead
+from app.schemas.delivery import DeliveryRead
+from app.schemas.payment import PaymentRead
+
 # Order Item Schemas
 class OrderItemCreate(BaseModel):
     product_id: int
@@ -17,7 +21,7 @@ class OrderItemRead(BaseModel):
     unit_price: Decimal
 
     class Config:
-        from_attribute = True
+        from_attributes = True
 
     
 # Order Schemas
@@ -46,4 +50,26 @@ class OrderRead(BaseModel):
     updated_at: Optional[datetime]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Order with related records embedded (only the ones asked for via ?include=)
+class OrderDetailRead(OrderRead):
+    customer: Optional[CustomerRead] = None
+    items: Optional[List[OrderItemRead]] = None
+    payments: Optional[List[PaymentRead]] = None
+    deliveries: Optional[List[DeliveryRead]] = None
+
+# Bulk Order Schemas
+class OrderBulkCreate(BaseModel):
+    orders: List[OrderCreate]
+
+class OrderBulkResult(BaseModel):
+    index: int
+    success: bool
+    order_id: Optional[int] = None
+    error: Optional[str] = None
+
+class OrderBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[OrderBulkResult]
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+
+class PaymentCreate(BaseModel):
+    order_id: int
+    payment_method: Optional[str] = None  # cash, momo, bank_transfer
+    amount_paid: Decimal
+    payment_date: datetime
+
+class PaymentRead(BaseModel):
+    payment_id: int
+    order_id: int
+    payment_method: Optional[str]
+    amount_paid: Decimal
+    payment_date: datetime
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from decimal import Decimal
+from datetime import datetime
+
+class ProcurementItemCreate(BaseModel):
+    procurement_id: int
+    product_id: int
+    quantity: Decimal
+    unit_cost: Decimal
+
+class ProcurementItemRead(BaseModel):
+    procurement_item_id: int
+    procurement_id: int
+    product_id: int
+    quantity: Decimal
+    unit_cost: Decimal
+
+    class Config:
+        from_attributes = True
+
+class ProcurementRead(BaseModel):
+    procurement_id: int
+    supplier_id: int
+    procurement_date: datetime
+    total_cost: Optional[Decimal]
+    status: str  # draft, received or cancelled
+    recorded_by: Optional[int]
+    created_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class ProcurementSuggestionRead(BaseModel):
+    product_id: int
+    supplier_id: Optional[int]  # latest supplier; None if the product was never procured
+    unit_cost: Optional[Decimal]
+    current_stock: float
+    on_order: float  # on draft procurements
+    daily_demand: float
+    reorder_point: float
+    order_up_to: float
+    suggested_quantity: float
+    shelf_life_capped: bool
+
+class ProcurementDraftsRead(BaseModel):
+    procurements: int
+    items: int
+    procurement_ids: List[int]
@@ -42,6 +42,5 @@ class ProductRead(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-
-class Config:
-    from_attributes = True
\ No newline at end of file
+    class Config:
+        from_attributes = True
\ No newline at end of file
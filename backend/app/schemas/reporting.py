@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+
+class DailySalesRead(BaseModel):
+    day: date
+    quantity: Decimal
+    revenue: Decimal
+    order_count: int
+
+class ProductSalesRead(BaseModel):
+    product_id: int
+    quantity: Decimal
+    revenue: Decimal
+    order_count: int
+
+class CustomerSalesRead(BaseModel):
+    customer_id: int
+    quantity: Decimal
+    revenue: Decimal
+    order_count: int
+
+class RollupRefreshRead(BaseModel):
+    full: bool
+    days_refreshed: int
+    high_water: Optional[datetime]
+
+class DemandForecastRead(BaseModel):
+    product_id: int
+    daily: List[float]  # units per day from the forecast origin on
+    total: float
+
+class ReceivablesAgingRead(BaseModel):
+    customer_id: int
+    days_0_30: Decimal
+    days_31_60: Decimal
+    days_61_90: Decimal
+    days_over_90: Decimal
+    total: Decimal
+
+class CustomerBalanceRead(BaseModel):
+    customer_id: int
+    billed_amount: Decimal
+    amount_paid: Decimal
+    outstanding: Decimal
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class OrderBalanceRead(CustomerBalanceRead):
+    order_id: int
+    order_date: datetime
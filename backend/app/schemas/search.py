@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class SearchResultRead(BaseModel):
+    type: str  # product, customer or supplier
+    id: int
+    name: Optional[str]
+    location: Optional[str]
+    score: float  # word similarity of the best matching field, 0-1
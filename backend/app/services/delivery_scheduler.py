@@ -0,0 +1,160 @@
+"""Batch assignment of a day's deliveries to logistics staff.
+
+Deliveries are grouped by the customer's location so one person covers every
+stop at a location. Groups are then handed out longest-first to whoever has
+the least load so far (the LPT heuristic, with a min-heap of staff loads).
+That is O(n log n) overall and keeps the busiest person close to the best
+possible load. A location with more stops than a fair share is split so it
+can't unbalance the plan on its own.
+
+Everything is read with two queries and written with one executemany UPDATE
+(plus one INSERT when missing deliveries are created for the day's orders).
+"""
+import argparse
+import heapq
+import math
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.customer import Customer
+from app.models.delivery import Delivery
+from app.models.order import Order
+from app.models.staff import Staff
+from app.services.sales_rollups import EXCLUDED_STATUSES
+
+LOGISTICS_ROLE = "logistics"
+PENDING = "pending"
+
+
+def plan_assignments(groups: Dict[str, List[int]], staff_loads: Dict[int, int]) -> Dict[int, int]:
+    """Assign every delivery id in groups to a staff id, balancing the number of stops.
+
+    staff_loads holds stops each person already has that day. Returns
+    {delivery_id: staff_id}.
+    """
+    if not staff_loads:
+        return {}
+    total = sum(len(ids) for ids in groups.values()) + sum(staff_loads.values())
+    fair_share = max(1, math.ceil(total / len(staff_loads)))
+
+    chunks = []
+    for location, ids in groups.items():
+        for start in range(0, len(ids), fair_share):
+            chunks.append((location, ids[start:start + fair_share]))
+    # longest first; ties broken by location so plans are repeatable
+    chunks.sort(key=lambda chunk: (-len(chunk[1]), chunk[0]))
+
+    heap = [(load, staff_id) for staff_id, load in staff_loads.items()]
+    heapq.heapify(heap)
+    assignments = {}
+    for _, ids in chunks:
+        load, staff_id = heapq.heappop(heap)
+        for delivery_id in ids:
+            assignments[delivery_id] = staff_id
+        heapq.heappush(heap, (load + len(ids), staff_id))
+    return assignments
+
+
+def _day_bounds(day: date):
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def _create_missing_deliveries(db: Session, day: date) -> int:
+    """Insert a pending delivery for each of the day's orders that has none"""
+    start, end = _day_bounds(day)
+    has_delivery = db.query(Delivery.delivery_id).filter(Delivery.order_id == Order.order_id).exists()
+    order_ids = [order_id for (order_id,) in db.query(Order.order_id).filter(
+        Order.order_date >= start,
+        Order.order_date < end,
+        Order.order_status.notin_(EXCLUDED_STATUSES),
+        ~has_delivery,
+    )]
+    if order_ids:
+        db.execute(insert(Delivery), [
+            {"order_id": order_id, "delivery_date": start, "delivery_status": PENDING} for order_id in order_ids
+        ])
+    return len(order_ids)
+
+
+def schedule_deliveries(db: Session, day: date, reassign: bool = False, create_missing: bool = False) -> dict:
+    """Assign the day's pending deliveries to active logistics staff and save the plan.
+
+    Only unassigned deliveries are planned unless reassign is set; stops that
+    are kept count towards each person's load.
+    """
+    created = _create_missing_deliveries(db, day) if create_missing else 0
+    start, end = _day_bounds(day)
+
+    staff_ids = [staff_id for (staff_id,) in db.query(Staff.staff_id).filter(
+        func.lower(Staff.role) == LOGISTICS_ROLE, Staff.is_active.isnot(False)
+    )]
+    rows = db.query(
+        Delivery.delivery_id, Delivery.delivered_by, Customer.customer_id, Customer.location
+    ).join(Order, Order.order_id == Delivery.order_id).join(
+        Customer, Customer.customer_id == Order.customer_id
+    ).filter(
+        Delivery.delivery_date >= start,
+        Delivery.delivery_date < end,
+        Delivery.delivery_status == PENDING,
+    ).order_by(Delivery.delivery_id).all()
+
+    staff_loads = {staff_id: 0 for staff_id in staff_ids}
+    groups = defaultdict(list)
+    for delivery_id, delivered_by, customer_id, location in rows:
+        if delivered_by is not None and not reassign and delivered_by in staff_loads:
+            staff_loads[delivered_by] += 1
+            continue
+        # customers without a location are their own group
+        key = (location or "").strip().lower() or f"customer:{customer_id}"
+        groups[key].append(delivery_id)
+
+    assignments = plan_assignments(groups, staff_loads)
+    if assignments:
+        db.execute(update(Delivery), [
+            {"delivery_id": delivery_id, "delivered_by": staff_id} for delivery_id, staff_id in assignments.items()
+        ])
+    db.commit()
+
+    by_staff = defaultdict(list)
+    for delivery_id, staff_id in assignments.items():
+        by_staff[staff_id].append(delivery_id)
+    return {
+        "delivery_date": day,
+        "created": created,
+        "assigned": len(assignments),
+        "unassigned": sum(len(ids) for ids in groups.values()) - len(assignments),
+        "staff": [
+            {"staff_id": staff_id, "load": staff_loads[staff_id] + len(by_staff[staff_id]),
+             "delivery_ids": sorted(by_staff[staff_id])}
+            for staff_id in sorted(staff_loads)
+        ],
+    }
+
+
+def main():
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Assign a day's pending deliveries to logistics staff")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="delivery day (default today)")
+    parser.add_argument("--reassign", action="store_true", help="re-plan deliveries that already have someone")
+    parser.add_argument("--create-missing", action="store_true",
+                        help="first create pending deliveries for the day's orders that have none")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = schedule_deliveries(db, args.date or date.today(), args.reassign, args.create_missing)
+    finally:
+        db.close()
+    for staff in result["staff"]:
+        print(f"  staff {staff['staff_id']}: {staff['load']} stops")
+    print(f"✅ Assigned {result['assigned']} deliveries ({result['unassigned']} left unassigned)")
+
+
+if __name__ == "__main__":
+    main()
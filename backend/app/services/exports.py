@@ -0,0 +1,111 @@
+"""Streaming CSV / NDJSON exports of order and inventory history.
+
+Rows are selected as plain column tuples (no ORM objects) and read through a
+server-side cursor with yield_per, then written out in chunks. Memory stays
+flat however many rows the date range covers.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryMovement
+from app.models.order import Order, OrderItem
+
+BATCH_SIZE = 1000
+
+
+class ExportKind(str, Enum):
+    orders = "orders"
+    order_items = "order-items"
+    inventory_movements = "inventory-movements"
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv",
+    ExportFormat.ndjson: "application/x-ndjson",
+}
+
+
+def export_statement(kind: ExportKind, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
+    """Column-only SELECT for an export, filtered to [start_date, end_date)"""
+    if kind == ExportKind.orders:
+        columns = [c for c in Order.__table__.columns]
+        stmt, date_column, key = select(*columns), Order.order_date, Order.order_id
+    elif kind == ExportKind.order_items:
+        # items carry their order's date so the range filter means the same thing
+        columns = [c for c in OrderItem.__table__.columns] + [Order.customer_id, Order.order_date]
+        stmt = select(*columns).join(Order, Order.order_id == OrderItem.order_id)
+        date_column, key = Order.order_date, OrderItem.order_item_id
+    else:
+        columns = [c for c in InventoryMovement.__table__.columns]
+        stmt, date_column, key = select(*columns), InventoryMovement.movement_date, InventoryMovement.movement_id
+
+    if start_date is not None:
+        stmt = stmt.where(date_column >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(date_column < end_date)
+    return stmt.order_by(date_column, key)
+
+
+def iter_rows(db: Session, stmt, batch_size: int = BATCH_SIZE):
+    """Yield rows from a server-side cursor, batch_size at a time"""
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    yield list(result.keys())
+    for row in result:
+        yield row
+
+
+def _value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def iter_csv(rows, batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_value(v) for v in row])
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson(rows, batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    rows = iter(rows)
+    keys = next(rows)
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({k: _value(v) for k, v in zip(keys, row)}))
+        if len(lines) == batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def stream_export(db: Session, kind: ExportKind, fmt: ExportFormat,
+                  start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                  batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    """Yield an export as text chunks"""
+    rows = iter_rows(db, export_statement(kind, start_date, end_date), batch_size)
+    if fmt == ExportFormat.csv:
+        return iter_csv(rows, batch_size)
+    return iter_ndjson(rows, batch_size)
@@ -0,0 +1,246 @@
+"""Bulk import of inventory movements and procurement lines from CSV / NDJSON.
+
+Files are processed in batches: every row of a batch is validated against the
+usual *Create schema, foreign keys are checked with one query per batch, and
+the valid rows are loaded with COPY on Postgres (executemany elsewhere).
+Rejected rows are reported with their line number and never abort the batch.
+Movement batches update stock_balances, any stock checkpoints taken after them
+and the FEFO lots in the same transaction.
+"""
+import argparse
+import csv
+import io
+import json
+from collections import defaultdict
+from decimal import Decimal
+from enum import Enum
+from typing import IO, Iterator, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryMovement
+from app.models.procurement import Procurement, ProcurementItem
+from app.models.product import Product
+from app.models.staff import Staff
+from app.schemas.inventory import InventoryMovementCreate
+from app.schemas.procurement import ProcurementItemCreate
+from app.services.lots import apply_movement_lots
+from app.services.stock import apply_backdated_movements, apply_stock_delta, movement_delta
+
+BATCH_SIZE = 5000
+
+
+class ImportKind(str, Enum):
+    movements = "movements"
+    procurement_items = "procurement-items"
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+IMPORTS = {
+    ImportKind.movements: (InventoryMovement, TypeAdapter(InventoryMovementCreate)),
+    ImportKind.procurement_items: (ProcurementItem, TypeAdapter(ProcurementItemCreate)),
+}
+
+
+def parse_lines(text: IO[str], fmt: ImportFormat) -> Iterator[Tuple[int, object]]:
+    """Yield (line number, raw record) pairs from a CSV or NDJSON file"""
+    if fmt == ImportFormat.csv:
+        reader = csv.DictReader(text)
+        for record in reader:
+            # empty CSV cells mean "not given", not empty strings
+            yield reader.line_num, {k: v for k, v in record.items() if v not in ("", None)}
+        return
+    for line_num, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_num, exc
+
+
+def _existing_ids(db: Session, column, ids) -> set:
+    if not ids:
+        return set()
+    return {row[0] for row in db.query(column).filter(column.in_(ids)).all()}
+
+
+def _foreign_key_errors(db: Session, kind: ImportKind, records):
+    """Check every referenced id in the batch with one query per table"""
+    products = _existing_ids(db, Product.product_id, {r.product_id for _, r in records})
+    if kind == ImportKind.movements:
+        staff = _existing_ids(db, Staff.staff_id, {r.recorded_by for _, r in records if r.recorded_by is not None})
+    else:
+        procurements = _existing_ids(db, Procurement.procurement_id, {r.procurement_id for _, r in records})
+
+    errors = {}
+    for line_num, record in records:
+        problems = []
+        if record.product_id not in products:
+            problems.append(f"product_id: product {record.product_id} not found")
+        if kind == ImportKind.movements:
+            if record.recorded_by is not None and record.recorded_by not in staff:
+                problems.append(f"recorded_by: staff {record.recorded_by} not found")
+        elif record.procurement_id not in procurements:
+            problems.append(f"procurement_id: procurement {record.procurement_id} not found")
+        if problems:
+            errors[line_num] = problems
+    return errors
+
+
+def _copy_supported(db: Session) -> bool:
+    dialect = db.connection().dialect
+    return dialect.name == "postgresql" and dialect.driver in ("psycopg2", "psycopg")
+
+
+def _copy_rows(db: Session, table, rows: list) -> bool:
+    """Load rows with COPY FROM STDIN on Postgres; returns False if COPY isn't available"""
+    if not _copy_supported(db):
+        return False
+    connection = db.connection()
+    driver = connection.dialect.driver
+
+    columns = list(rows[0].keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[c] for c in columns])
+    buffer.seek(0)
+
+    sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        if driver == "psycopg2":
+            cursor.copy_expert(sql, buffer)
+        else:
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+    return True
+
+
+def _insert_movements(db: Session, rows: list):
+    """Insert movement rows and set each one's movement_id (lots refer to them)"""
+    if _copy_supported(db):
+        # COPY can't return ids, so take them from the sequence up front
+        ids = db.execute(
+            text("SELECT nextval(pg_get_serial_sequence('inventory_movements', 'movement_id')) "
+                 "FROM generate_series(1, :count)"),
+            {"count": len(rows)},
+        ).scalars().all()
+        for row, movement_id in zip(rows, ids):
+            row["movement_id"] = movement_id
+        _copy_rows(db, InventoryMovement.__table__, rows)
+        return
+
+    ids = db.execute(
+        insert(InventoryMovement).returning(InventoryMovement.movement_id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+    for row, movement_id in zip(rows, ids):
+        row["movement_id"] = movement_id
+
+
+def _load_batch(db: Session, kind: ImportKind, batch: list, report: dict):
+    model, adapter = IMPORTS[kind]
+
+    records = []
+    for line_num, raw in batch:
+        if isinstance(raw, Exception):
+            report["rejected"].append({"line": line_num, "errors": [f"invalid JSON: {raw}"]})
+            continue
+        try:
+            records.append((line_num, adapter.validate_python(raw)))
+        except ValidationError as exc:
+            report["rejected"].append({
+                "line": line_num,
+                "errors": [f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in exc.errors()],
+            })
+
+    fk_errors = _foreign_key_errors(db, kind, records) if records else {}
+    for line_num, problems in fk_errors.items():
+        report["rejected"].append({"line": line_num, "errors": problems})
+    rows = [record.dict() for line_num, record in records if line_num not in fk_errors]
+    if not rows:
+        return
+
+    if kind == ImportKind.movements:
+        _insert_movements(db, rows)
+    elif not _copy_rows(db, model.__table__, rows):
+        db.execute(insert(model), rows)
+
+    if kind == ImportKind.movements:
+        deltas = defaultdict(lambda: [Decimal("0"), Decimal("0")])
+        for row in rows:
+            stock_in, stock_out = movement_delta(row["movement_type"], row["quantity"])
+            deltas[row["product_id"]][0] += stock_in
+            deltas[row["product_id"]][1] += stock_out
+        for product_id, (stock_in, stock_out) in deltas.items():
+            apply_stock_delta(db, product_id, stock_in, stock_out)
+        apply_backdated_movements(db, rows)
+        apply_movement_lots(db, rows)
+
+    db.commit()
+    report["inserted"] += len(rows)
+
+
+def import_file(db: Session, kind: ImportKind, text: IO[str], fmt: ImportFormat,
+                batch_size: int = BATCH_SIZE) -> dict:
+    """Import a CSV/NDJSON file, committing one batch at a time"""
+    report = {"inserted": 0, "rejected": []}
+    batch = []
+    for line in parse_lines(text, fmt):
+        batch.append(line)
+        if len(batch) == batch_size:
+            _load_batch(db, kind, batch, report)
+            batch = []
+    if batch:
+        _load_batch(db, kind, batch, report)
+    report["rejected"].sort(key=lambda r: r["line"])
+    return report
+
+
+def import_upload(kind: ImportKind, upload: IO[bytes], fmt: ImportFormat) -> dict:
+    """Import an uploaded (binary) file using its own session"""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        return import_file(db, kind, text, fmt)
+    finally:
+        db.close()
+
+
+def main():
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Bulk import inventory movements or procurement lines")
+    parser.add_argument("kind", choices=[k.value for k in ImportKind])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat], default=None,
+                        help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = ImportFormat(args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv"))
+    db = SessionLocal()
+    try:
+        with open(args.path, newline="", encoding="utf-8") as text:
+            report = import_file(db, ImportKind(args.kind), text, fmt, args.batch_size)
+    finally:
+        db.close()
+
+    for rejection in report["rejected"]:
+        print(f"❌ line {rejection['line']}: {'; '.join(rejection['errors'])}")
+    print(f"✅ Imported {report['inserted']} rows, rejected {len(report['rejected'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""Background jobs: heavy recomputations and exports off the request workers.
+
+POST /jobs records a job (a kind plus its validated params) and hands it to
+a pool of JOB_WORKERS threads in the same process; the request returns the
+job id at once. Threads rather than processes: the jobs spend their time in
+the database and NumPy, which both release the GIL, and they need the app's
+engine and models. At most JOB_QUEUE_LIMIT jobs wait or run per process;
+beyond that submit() raises JobQueueFull.
+
+Every job runs on its own session. It reports progress through its
+JobContext, which keeps it in memory (GET /jobs shows it for jobs of this
+process) and writes it to the jobs table at most once a second (or when the
+step changes), checking at the same time whether cancellation was asked for,
+from this process or any other; the job stops at its next report. Finished
+jobs keep a JSON result, or for exports a file under JOB_OUTPUT_DIR;
+`python -m app.services.jobs cleanup` deletes the files of jobs that finished
+more than JOB_OUTPUT_RETENTION_DAYS ago.
+
+SQLite has a single writer, and a writer waiting on a reader locks out new
+readers. A job writing progress while its own session still reads (an export
+streaming rows) would stall until the busy timeout and block everyone polling
+it. On SQLite, progress and cancellation therefore stay in memory and a job
+writes only when it starts and finishes, and jobs run one at a time.
+
+Jobs live in the process that accepted them, so a restart loses the ones it
+was running; `python -m app.services.jobs fail-stale` marks jobs that have
+stopped reporting as failed (on SQLite, where running jobs do not report,
+only use it once the process is gone).
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy import func, or_, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.models.job import Job
+from app.schemas.job import JobRead
+from app.services.exports import BATCH_SIZE, MEDIA_TYPES, ExportFormat, ExportKind, export_statement, stream_export
+from app.services.forecasting import ForecastMethod, forecast_demand
+from app.services.lots import rebuild_lots
+from app.services.receivables import rebuild_receivables
+from app.services.sales_rollups import refresh_sales_rollups
+from app.services.stock import build_checkpoints, rebuild_stock_balances
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+# seconds between progress writes (and cancellation checks) of a running job
+PROGRESS_INTERVAL = 1.0
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once it has been cancelled"""
+
+
+class JobQueueFull(Exception):
+    """This process already has JOB_QUEUE_LIMIT jobs waiting or running"""
+
+
+class JobContext:
+    """A running job's handle on itself: progress, cancellation and output files"""
+
+    def __init__(self, job_id: int, session_factory, persist: bool = True):
+        self.job_id = job_id
+        self._session_factory = session_factory
+        self._persist = persist  # write progress to the jobs table, not only keep it here
+        self._cancelled = threading.Event()
+        self.fraction = 0.0
+        self.message = None
+        self._last_write = 0.0
+        self._last_message = None
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def progress(self, fraction: float, message: Optional[str] = None):
+        """Record how far along the job is (0-1); raises JobCancelled once it was cancelled"""
+        if self.cancelled:
+            raise JobCancelled()
+        self.fraction = min(max(fraction, 0.0), 1.0)
+        if message is not None:
+            self.message = message[:255]
+        now = time.monotonic()
+        if not self._persist or (now - self._last_write < PROGRESS_INTERVAL and message in (None, self._last_message)):
+            return
+        self._last_write, self._last_message = now, self.message
+
+        db = self._session_factory()
+        try:
+            values = {Job.progress: self.fraction}
+            if message is not None:
+                values[Job.progress_message] = self.message
+            db.query(Job).filter(Job.job_id == self.job_id).update(values, synchronize_session=False)
+            cancel_requested = db.query(Job.cancel_requested).filter(Job.job_id == self.job_id).scalar()
+            db.commit()
+        except OperationalError:
+            # progress is only a report; a busy jobs row must not fail the work itself
+            logger.warning("Could not record progress of job %s", self.job_id, exc_info=True)
+            return
+        finally:
+            db.close()
+        if cancel_requested:
+            self.cancel()
+            raise JobCancelled()
+
+    def output_path(self, extension: str) -> str:
+        os.makedirs(settings.JOB_OUTPUT_DIR, exist_ok=True)
+        return os.path.abspath(os.path.join(settings.JOB_OUTPUT_DIR, f"job-{self.job_id}.{extension}"))
+
+
+# kind -> (params model, run(db, context, params) -> JSON-able result)
+JOB_KINDS = {}
+
+
+def job_kind(name: str, params: type):
+    """Register a function as a job kind"""
+    def register(run):
+        JOB_KINDS[name] = (params, run)
+        return run
+    return register
+
+
+class JobParams(BaseModel):
+    class Config:
+        extra = "forbid"  # a misspelt param fails the submit instead of being ignored
+
+
+class SalesRollupParams(JobParams):
+    full: bool = False
+
+
+class ExportParams(JobParams):
+    kind: ExportKind
+    format: ExportFormat = ExportFormat.csv
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+
+
+class DemandForecastParams(JobParams):
+    method: Optional[ForecastMethod] = None
+    origin: Optional[date] = None
+    horizon: Optional[int] = None
+
+
+@job_kind("stock_rebuild", JobParams)
+def _stock_rebuild(db: Session, context: JobContext, params: JobParams) -> dict:
+    """Recompute stock balances, checkpoints and lots from the movement ledger"""
+    # checkpoints and lots commit as they go and report after every boundary or batch, so a
+    # cancelled rebuild stops there and leaves them partly rebuilt until the next one
+    context.progress(0.0, "stock balances")
+    products = rebuild_stock_balances(db)
+    context.progress(0.1, "stock checkpoints")
+    checkpoints = build_checkpoints(db, rebuild=True, progress=lambda done: context.progress(0.1 + 0.3 * done))
+    context.progress(0.4, "inventory lots")
+    replayed = rebuild_lots(db, progress=lambda done: context.progress(0.4 + 0.6 * done))
+    return {"products": products, **checkpoints, "movements_replayed": replayed}
+
+
+@job_kind("receivables_rebuild", JobParams)
+def _receivables_rebuild(db: Session, context: JobContext, params: JobParams) -> dict:
+    """Recompute order and customer balances from orders and payments"""
+    context.progress(0.0, "order balances")
+    return {"orders": rebuild_receivables(db)}
+
+
+@job_kind("sales_rollups_refresh", SalesRollupParams)
+def _sales_rollups_refresh(db: Session, context: JobContext, params: SalesRollupParams) -> dict:
+    """Fold changed orders into the daily sales rollups (full=true rebuilds them)"""
+    context.progress(0.0, "full rebuild" if params.full else "changed days")
+    return refresh_sales_rollups(db, full=params.full)
+
+
+@job_kind("demand_forecast", DemandForecastParams)
+def _demand_forecast(db: Session, context: JobContext, params: DemandForecastParams) -> dict:
+    """Forecast daily demand for every product"""
+    context.progress(0.0, "forecasting")
+    forecast = forecast_demand(db, method=params.method, origin=params.origin, horizon=params.horizon, refresh=True)
+    return {"method": forecast.method, "origin": forecast.origin, "rows": list(forecast.rows())}
+
+
+@job_kind("export", ExportParams)
+def _export(db: Session, context: JobContext, params: ExportParams) -> dict:
+    """Write an orders, order items or movements export to a file"""
+    statement = export_statement(params.kind, params.start_date, params.end_date)
+    total = db.execute(select(func.count()).select_from(statement.subquery())).scalar()
+    path = context.output_path(params.format.value)
+    partial = path + ".partial"
+    try:
+        with open(partial, "w", newline="") as f:
+            chunks = stream_export(db, params.kind, params.format, params.start_date, params.end_date, BATCH_SIZE)
+            for chunk, text in enumerate(chunks, 1):
+                f.write(text)
+                context.progress(min(chunk * BATCH_SIZE / total, 1.0) if total else 0.0, "writing")
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return {
+        "file": path,
+        "filename": f"{params.kind.value}.{params.format.value}",
+        "media_type": MEDIA_TYPES[params.format],
+        "rows": total,
+        "bytes": os.path.getsize(path),
+    }
+
+
+def _worker() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def persists_progress(session_factory) -> bool:
+    """Whether running jobs write progress to the database (everywhere but SQLite, see above)"""
+    return session_factory.kw["bind"].dialect.name != "sqlite"
+
+
+def run_job(session_factory, job_id: int, context: Optional[JobContext] = None) -> Optional[str]:
+    """Run a queued job in this thread; returns its final status (None if it was no longer queued)"""
+    context = context or JobContext(job_id, session_factory, persists_progress(session_factory))
+    db = session_factory()
+    try:
+        if context.cancelled:  # cancelled while it waited for a worker
+            db.query(Job).filter(Job.job_id == job_id, Job.status == QUEUED).update(
+                {Job.status: CANCELLED, Job.cancel_requested: True, Job.finished_at: _now()}, synchronize_session=False
+            )
+            db.commit()
+            return CANCELLED
+
+        # only one runner gets to move it out of queued, and not after it was cancelled
+        started = db.query(Job).filter(Job.job_id == job_id, Job.status == QUEUED).update(
+            {Job.status: RUNNING, Job.started_at: _now(), Job.worker: _worker()}, synchronize_session=False
+        )
+        db.commit()
+        if not started:
+            return None
+
+        job = db.get(Job, job_id)
+        params_model, run = JOB_KINDS[job.kind]
+        status, values = SUCCEEDED, {}
+        try:
+            result = run(db, context, params_model.model_validate(job.params))
+            values = {"result": json.loads(dumps(result)), "progress": 1.0, "progress_message": None}
+        except JobCancelled:
+            status, values = CANCELLED, {"cancel_requested": True, "progress": context.fraction}
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job_id, job.kind)
+            status, values = FAILED, {"error": f"{type(exc).__name__}: {exc}"}
+        db.rollback()
+
+        job = db.get(Job, job_id)
+        job.status = status
+        job.finished_at = _now()
+        for key, value in values.items():
+            setattr(job, key, value)
+        db.commit()
+        return status
+    finally:
+        db.close()
+
+
+class JobRunner:
+    """Bounded pool running this process's jobs"""
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        self._executor = None
+        self._lock = threading.Lock()
+        self._contexts = {}  # job_id -> JobContext of jobs queued or running here
+
+    def _factory(self):
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    def submit(self, db: Session, kind: str, params: Optional[dict] = None) -> Job:
+        """Record a job and queue it. Unknown kinds raise ValueError, bad params pydantic's ValidationError."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        params_model, _ = JOB_KINDS[kind]
+        validated = params_model.model_validate(params or {})
+
+        with self._lock:
+            if len(self._contexts) >= settings.JOB_QUEUE_LIMIT:
+                raise JobQueueFull(f"{len(self._contexts)} jobs are already waiting or running")
+            job = Job(kind=kind, params=json.loads(validated.model_dump_json()), status=QUEUED)
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+
+            persist = persists_progress(self._factory())
+            context = JobContext(job.job_id, self._factory(), persist)
+            self._contexts[job.job_id] = context
+            if self._executor is None:
+                workers = settings.JOB_WORKERS if persist else 1
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+            self._executor.submit(self._run, job.job_id, context)
+        return job
+
+    def _run(self, job_id: int, context: JobContext):
+        try:
+            run_job(self._factory(), job_id, context)
+        finally:
+            with self._lock:
+                self._contexts.pop(job_id, None)
+
+    def cancel(self, db: Session, job: Job) -> JobRead:
+        """Cancel a queued job now, or ask a running one to stop at its next progress report"""
+        if job.status not in FINISHED:
+            with self._lock:
+                context = self._contexts.get(job.job_id)
+            if context is not None:
+                context.cancel()
+            # a job of this process records its own cancellation; SQLite can't take the write meanwhile
+            if context is None or persists_progress(self._factory()):
+                cancelled = db.query(Job).filter(Job.job_id == job.job_id, Job.status == QUEUED).update(
+                    {Job.status: CANCELLED, Job.cancel_requested: True, Job.finished_at: _now()}, synchronize_session=False
+                )
+                if not cancelled:
+                    db.query(Job).filter(Job.job_id == job.job_id).update({Job.cancel_requested: True}, synchronize_session=False)
+                db.commit()
+                db.refresh(job)
+        return self.describe(job)
+
+    def describe(self, job: Job) -> JobRead:
+        """A job as stored, with the live progress and cancellation of jobs this process is running"""
+        read = JobRead.model_validate(job)
+        with self._lock:
+            context = self._contexts.get(job.job_id)
+        if context is None or read.status in FINISHED:
+            return read
+        return read.model_copy(update={
+            "progress": context.fraction,
+            "progress_message": context.message,
+            "cancel_requested": read.cancel_requested or context.cancelled,
+        })
+
+    def shutdown(self):
+        """Cancel everything this process still has and wait for the running jobs to stop"""
+        with self._lock:
+            contexts, executor = list(self._contexts.values()), self._executor
+            self._executor = None
+        for context in contexts:
+            context.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+job_runner = JobRunner()
+
+
+def fail_stale_jobs(db: Session, minutes: int) -> int:
+    """Mark queued or running jobs that have not reported for `minutes` as failed"""
+    cutoff = _now() - timedelta(minutes=minutes)
+    failed = db.query(Job).filter(Job.status.in_([QUEUED, RUNNING]), Job.updated_at < cutoff).update(
+        {
+            Job.status: FAILED,
+            Job.error: f"no progress for {minutes} minutes; its worker probably stopped",
+            Job.finished_at: _now(),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return failed
+
+
+def remove_old_outputs(db: Session, days: int) -> int:
+    """Delete output files of jobs that finished more than `days` days ago, or no longer exist"""
+    directory = settings.JOB_OUTPUT_DIR
+    if not os.path.isdir(directory):
+        return 0
+    files = {}  # job_id -> file names, finished results and leftover .partial files alike
+    for name in os.listdir(directory):
+        match = re.fullmatch(r"job-(\d+)\..+", name)
+        if match:
+            files.setdefault(int(match.group(1)), []).append(name)
+    if not files:
+        return 0
+
+    cutoff = _now() - timedelta(days=days)
+    keep = {job_id for (job_id,) in db.query(Job.job_id).filter(
+        Job.job_id.in_(list(files)), or_(Job.finished_at.is_(None), Job.finished_at >= cutoff)
+    )}
+    removed = 0
+    for job_id, names in files.items():
+        if job_id in keep:
+            continue
+        for name in names:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+    return removed
+
+
+def main():
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Run background jobs or clean up after lost ones")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="run a job in the foreground, recorded like one from the API")
+    run_parser.add_argument("kind", choices=sorted(JOB_KINDS))
+    run_parser.add_argument("--params", default="{}", help='JSON object, e.g. \'{"full": true}\'')
+    stale_parser = subparsers.add_parser("fail-stale", help="fail queued/running jobs that stopped reporting")
+    stale_parser.add_argument("--minutes", type=int, default=60)
+    cleanup_parser = subparsers.add_parser("cleanup", help="delete output files of jobs that finished long ago")
+    cleanup_parser.add_argument("--days", type=int, default=settings.JOB_OUTPUT_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "run":
+            params = JOB_KINDS[args.kind][0].model_validate(json.loads(args.params))
+            job = Job(kind=args.kind, params=json.loads(params.model_dump_json()), status=QUEUED)
+            db.add(job)
+            db.commit()
+            status = run_job(SessionLocal, job.job_id)
+            db.refresh(job)
+            if status != SUCCEEDED:
+                print(f"❌ Job {job.job_id} {status}: {job.error or ''}")
+                raise SystemExit(1)
+            print(f"✅ Job {job.job_id} succeeded: {json.dumps(job.result)[:500]}")
+        elif args.command == "fail-stale":
+            count = fail_stale_jobs(db, args.minutes)
+            print(f"✅ Marked {count} stale jobs as failed")
+        else:
+            count = remove_old_outputs(db, args.days)
+            print(f"✅ Deleted {count} job output files older than {args.days} days")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""Lot tracking with first-expired-first-out allocation.
+
+Every IN movement opens a lot that expires perishability_days after it was
+received. OUT and SPOILAGE movements are allocated across the product's open
+lots, earliest expiry first, and each allocation is recorded so deleting the
+movement can give the quantity back. Whatever no lot covers is recorded as a
+shortfall, an allocation without a lot, and the product's next receipt
+settles it before the rest of the receipt opens a lot. So per product, open
+lots minus outstanding shortfalls always equal the stock balance.
+
+LotAllocator keeps a min-heap per product of the open lots it has read,
+keyed by expiry. It reads a product's open lots in expiry order through the
+(product_id, expires_at) index, LOT_BATCH at a time, and only reads on when
+an allocation needs more than it holds, so a unit of work (a request, an
+import batch, a rebuild) reads and locks the lots it uses rather than every
+open lot of the product. Allocating a line only touches the top of the heap
+(O(log n) per lot used). Heaps are not shared between units of work, because
+other workers change lots too: lots stay locked from being read until the
+transaction ends, and quantities are written back as decrements, so two
+movements of the same product never allocate the same stock.
+"""
+import argparse
+import heapq
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import bindparam, delete, func, insert, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryLot, InventoryLotAllocation, InventoryMovement
+from app.models.product import Product
+from app.services.stock import STOCK_IN_TYPES, STOCK_OUT_TYPES, as_utc
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+# open lots read (and locked) per query
+LOT_BATCH = 50
+
+# lots of products without a shelf life are used after every lot that expires
+NEVER = datetime.max.replace(tzinfo=timezone.utc)
+
+
+def _heap_key(lot_id: int, expires_at) -> tuple:
+    return (as_utc(expires_at) if expires_at else NEVER, lot_id)
+
+
+class LotAllocator:
+    """Open lots of some products, as one expiry-ordered heap per product"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._heaps = {}  # product_id -> [(expires_at, lot_id)]
+        self._read_to = {}  # product_id -> (expires_at, lot_id) of the last lot read; expires_at None once past the expiring ones
+        self._all_read = set()  # product_ids whose open lots are all in their heap
+        self._pending = defaultdict(set)  # product_id -> lots inserted in this unit of work, not received yet
+        self._remaining = {}  # lot_id -> quantity left
+        self._taken = defaultdict(Decimal)  # lot_id -> quantity allocated since the last flush
+        self._allocations = []
+        self._shortfalls = {}  # product_id -> [allocation without a lot], oldest first
+        self._settled = defaultdict(Decimal)  # allocation_id of a stored shortfall -> quantity settled since the last flush
+
+    def load(self, product_ids: Iterable[int]):
+        """Read and lock the first open lots of every product not loaded yet.
+
+        Products go in id order and each one's lots in expiry order, a fixed
+        lock order, so concurrent loads can't deadlock.
+        """
+        for product_id in sorted(set(product_ids) - set(self._heaps)):
+            self._heaps[product_id] = []
+            self._read_more(product_id)
+
+    def _read_more(self, product_id: int):
+        """Read and lock the product's next LOT_BATCH open lots in expiry order, those that never expire last"""
+        read_to = self._read_to.get(product_id)
+        query = self.db.query(InventoryLot.lot_id, InventoryLot.expires_at, InventoryLot.quantity_remaining).filter(
+            InventoryLot.product_id == product_id, InventoryLot.quantity_remaining > 0
+        )
+        if self._pending[product_id]:
+            query = query.filter(InventoryLot.lot_id.notin_(self._pending[product_id]))
+        expiring = read_to is None or read_to[0] is not None
+        if expiring:
+            query = query.filter(InventoryLot.expires_at.isnot(None)).order_by(InventoryLot.expires_at, InventoryLot.lot_id)
+            if read_to is not None:
+                query = query.filter(tuple_(InventoryLot.expires_at, InventoryLot.lot_id) > tuple_(*read_to))
+        else:
+            query = query.filter(InventoryLot.expires_at.is_(None), InventoryLot.lot_id > read_to[1]).order_by(InventoryLot.lot_id)
+
+        # a locked read can skip rows another transaction just emptied, so only an empty page means the end
+        lots = query.limit(LOT_BATCH).with_for_update().all()
+        heap = self._heaps[product_id]
+        for lot_id, expires_at, remaining in lots:
+            heapq.heappush(heap, _heap_key(lot_id, expires_at))
+            self._remaining[lot_id] = remaining
+        if lots:
+            self._read_to[product_id] = (lots[-1].expires_at, lots[-1].lot_id)
+        elif expiring:
+            self._read_to[product_id] = (None, 0)
+        else:
+            self._all_read.add(product_id)
+
+    def _needs_read(self, product_id: int) -> bool:
+        """Whether an unread lot could expire before the top of the product's heap"""
+        if product_id in self._all_read:
+            return False
+        read_to = self._read_to.get(product_id)
+        heap = self._heaps[product_id]
+        return read_to is None or not heap or heap[0] > _heap_key(read_to[1], read_to[0])
+
+    def known_empty(self, product_ids: Iterable[int]):
+        """Treat the products as having no open lots or shortfalls, without reading them"""
+        for product_id in product_ids:
+            self._heaps.setdefault(product_id, [])
+            self._all_read.add(product_id)
+            self._shortfalls.setdefault(product_id, [])
+
+    def opened(self, product_id: int, lot_id: int):
+        """Keep a lot just inserted in this unit of work out of reads until receive() makes it available"""
+        if product_id not in self._all_read:
+            self._pending[product_id].add(lot_id)
+
+    def _load_shortfalls(self, product_id: int) -> list:
+        if product_id not in self._shortfalls:
+            rows = self.db.query(
+                InventoryLotAllocation.allocation_id, InventoryLotAllocation.movement_id, InventoryLotAllocation.quantity,
+            ).join(
+                InventoryMovement, InventoryMovement.movement_id == InventoryLotAllocation.movement_id
+            ).filter(
+                InventoryLotAllocation.lot_id.is_(None), InventoryMovement.product_id == product_id
+            ).order_by(InventoryLotAllocation.allocation_id).with_for_update(of=InventoryLotAllocation)
+            self._shortfalls[product_id] = [
+                {"allocation_id": allocation_id, "lot_id": None, "movement_id": movement_id, "quantity": quantity}
+                for allocation_id, movement_id, quantity in rows
+            ]
+        return self._shortfalls[product_id]
+
+    def receive(self, product_id: int, lot_id: int, expires_at, quantity: Decimal):
+        """Settle the product's shortfalls from a lot that was just inserted, then make the rest available"""
+        shortfalls = self._load_shortfalls(product_id)
+        while quantity > 0 and shortfalls:
+            shortfall = shortfalls[0]
+            taken = min(quantity, shortfall["quantity"])
+            shortfall["quantity"] -= taken
+            if shortfall.get("allocation_id"):
+                self._settled[shortfall["allocation_id"]] += taken
+            self._taken[lot_id] += taken
+            self._allocations.append({"lot_id": lot_id, "movement_id": shortfall["movement_id"], "quantity": taken})
+            quantity -= taken
+            if not shortfall["quantity"]:
+                shortfalls.pop(0)
+        if not quantity:
+            return
+        self._heaps.setdefault(product_id, [])
+        heapq.heappush(self._heaps[product_id], _heap_key(lot_id, expires_at))
+        self._remaining[lot_id] = quantity
+
+    def allocate(self, product_id: int, movement_id: int, quantity: Decimal) -> Decimal:
+        """Take quantity from the product's lots, earliest expiry first.
+
+        Returns what no lot covered, which is recorded as a shortfall.
+        """
+        self.load([product_id])
+        heap = self._heaps[product_id]
+        while quantity > 0:
+            if self._needs_read(product_id):
+                self._read_more(product_id)
+                continue
+            if not heap:
+                break
+            lot_id = heap[0][1]
+            taken = min(quantity, self._remaining[lot_id])
+            self._remaining[lot_id] -= taken
+            self._taken[lot_id] += taken
+            self._allocations.append({"lot_id": lot_id, "movement_id": movement_id, "quantity": taken})
+            quantity -= taken
+            if not self._remaining[lot_id]:
+                heapq.heappop(heap)
+        if quantity > 0:
+            shortfall = {"lot_id": None, "movement_id": movement_id, "quantity": quantity}
+            self._load_shortfalls(product_id).append(shortfall)
+            self._allocations.append(shortfall)
+            logger.warning("Movement %s takes %s more of product %s than its lots hold", movement_id, quantity, product_id)
+        return quantity
+
+    def flush(self):
+        """Write remaining quantities and new allocations. The caller owns the transaction."""
+        if self._taken:
+            lots = InventoryLot.__table__
+            self.db.execute(
+                update(lots).where(lots.c.lot_id == bindparam("taken_lot_id"))
+                .values(quantity_remaining=lots.c.quantity_remaining - bindparam("taken")),
+                [{"taken_lot_id": lot_id, "taken": taken} for lot_id, taken in sorted(self._taken.items())],
+            )
+        if self._settled:
+            allocations = InventoryLotAllocation.__table__
+            self.db.execute(
+                update(allocations).where(allocations.c.allocation_id == bindparam("settled_allocation_id"))
+                .values(quantity=allocations.c.quantity - bindparam("settled")),
+                [{"settled_allocation_id": allocation_id, "settled": settled}
+                 for allocation_id, settled in sorted(self._settled.items())],
+            )
+            self.db.execute(delete(InventoryLotAllocation).where(
+                InventoryLotAllocation.allocation_id.in_(list(self._settled)), InventoryLotAllocation.quantity <= 0,
+            ))
+        new = [{key: a[key] for key in ("lot_id", "movement_id", "quantity")} for a in self._allocations if a["quantity"] > 0]
+        if new:
+            self.db.execute(insert(InventoryLotAllocation), new)
+        # shortfalls just inserted have no allocation_id yet, so read them again when they are next needed
+        for product_id, shortfalls in list(self._shortfalls.items()):
+            if any(not shortfall.get("allocation_id") for shortfall in shortfalls):
+                del self._shortfalls[product_id]
+        self._taken.clear()
+        self._settled.clear()
+        self._allocations = []
+
+
+def _shelf_life(db: Session, product_ids) -> dict:
+    if not product_ids:
+        return {}
+    return dict(db.query(Product.product_id, Product.perishability_days).filter(Product.product_id.in_(product_ids)))
+
+
+def _record(db: Session, allocator: LotAllocator, movements: list):
+    """Open lots for the IN movements, then replay all of them in movement date order"""
+    receipts = [m for m in movements if m["movement_type"] in STOCK_IN_TYPES]
+    lot_ids = {}
+    if receipts:
+        shelf_life = _shelf_life(db, {m["product_id"] for m in receipts})
+        lots = [
+            {
+                "product_id": m["product_id"],
+                "movement_id": m["movement_id"],
+                "received_at": m["movement_date"],
+                "expires_at": m["movement_date"] + timedelta(days=shelf_life[m["product_id"]])
+                if shelf_life.get(m["product_id"]) else None,
+                "quantity_received": m["quantity"],
+                "quantity_remaining": m["quantity"],
+            }
+            for m in receipts
+        ]
+        ids = db.execute(
+            insert(InventoryLot).returning(InventoryLot.lot_id, sort_by_parameter_order=True), lots
+        ).scalars().all()
+        lot_ids = {lot["movement_id"]: (lot_id, lot) for lot, lot_id in zip(lots, ids)}
+        for lot, lot_id in zip(lots, ids):
+            allocator.opened(lot["product_id"], lot_id)
+
+    for m in sorted(movements, key=lambda m: (as_utc(m["movement_date"]), m["movement_id"])):
+        if m["movement_type"] in STOCK_IN_TYPES:
+            lot_id, lot = lot_ids[m["movement_id"]]
+            allocator.receive(m["product_id"], lot_id, lot["expires_at"], Decimal(m["quantity"]))
+        elif m["movement_type"] in STOCK_OUT_TYPES:
+            allocator.allocate(m["product_id"], m["movement_id"], Decimal(m["quantity"]))
+
+
+def apply_movement_lots(db: Session, movements: list):
+    """Open lots for IN movements and allocate OUT/SPOILAGE ones. The caller owns the transaction.
+
+    movements are dicts with movement_id, product_id, movement_type, quantity
+    and movement_date.
+    """
+    tracked = [m for m in movements if m["movement_type"] in STOCK_IN_TYPES + STOCK_OUT_TYPES]
+    if not tracked:
+        return
+    allocator = LotAllocator(db)
+    allocator.load({m["product_id"] for m in tracked if m["movement_type"] in STOCK_OUT_TYPES})
+    _record(db, allocator, tracked)
+    allocator.flush()
+
+
+def release_movement_lots(db: Session, movement: InventoryMovement):
+    """Undo a movement's lot effects before it is deleted. The caller owns the transaction.
+
+    Deleting a receipt drops its lot; whatever other movements had drawn from
+    it is allocated again from the product's remaining lots, earliest expiry
+    first. Deleting an OUT/SPOILAGE movement puts its allocations back into
+    their lots.
+    """
+    if movement.movement_type in STOCK_IN_TYPES:
+        lot_ids = [lot_id for (lot_id,) in db.query(InventoryLot.lot_id).filter(InventoryLot.movement_id == movement.movement_id)]
+        if not lot_ids:
+            return
+        orphaned = db.query(
+            InventoryLotAllocation.movement_id, InventoryMovement.product_id, func.sum(InventoryLotAllocation.quantity),
+        ).join(
+            InventoryMovement, InventoryMovement.movement_id == InventoryLotAllocation.movement_id
+        ).filter(InventoryLotAllocation.lot_id.in_(lot_ids)).group_by(
+            InventoryLotAllocation.movement_id, InventoryMovement.product_id, InventoryMovement.movement_date,
+        ).order_by(InventoryMovement.movement_date, InventoryLotAllocation.movement_id).all()
+        db.execute(delete(InventoryLotAllocation).where(InventoryLotAllocation.lot_id.in_(lot_ids)))
+        db.execute(delete(InventoryLot).where(InventoryLot.lot_id.in_(lot_ids)))
+        if orphaned:
+            allocator = LotAllocator(db)
+            for movement_id, product_id, quantity in orphaned:
+                allocator.allocate(product_id, movement_id, Decimal(quantity))
+            allocator.flush()
+        return
+
+    allocations = db.query(InventoryLotAllocation.lot_id, InventoryLotAllocation.quantity).filter(
+        InventoryLotAllocation.movement_id == movement.movement_id
+    ).all()
+    for lot_id, quantity in allocations:
+        if lot_id is None:
+            continue  # a shortfall took nothing from any lot
+        db.execute(
+            update(InventoryLot).where(InventoryLot.lot_id == lot_id)
+            .values(quantity_remaining=InventoryLot.quantity_remaining + quantity)
+        )
+    if allocations:
+        db.execute(delete(InventoryLotAllocation).where(InventoryLotAllocation.movement_id == movement.movement_id))
+
+
+def rebuild_lots(db: Session, batch_size: int = BATCH_SIZE, progress: Optional[Callable[[float], None]] = None) -> int:
+    """Replace all lots and allocations by replaying the movement ledger in date order.
+
+    Each batch is committed on its own. progress, if given, is called with the
+    fraction of movements replayed after each one.
+    """
+    db.execute(delete(InventoryLotAllocation))
+    db.execute(delete(InventoryLot))
+
+    allocator = LotAllocator(db)
+    allocator.known_empty(product_id for (product_id,) in db.query(Product.product_id))
+
+    order_by = (InventoryMovement.movement_date, InventoryMovement.movement_id)
+    query = db.query(
+        InventoryMovement.movement_id, InventoryMovement.product_id, InventoryMovement.movement_type,
+        InventoryMovement.quantity, InventoryMovement.movement_date,
+    ).filter(InventoryMovement.movement_type.in_(STOCK_IN_TYPES + STOCK_OUT_TYPES)).order_by(*order_by)
+
+    total = query.count() if progress is not None else None
+    replayed, last = 0, None
+    while True:
+        page = query if last is None else query.filter(tuple_(*order_by) > tuple_(*last))
+        batch = [row._asdict() for row in page.limit(batch_size)]
+        if not batch:
+            break
+        _record(db, allocator, batch)
+        allocator.flush()
+        db.commit()
+        replayed += len(batch)
+        last = (batch[-1]["movement_date"], batch[-1]["movement_id"])
+        if progress is not None:
+            progress(replayed / total if total else 1.0)
+    db.commit()
+    return replayed
+
+
+def main():
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain inventory lots")
+    parser.add_argument("command", choices=["rebuild"])
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = rebuild_lots(db)
+    finally:
+        db.close()
+    print(f"✅ Rebuilt lots from {count} movements")
+
+
+if __name__ == "__main__":
+    main()
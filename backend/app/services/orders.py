@@ -0,0 +1,88 @@
+"""Bulk order ingestion.
+
+Standing orders from hotels and restaurants arrive in bursts. Instead of one
+request and a flush per order, a batch is validated with a handful of set-based
+lookups and written with one multi-row INSERT for orders and one for items.
+"""
+from typing import List
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.customer import Customer
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.staff import Staff
+from app.schemas.order import OrderCreate
+from app.services.receivables import add_order_balances
+
+
+def _existing_ids(db: Session, column, ids) -> set:
+    if not ids:
+        return set()
+    return {row[0] for row in db.query(column).filter(column.in_(ids)).all()}
+
+
+def _validate(orders: List[OrderCreate], customers: set, products: set, staff: set):
+    """Return an error message per order index for orders that can't be inserted"""
+    errors = {}
+    for index, order in enumerate(orders):
+        if not order.order_items:
+            errors[index] = "Order has no items"
+        elif order.customer_id not in customers:
+            errors[index] = f"Customer {order.customer_id} not found"
+        elif order.created_by is not None and order.created_by not in staff:
+            errors[index] = f"Staff {order.created_by} not found"
+        else:
+            missing = sorted({item.product_id for item in order.order_items} - products)
+            if missing:
+                errors[index] = f"Products not found: {missing}"
+    return errors
+
+
+def bulk_create_orders(db: Session, orders: List[OrderCreate]) -> List[dict]:
+    """Insert many orders and their items in one transaction.
+
+    Returns one result per input order (in input order). Orders that fail
+    validation are reported and skipped; the rest are written together, so a
+    database error fails every order in the batch.
+    """
+    errors = _validate(
+        orders,
+        customers=_existing_ids(db, Customer.customer_id, {o.customer_id for o in orders}),
+        products=_existing_ids(db, Product.product_id, {i.product_id for o in orders for i in o.order_items}),
+        staff=_existing_ids(db, Staff.staff_id, {o.created_by for o in orders if o.created_by is not None}),
+    )
+    valid = [index for index in range(len(orders)) if index not in errors]
+
+    order_ids = {}
+    if valid:
+        try:
+            result = db.execute(
+                insert(Order).returning(Order.order_id, sort_by_parameter_order=True),
+                [orders[index].dict(exclude={'order_items'}) for index in valid],
+            )
+            order_ids = dict(zip(valid, result.scalars().all()))
+
+            db.execute(insert(OrderItem), [
+                {"order_id": order_ids[index], **item.dict()}
+                for index in valid
+                for item in orders[index].order_items
+            ])
+            add_order_balances(db, [
+                {"order_id": order_ids[index], **orders[index].dict(exclude={'order_items', 'created_by'})}
+                for index in valid
+            ])
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            message = f"Batch insert failed: {exc.__class__.__name__}"
+            errors.update({index: message for index in valid})
+            order_ids = {}
+
+    return [
+        {"index": index, "success": False, "error": errors[index]} if index in errors
+        else {"index": index, "success": True, "order_id": order_ids[index]}
+        for index in range(len(orders))
+    ]
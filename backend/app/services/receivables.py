@@ -0,0 +1,275 @@
+"""Maintained receivables: what each order and customer still owes.
+
+order_balances keeps billed, paid and outstanding per order (with the order's
+customer and date, for aging), and customer_balances the same totals per
+customer. Both change in the same transaction as the order or payment that
+moves them, so balance reads and the aging report never join orders against
+payments. Cancelled orders bill nothing.
+"""
+import argparse
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import and_, case, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.order import Order
+from app.models.payment import Payment
+from app.models.receivable import CustomerBalance, OrderBalance
+from app.services.stock import UPSERT_INSERTS, end_of_day
+
+ZERO = Decimal("0")
+
+# (label, lower bound in days) from youngest to oldest
+AGING_BUCKETS = (("days_0_30", 0), ("days_31_60", 31), ("days_61_90", 61), ("days_over_90", 91))
+
+
+def billed_amount(order_status: Optional[str], total_amount) -> Decimal:
+    """What an order bills: its total, or nothing once cancelled"""
+    if order_status == "cancelled":
+        return ZERO
+    return Decimal(total_amount or 0)
+
+
+def apply_customer_delta(db: Session, customer_id: int, billed: Decimal, paid: Decimal):
+    """Add to a customer's running balance. The caller owns the transaction.
+
+    A customer's first order and payment can arrive concurrently, so the row
+    is created the same way apply_stock_delta() creates a stock balance.
+    """
+    if not billed and not paid:
+        return
+
+    insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(CustomerBalance).values(
+            customer_id=customer_id, billed_amount=billed, amount_paid=paid, outstanding=billed - paid
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[CustomerBalance.customer_id],
+            set_={
+                "billed_amount": CustomerBalance.billed_amount + stmt.excluded.billed_amount,
+                "amount_paid": CustomerBalance.amount_paid + stmt.excluded.amount_paid,
+                "outstanding": CustomerBalance.outstanding + stmt.excluded.outstanding,
+                "updated_at": func.now(),
+            },
+        ))
+        return
+
+    if _add_to_customer_balance(db, customer_id, billed, paid):
+        return
+    try:
+        with db.begin_nested():
+            db.add(CustomerBalance(
+                customer_id=customer_id, billed_amount=billed, amount_paid=paid, outstanding=billed - paid
+            ))
+    except IntegrityError:
+        _add_to_customer_balance(db, customer_id, billed, paid)
+
+
+def _add_to_customer_balance(db: Session, customer_id: int, billed: Decimal, paid: Decimal) -> int:
+    return db.query(CustomerBalance).filter(CustomerBalance.customer_id == customer_id).update(
+        {
+            CustomerBalance.billed_amount: CustomerBalance.billed_amount + billed,
+            CustomerBalance.amount_paid: CustomerBalance.amount_paid + paid,
+            CustomerBalance.outstanding: CustomerBalance.outstanding + billed - paid,
+        },
+        synchronize_session=False,
+    )
+
+
+def sync_order_balance(db: Session, order: Order):
+    """Bring an order's balance in line with the order after it was created or changed"""
+    billed = billed_amount(order.order_status, order.total_amount)
+    balance = db.query(OrderBalance).filter(OrderBalance.order_id == order.order_id).with_for_update().first()
+    if balance is None:
+        paid = db.query(func.coalesce(func.sum(Payment.amount_paid), 0)).filter(Payment.order_id == order.order_id).scalar()
+        balance = OrderBalance(order_id=order.order_id, amount_paid=Decimal(paid))
+        db.add(balance)
+    else:
+        # take the old figures off the (possibly different) old customer first
+        apply_customer_delta(db, balance.customer_id, -balance.billed_amount, -balance.amount_paid)
+
+    balance.customer_id = order.customer_id
+    balance.order_date = order.order_date
+    balance.billed_amount = billed
+    balance.outstanding = billed - balance.amount_paid
+    apply_customer_delta(db, order.customer_id, billed, balance.amount_paid)
+    db.flush()
+
+
+def add_order_balances(db: Session, orders: list):
+    """Open balances for freshly inserted orders in one INSERT (orders are dicts with
+    order_id, customer_id, order_date, order_status and total_amount)"""
+    if not orders:
+        return
+    rows = []
+    per_customer = defaultdict(Decimal)
+    for order in orders:
+        billed = billed_amount(order.get("order_status"), order["total_amount"])
+        rows.append({
+            "order_id": order["order_id"],
+            "customer_id": order["customer_id"],
+            "order_date": order["order_date"],
+            "billed_amount": billed,
+            "amount_paid": ZERO,
+            "outstanding": billed,
+        })
+        per_customer[order["customer_id"]] += billed
+    db.execute(insert(OrderBalance), rows)
+    for customer_id, billed in per_customer.items():
+        apply_customer_delta(db, customer_id, billed, ZERO)
+
+
+def remove_order_balance(db: Session, order_id: int):
+    """Drop an order's balance before the order is deleted"""
+    balance = db.query(OrderBalance).filter(OrderBalance.order_id == order_id).with_for_update().first()
+    if balance is None:
+        return
+    apply_customer_delta(db, balance.customer_id, -balance.billed_amount, -balance.amount_paid)
+    db.delete(balance)
+
+
+def apply_payment(db: Session, order_id: int, amount: Decimal):
+    """Reflect a flushed payment (or, with a negative amount, a deleted one) in the balances"""
+    updated = db.query(OrderBalance).filter(OrderBalance.order_id == order_id).update(
+        {
+            OrderBalance.amount_paid: OrderBalance.amount_paid + amount,
+            OrderBalance.outstanding: OrderBalance.outstanding - amount,
+        },
+        synchronize_session=False,
+    )
+    if not updated:
+        # no balance yet: build it from the order and its (already flushed) payments
+        order = db.query(Order).filter(Order.order_id == order_id).first()
+        if order is not None:
+            sync_order_balance(db, order)
+        return
+    customer_id = db.query(OrderBalance.customer_id).filter(OrderBalance.order_id == order_id).scalar()
+    apply_customer_delta(db, customer_id, ZERO, amount)
+
+
+def receivables_aging(db: Session, as_of: Optional[date] = None, customer_id: Optional[int] = None) -> list:
+    """Outstanding amounts per customer split into age buckets, from order_balances in one query"""
+    cutoff = end_of_day(as_of or date.today())
+
+    # an order is n days old once n full days have passed since its date
+    buckets = []
+    for index, (label, low) in enumerate(AGING_BUCKETS):
+        conditions = [OrderBalance.order_date <= cutoff - timedelta(days=low)] if low else []
+        if index + 1 < len(AGING_BUCKETS):
+            conditions.append(OrderBalance.order_date > cutoff - timedelta(days=AGING_BUCKETS[index + 1][1]))
+        buckets.append(func.sum(case((and_(*conditions), OrderBalance.outstanding), else_=0)).label(label))
+
+    total = func.sum(OrderBalance.outstanding)
+    query = db.query(OrderBalance.customer_id, *buckets, total.label("total")).filter(
+        OrderBalance.outstanding > 0,
+        OrderBalance.order_date < cutoff,
+    )
+    if customer_id is not None:
+        query = query.filter(OrderBalance.customer_id == customer_id)
+    return [row._asdict() for row in query.group_by(OrderBalance.customer_id).order_by(total.desc())]
+
+
+def _expected_balances(db: Session) -> dict:
+    """order_id -> balance row recomputed from orders and payments"""
+    paid = select(
+        Payment.order_id, func.sum(Payment.amount_paid).label("amount_paid")
+    ).group_by(Payment.order_id).subquery()
+    rows = db.query(
+        Order.order_id, Order.customer_id, Order.order_date, Order.order_status, Order.total_amount,
+        func.coalesce(paid.c.amount_paid, 0),
+    ).outerjoin(paid, paid.c.order_id == Order.order_id)
+
+    balances = {}
+    for order_id, customer_id, order_date, order_status, total_amount, amount_paid in rows:
+        billed = billed_amount(order_status, total_amount)
+        amount_paid = Decimal(amount_paid)
+        balances[order_id] = {
+            "order_id": order_id,
+            "customer_id": customer_id,
+            "order_date": order_date,
+            "billed_amount": billed,
+            "amount_paid": amount_paid,
+            "outstanding": billed - amount_paid,
+        }
+    return balances
+
+
+def _customer_totals(balances) -> dict:
+    totals = defaultdict(lambda: [ZERO, ZERO])
+    for balance in balances:
+        totals[balance["customer_id"]][0] += balance["billed_amount"]
+        totals[balance["customer_id"]][1] += balance["amount_paid"]
+    return totals
+
+
+def rebuild_receivables(db: Session) -> int:
+    """Replace order_balances and customer_balances with figures recomputed from orders and payments"""
+    balances = _expected_balances(db)
+    db.query(OrderBalance).delete(synchronize_session=False)
+    db.query(CustomerBalance).delete(synchronize_session=False)
+    if balances:
+        db.execute(insert(OrderBalance), list(balances.values()))
+    totals = _customer_totals(balances.values())
+    if totals:
+        db.execute(insert(CustomerBalance), [
+            {"customer_id": customer_id, "billed_amount": billed, "amount_paid": paid, "outstanding": billed - paid}
+            for customer_id, (billed, paid) in totals.items()
+        ])
+    db.commit()
+    return len(balances)
+
+
+def verify_receivables(db: Session) -> list:
+    """Compare order_balances and customer_balances against orders and payments; returns every mismatch"""
+    expected = _expected_balances(db)
+    fields = ("customer_id", "billed_amount", "amount_paid", "outstanding")
+    actual = {row.order_id: row._asdict() for row in db.query(OrderBalance.order_id, *[getattr(OrderBalance, f) for f in fields])}
+
+    mismatches = []
+    for order_id in sorted(set(expected) | set(actual)):
+        want, got = expected.get(order_id), actual.get(order_id)
+        if want is None or got is None or any(want[f] != got[f] for f in fields):
+            mismatches.append({"order_id": order_id, "expected": want and {f: want[f] for f in fields}, "actual": got})
+
+    totals = _customer_totals(expected.values())
+    stored = {row.customer_id: (row.billed_amount, row.amount_paid)
+              for row in db.query(CustomerBalance.customer_id, CustomerBalance.billed_amount, CustomerBalance.amount_paid)}
+    for customer_id in sorted(set(totals) | set(stored)):
+        want = tuple(totals.get(customer_id, (ZERO, ZERO)))
+        got = stored.get(customer_id, (ZERO, ZERO))
+        if want != got:
+            mismatches.append({"customer_id": customer_id, "expected": want, "actual": got})
+    return mismatches
+
+
+def main():
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain the order_balances and customer_balances tables")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            count = rebuild_receivables(db)
+            print(f"✅ Rebuilt receivables for {count} orders")
+        else:
+            mismatches = verify_receivables(db)
+            for m in mismatches:
+                subject = f"order {m['order_id']}" if "order_id" in m else f"customer {m['customer_id']}"
+                print(f"❌ {subject}: stored {m['actual']}, expected {m['expected']}")
+            if mismatches:
+                raise SystemExit(1)
+            print("✅ Receivables match orders and payments")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Reorder points and procurement suggestions for the whole catalog.
+
+Inputs come from a handful of set-based queries (active products, stock
+balances, quantities on draft procurements, each product's latest supplier
+and price) plus the cached demand forecast. They are aligned into arrays by
+product and every product is computed in one pass:
+
+  daily demand   mean of the forecast over its horizon
+  reorder point  daily * (lead days + safety days)
+  order-up-to    daily * (review days + safety days), capped at
+                 daily * perishability_days so we never buy more than sells
+                 before it spoils
+  suggestion     order-up-to - (stock + on order), once stock + on order is
+                 at or below the reorder point
+
+Draft procurements count as on order, so running the job twice does not
+suggest the same quantity again, until the draft is received or cancelled
+(close_draft()).
+"""
+import argparse
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.inventory import StockBalance
+from app.models.procurement import Procurement, ProcurementItem
+from app.models.product import Product
+from app.models.supplier import Supplier
+from app.services.forecasting import forecast_demand
+
+DRAFT, RECEIVED, CANCELLED = "draft", "received", "cancelled"
+
+
+def _aligned(product_ids: np.ndarray, rows, fill=0.0) -> np.ndarray:
+    """Spread (product_id, value) rows over an array aligned with product_ids"""
+    values = np.full(len(product_ids), fill, dtype=float)
+    rows = [(product_id, value) for product_id, value in rows if value is not None]
+    if rows:
+        ids, data = zip(*rows)
+        positions = np.searchsorted(product_ids, ids)
+        found = (positions < len(product_ids)) & (product_ids[np.minimum(positions, len(product_ids) - 1)] == ids)
+        values[positions[found]] = np.array(data, dtype=float)[found]
+    return values
+
+
+def _latest_suppliers(db: Session) -> dict:
+    """product_id -> (supplier_id, unit_cost) of the product's latest received procurement"""
+    ranked = select(
+        ProcurementItem.product_id,
+        Procurement.supplier_id,
+        ProcurementItem.unit_cost,
+        func.row_number().over(
+            partition_by=ProcurementItem.product_id,
+            order_by=(Procurement.procurement_date.desc(), ProcurementItem.procurement_item_id.desc()),
+        ).label("position"),
+    ).join(
+        Procurement, Procurement.procurement_id == ProcurementItem.procurement_id
+    ).join(
+        Supplier, Supplier.supplier_id == Procurement.supplier_id
+    ).where(
+        Procurement.status == RECEIVED, Supplier.is_active.isnot(False)
+    ).subquery()
+
+    rows = db.execute(
+        select(ranked.c.product_id, ranked.c.supplier_id, ranked.c.unit_cost).where(ranked.c.position == 1)
+    )
+    return {product_id: (supplier_id, unit_cost) for product_id, supplier_id, unit_cost in rows}
+
+
+def suggest_replenishment(db: Session, category_id: Optional[int] = None) -> list:
+    """Suggested order quantity per product (only products that need ordering)"""
+    products = db.query(Product.product_id, Product.perishability_days).filter(Product.is_active.isnot(False))
+    if category_id is not None:
+        products = products.filter(Product.category_id == category_id)
+    products = products.order_by(Product.product_id).all()
+    if not products:
+        return []
+
+    product_ids = np.array([p.product_id for p in products], dtype=np.int64)
+    shelf_life = np.array([np.nan if p.perishability_days is None else p.perishability_days for p in products], dtype=float)
+    stock = _aligned(product_ids, db.query(StockBalance.product_id, StockBalance.stock_in - StockBalance.stock_out))
+    on_order = _aligned(product_ids, db.query(ProcurementItem.product_id, func.sum(ProcurementItem.quantity)).join(
+        Procurement, Procurement.procurement_id == ProcurementItem.procurement_id
+    ).filter(Procurement.status == DRAFT).group_by(ProcurementItem.product_id))
+
+    forecast = forecast_demand(db)
+    daily = _aligned(product_ids, zip(forecast.product_ids.tolist(), forecast.daily.mean(axis=1).tolist()))
+
+    safety = settings.REPLENISHMENT_SAFETY_DAYS
+    reorder_point = daily * (settings.REPLENISHMENT_LEAD_DAYS + safety)
+    uncapped = daily * (settings.REPLENISHMENT_REVIEW_DAYS + safety)
+    # NaN shelf life (not set) never caps
+    order_up_to = np.fmin(uncapped, daily * shelf_life)
+    available = stock + on_order
+    quantity = np.where(available <= reorder_point, np.ceil(np.clip(order_up_to - available, 0, None)), 0)
+
+    suppliers = _latest_suppliers(db)
+    suggestions = []
+    for i in np.flatnonzero(quantity > 0):
+        product_id = int(product_ids[i])
+        supplier_id, unit_cost = suppliers.get(product_id, (None, None))
+        suggestions.append({
+            "product_id": product_id,
+            "supplier_id": supplier_id,
+            "unit_cost": unit_cost,
+            "current_stock": round(float(stock[i]), 2),
+            "on_order": round(float(on_order[i]), 2),
+            "daily_demand": round(float(daily[i]), 2),
+            "reorder_point": round(float(reorder_point[i]), 2),
+            "order_up_to": round(float(order_up_to[i]), 2),
+            "suggested_quantity": float(quantity[i]),
+            "shelf_life_capped": bool(order_up_to[i] < uncapped[i]),
+        })
+    return suggestions
+
+
+def write_draft_procurements(db: Session, recorded_by: Optional[int] = None) -> dict:
+    """Turn the current suggestions into draft procurements, one per supplier, in two INSERTs.
+
+    Products without a known supplier are skipped; they still show up in the
+    suggestions endpoint.
+    """
+    by_supplier = defaultdict(list)
+    for suggestion in suggest_replenishment(db):
+        if suggestion["supplier_id"] is not None:
+            by_supplier[suggestion["supplier_id"]].append(suggestion)
+    if not by_supplier:
+        return {"procurements": 0, "items": 0, "procurement_ids": []}
+
+    supplier_ids = sorted(by_supplier)
+    now = datetime.now(timezone.utc)
+    procurement_ids = db.execute(
+        insert(Procurement).returning(Procurement.procurement_id, sort_by_parameter_order=True),
+        [
+            {
+                "supplier_id": supplier_id,
+                "procurement_date": now,
+                "status": DRAFT,
+                "total_cost": sum(Decimal(str(s["suggested_quantity"])) * s["unit_cost"] for s in by_supplier[supplier_id]),
+                "recorded_by": recorded_by,
+            }
+            for supplier_id in supplier_ids
+        ],
+    ).scalars().all()
+
+    items = [
+        {
+            "procurement_id": procurement_id,
+            "product_id": s["product_id"],
+            "quantity": Decimal(str(s["suggested_quantity"])),
+            "unit_cost": s["unit_cost"],
+        }
+        for supplier_id, procurement_id in zip(supplier_ids, procurement_ids)
+        for s in by_supplier[supplier_id]
+    ]
+    db.execute(insert(ProcurementItem), items)
+    db.commit()
+    return {"procurements": len(procurement_ids), "items": len(items), "procurement_ids": procurement_ids}
+
+
+def close_draft(db: Session, procurement_id: int, status: str) -> bool:
+    """Mark a draft procurement received or cancelled, which takes it off order.
+
+    Returns False when it was not (or no longer) a draft.
+    """
+    if status not in (RECEIVED, CANCELLED):
+        raise ValueError(f"A draft can only become {RECEIVED} or {CANCELLED}, not {status!r}")
+    closed = db.query(Procurement).filter(
+        Procurement.procurement_id == procurement_id, Procurement.status == DRAFT
+    ).update({Procurement.status: status}, synchronize_session=False)
+    db.commit()
+    return bool(closed)
+
+
+def main():
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Suggest procurements and write them as drafts")
+    parser.add_argument("--dry-run", action="store_true", help="print the suggestions without writing drafts")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            for s in suggest_replenishment(db):
+                supplier = s["supplier_id"] if s["supplier_id"] is not None else "no supplier"
+                print(f"  product {s['product_id']}: {s['suggested_quantity']} from {supplier}")
+        else:
+            result = write_draft_procurements(db)
+            print(f"✅ Wrote {result['procurements']} draft procurements ({result['items']} lines)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
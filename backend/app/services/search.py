@@ -0,0 +1,241 @@
+"""Typo-tolerant search over product, customer and supplier names and locations.
+
+Matching is by trigrams, the way pg_trgm does it: text is lowercased, split
+into words, each word padded with two spaces in front and one behind, and cut
+into every run of three characters. A query matches a field when enough of
+the query's trigrams appear in it (word similarity), so "tomatos" still
+finds "Fresh Tomatoes" and "hotl" finds "Hotel Ibis".
+
+On Postgres the search is one UNION ALL query using the `%>` operator, which
+the GIN trigram indexes on the searched columns serve. Everywhere else it
+uses NgramIndex, an in-process inverted index from trigram to field. It is
+loaded on the first search and kept in sync by the write endpoints; since
+other processes (imports, other workers) can write too, it is reloaded once
+it is older than SEARCH_INDEX_TTL.
+"""
+import re
+import threading
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+
+from sqlalchemy import func, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.customer import Customer
+from app.models.product import Product
+from app.models.supplier import Supplier
+
+# entity -> (model, id column, name column, location column)
+SEARCH_ENTITIES = {
+    "product": (Product, Product.product_id, Product.product_name, None),
+    "customer": (Customer, Customer.customer_id, Customer.business_name, Customer.location),
+    "supplier": (Supplier, Supplier.supplier_id, Supplier.supplier_name, Supplier.location),
+}
+
+# a location match ranks just below an equally good name match
+LOCATION_WEIGHT = 0.9
+
+# ties between equal scores go by type, then id
+ENTITY_ORDER = sorted(SEARCH_ENTITIES)
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: Optional[str]) -> set:
+    """pg_trgm's trigrams of a string"""
+    grams = set()
+    for word in _WORD.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NgramIndex:
+    """Inverted trigram index over the searchable fields of every entity.
+
+    Every (entity, id, field) gets an integer slot, with its weight, entity
+    and id held in arrays. A search concatenates the posting arrays of the
+    query's trigrams, counts hits per slot with one np.bincount and ranks in
+    NumPy, so only the top results are ever turned into Python objects.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+        self.loaded_at = None
+
+    def _reset(self):
+        self._postings = {}  # trigram -> {slot}
+        self._arrays = {}  # trigram -> postings as an array, rebuilt after a change
+        self._free = []
+        self._size = 0  # slots handed out so far
+        self._weight = np.zeros(1024)  # 0 for a free slot
+        self._entity = np.full(1024, -1, dtype=np.int8)  # position in ENTITY_ORDER, -1 for a free slot
+        self._record_id = np.zeros(1024, dtype=np.int64)
+        self._records = {}  # (entity, id) -> (name, location, {field: (slot, grams)})
+
+    def _new_slot(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._size == len(self._weight):
+            grow = len(self._weight)
+            self._weight = np.concatenate([self._weight, np.zeros(grow)])
+            self._entity = np.concatenate([self._entity, np.full(grow, -1, dtype=np.int8)])
+            self._record_id = np.concatenate([self._record_id, np.zeros(grow, dtype=np.int64)])
+        self._size += 1
+        return self._size - 1
+
+    def _put(self, entity: str, record_id: int, name: Optional[str], location: Optional[str]):
+        self._remove(entity, record_id)
+        fields = {}
+        for field, text, weight in (("name", name, 1.0), ("location", location, LOCATION_WEIGHT)):
+            grams = trigrams(text)
+            if not grams:
+                continue
+            slot = self._new_slot()
+            self._weight[slot] = weight
+            self._entity[slot] = ENTITY_ORDER.index(entity)
+            self._record_id[slot] = record_id
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(slot)
+                self._arrays.pop(gram, None)
+            fields[field] = (slot, grams)
+        self._records[(entity, record_id)] = (name, location, fields)
+
+    def _remove(self, entity: str, record_id: int):
+        record = self._records.pop((entity, record_id), None)
+        if record is None:
+            return
+        for slot, grams in record[2].values():
+            for gram in grams:
+                postings = self._postings[gram]
+                postings.discard(slot)
+                if not postings:
+                    del self._postings[gram]
+                self._arrays.pop(gram, None)
+            self._weight[slot] = 0
+            self._entity[slot] = -1
+            self._free.append(slot)
+
+    def _array(self, gram: str) -> np.ndarray:
+        array = self._arrays.get(gram)
+        if array is None:
+            array = self._arrays[gram] = np.fromiter(self._postings.get(gram, ()), dtype=np.int64)
+        return array
+
+    def load(self, db: Session):
+        """Replace the index with every searchable record, one query per entity"""
+        with self._lock:
+            self._reset()
+            for entity, (_, id_column, name_column, location_column) in SEARCH_ENTITIES.items():
+                columns = [id_column, name_column] + ([location_column] if location_column is not None else [])
+                for row in db.query(*columns):
+                    self._put(entity, row[0], row[1], row[2] if len(row) > 2 else None)
+            self.loaded_at = time.monotonic()
+
+    def stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > settings.SEARCH_INDEX_TTL
+
+    def put(self, entity: str, record_id: int, name: Optional[str], location: Optional[str] = None):
+        """Add or replace a record (a no-op until the index is loaded)"""
+        with self._lock:
+            if self.loaded_at is not None:
+                self._put(entity, record_id, name, location)
+
+    def remove(self, entity: str, record_id: int):
+        with self._lock:
+            self._remove(entity, record_id)
+
+    def search(self, query: str, entities: Iterable[str], limit: int, min_score: float) -> list:
+        """Best matches first: the share of the query's trigrams found in the name or location"""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        with self._lock:
+            size = self._size
+            postings = [self._array(gram) for gram in grams]
+            hits = np.bincount(np.concatenate(postings), minlength=size) if size else np.zeros(0)
+            scores = hits / len(grams) * self._weight[:size]
+            codes = self._entity[:size]
+            matches = np.flatnonzero((scores >= min_score) & (scores > 0) & np.isin(
+                codes, [ENTITY_ORDER.index(entity) for entity in entities]
+            ))
+            # score desc, then type and id like the Postgres query
+            ranked = matches[np.lexsort((self._record_id[matches], codes[matches], -scores[matches]))]
+
+            results, seen = [], set()
+            for slot in ranked.tolist():
+                key = (ENTITY_ORDER[codes[slot]], int(self._record_id[slot]))
+                if key in seen:
+                    continue  # the record's other field scored higher
+                seen.add(key)
+                name, location, _ = self._records[key]
+                results.append({"type": key[0], "id": key[1], "name": name, "location": location,
+                                "score": round(float(scores[slot]), 4)})
+                if len(results) == limit:
+                    break
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self.loaded_at = None
+
+
+search_index = NgramIndex()
+
+
+def index_record(entity: str, record):
+    """Reflect a created or updated record in the in-process index"""
+    _, id_column, name_column, location_column = SEARCH_ENTITIES[entity]
+    location = getattr(record, location_column.key) if location_column is not None else None
+    search_index.put(entity, getattr(record, id_column.key), getattr(record, name_column.key), location)
+
+
+def unindex_record(entity: str, record_id: int):
+    search_index.remove(entity, record_id)
+
+
+def _search_postgres(db: Session, query: str, entities: list, limit: int, min_score: float) -> list:
+    # `column %> query` (the commuted `query <% column`) filters by pg_trgm.word_similarity_threshold,
+    # which is set for this transaction only
+    db.execute(select(func.set_config("pg_trgm.word_similarity_threshold", str(min_score), True)))
+    selects = []
+    for entity in entities:
+        _, id_column, name_column, location_column = SEARCH_ENTITIES[entity]
+        name_score = func.word_similarity(query, name_column)
+        matches = name_column.bool_op("%>")(query)
+        score, location = name_score, null()
+        if location_column is not None:
+            score = func.greatest(name_score, func.word_similarity(query, location_column) * LOCATION_WEIGHT)
+            matches = or_(matches, location_column.bool_op("%>")(query))
+            location = location_column
+        selects.append(select(
+            literal(entity).label("type"),
+            id_column.label("id"),
+            name_column.label("name"),
+            location.label("location"),
+            score.label("score"),
+        ).where(matches))
+
+    results = union_all(*selects).subquery()
+    rows = db.execute(select(results).where(results.c.score >= min_score).order_by(
+        results.c.score.desc(), results.c.type, results.c.id
+    ).limit(limit))
+    return [{**row._asdict(), "score": round(float(row.score), 4)} for row in rows]
+
+
+def search(db: Session, query: str, entities: Optional[Iterable[str]] = None, limit: int = 20,
+           min_score: Optional[float] = None) -> list:
+    """Ranked matches for query across the given entities (default all of them)"""
+    wanted = set(SEARCH_ENTITIES if entities is None else entities)
+    entities = [entity for entity in SEARCH_ENTITIES if entity in wanted]
+    min_score = settings.SEARCH_MIN_SIMILARITY if min_score is None else min_score
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, query, entities, limit, min_score)
+    if search_index.stale():
+        search_index.load(db)
+    return search_index.search(query, entities, limit, min_score)
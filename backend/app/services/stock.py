@@ -0,0 +1,398 @@
+"""Maintained per-product stock balances.
+
+inventory_movements stays the source of truth. stock_balances keeps the running
+IN and OUT/SPOILAGE totals per product so a stock read is a single primary key
+lookup instead of summing the product's whole history.
+
+For stock at a past date, stock_checkpoints holds the same totals per product
+at the start of every day or month (STOCK_CHECKPOINT_PERIOD). A point-in-time
+read starts from the product's latest checkpoint before that date and sums only
+the movements after it. Backdated movements are added to the checkpoints taken
+after them, so checkpoints never have to be rebuilt.
+"""
+import argparse
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Optional
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.inventory import InventoryMovement, StockBalance, StockCheckpoint
+from app.models.product import Product
+
+STOCK_IN_TYPES = ('IN',)
+STOCK_OUT_TYPES = ('OUT', 'SPOILAGE')
+
+CHECKPOINT_PERIODS = ('day', 'month')
+
+ZERO = Decimal("0")
+
+# backends whose INSERT ... ON CONFLICT DO UPDATE creates or adds to a balance in one statement
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def movement_delta(movement_type: str, quantity) -> tuple[Decimal, Decimal]:
+    """Return the (stock_in, stock_out) contribution of a single movement"""
+    quantity = Decimal(quantity or 0)
+    if movement_type in STOCK_IN_TYPES:
+        return quantity, ZERO
+    if movement_type in STOCK_OUT_TYPES:
+        return ZERO, quantity
+    # ADJUSTMENT and unknown types don't count towards stock
+    return ZERO, ZERO
+
+
+def apply_stock_delta(db: Session, product_id: int, stock_in: Decimal, stock_out: Decimal):
+    """Add to a product's running balance. The caller owns the transaction.
+
+    A product's first movements can arrive concurrently, so the row is created
+    with an upsert where the backend has one; elsewhere a losing insert falls
+    back to the update inside a savepoint.
+    """
+    if not stock_in and not stock_out:
+        return
+
+    insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(StockBalance).values(product_id=product_id, stock_in=stock_in, stock_out=stock_out)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[StockBalance.product_id],
+            set_={
+                "stock_in": StockBalance.stock_in + stmt.excluded.stock_in,
+                "stock_out": StockBalance.stock_out + stmt.excluded.stock_out,
+                "updated_at": func.now(),
+            },
+        ))
+        return
+
+    if _add_to_balance(db, product_id, stock_in, stock_out):
+        return
+    try:
+        with db.begin_nested():
+            db.add(StockBalance(product_id=product_id, stock_in=stock_in, stock_out=stock_out))
+    except IntegrityError:
+        _add_to_balance(db, product_id, stock_in, stock_out)
+
+
+def _add_to_balance(db: Session, product_id: int, stock_in: Decimal, stock_out: Decimal) -> int:
+    return db.query(StockBalance).filter(StockBalance.product_id == product_id).update(
+        {
+            StockBalance.stock_in: StockBalance.stock_in + stock_in,
+            StockBalance.stock_out: StockBalance.stock_out + stock_out,
+        },
+        synchronize_session=False,
+    )
+
+
+def shift_checkpoints(db: Session, product_id: int, movement_date: datetime, stock_in: Decimal, stock_out: Decimal):
+    """Add a backdated movement to every checkpoint taken after it. The caller owns the transaction."""
+    if not stock_in and not stock_out:
+        return
+
+    db.query(StockCheckpoint).filter(
+        StockCheckpoint.product_id == product_id,
+        StockCheckpoint.checkpoint_at > movement_date,
+    ).update(
+        {
+            StockCheckpoint.stock_in: StockCheckpoint.stock_in + stock_in,
+            StockCheckpoint.stock_out: StockCheckpoint.stock_out + stock_out,
+        },
+        synchronize_session=False,
+    )
+
+
+def apply_movement(db: Session, movement: InventoryMovement, reverse: bool = False):
+    """Reflect a created (or, with reverse=True, deleted) movement in stock_balances and checkpoints"""
+    stock_in, stock_out = movement_delta(movement.movement_type, movement.quantity)
+    if reverse:
+        stock_in, stock_out = -stock_in, -stock_out
+    apply_stock_delta(db, movement.product_id, stock_in, stock_out)
+    shift_checkpoints(db, movement.product_id, movement.movement_date, stock_in, stock_out)
+
+
+def apply_backdated_movements(db: Session, rows: list):
+    """shift_checkpoints for a batch of movement dicts.
+
+    Only rows dated before the latest checkpoint can touch one, so in the usual
+    case (importing recent movements) this is a single MAX() lookup.
+    """
+    latest = db.query(func.max(StockCheckpoint.checkpoint_at)).scalar()
+    if latest is None:
+        return
+    latest = as_utc(latest)
+    for row in rows:
+        if as_utc(row["movement_date"]) < latest:
+            stock_in, stock_out = movement_delta(row["movement_type"], row["quantity"])
+            shift_checkpoints(db, row["product_id"], row["movement_date"], stock_in, stock_out)
+
+
+def get_stock_balance(db: Session, product_id: int, as_of: Optional[date] = None) -> dict:
+    """Stock for a product read from the maintained balance, or its closing stock on as_of"""
+    if as_of is not None:
+        stock_in, stock_out = _totals_before(db, end_of_day(as_of), product_ids=[product_id]).get(product_id, (ZERO, ZERO))
+        return _stock_level(product_id, stock_in, stock_out)
+
+    balance = db.query(StockBalance).filter(StockBalance.product_id == product_id).first()
+    stock_in = balance.stock_in if balance else ZERO
+    stock_out = balance.stock_out if balance else ZERO
+    return _stock_level(product_id, stock_in, stock_out)
+
+
+def iter_stock_snapshot(db: Session, product_ids=None, category_id=None, batch_size: int = 1000,
+                        as_of: Optional[date] = None):
+    """Yield current stock (or closing stock on as_of) for many products from one grouped query.
+
+    Rows come back as (product_id, movement_type, total) ordered by product, so
+    each product's levels can be folded together and yielded as soon as the
+    next product starts, without holding the whole catalog in memory.
+    """
+    if as_of is not None:
+        totals = _totals_before(db, end_of_day(as_of), product_ids, category_id)
+        products = _restrict(db.query(Product.product_id), Product.product_id, product_ids, category_id)
+        for (product_id,) in products.order_by(Product.product_id).yield_per(batch_size):
+            yield _stock_level(product_id, *totals.get(product_id, (ZERO, ZERO)))
+        return
+
+    query = db.query(
+        Product.product_id,
+        InventoryMovement.movement_type,
+        func.sum(InventoryMovement.quantity),
+    ).outerjoin(
+        InventoryMovement, InventoryMovement.product_id == Product.product_id
+    )
+    if product_ids:
+        query = query.filter(Product.product_id.in_(product_ids))
+    if category_id is not None:
+        query = query.filter(Product.category_id == category_id)
+    query = query.group_by(
+        Product.product_id, InventoryMovement.movement_type
+    ).order_by(Product.product_id).yield_per(batch_size)
+
+    current_id, stock_in, stock_out = None, ZERO, ZERO
+    for product_id, movement_type, total in query:
+        if product_id != current_id:
+            if current_id is not None:
+                yield _stock_level(current_id, stock_in, stock_out)
+            current_id, stock_in, stock_out = product_id, ZERO, ZERO
+        d_in, d_out = movement_delta(movement_type, total)
+        stock_in += d_in
+        stock_out += d_out
+    if current_id is not None:
+        yield _stock_level(current_id, stock_in, stock_out)
+
+
+def _stock_level(product_id: int, stock_in: Decimal, stock_out: Decimal) -> dict:
+    return {
+        "product_id": product_id,
+        "current_stock": float(stock_in - stock_out),
+        "stock_in": float(stock_in),
+        "stock_out": float(stock_out)
+    }
+
+
+def end_of_day(day: date) -> datetime:
+    """The instant a day's closing stock is taken at (midnight UTC after it)"""
+    return datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands timestamps back without a zone; they are stored as UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _period_start(value: datetime, period: str) -> datetime:
+    value = as_utc(value).astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1 if period == "month" else value.day, tzinfo=timezone.utc)
+
+
+def _next_period(value: datetime, period: str) -> datetime:
+    if period == "day":
+        return value + timedelta(days=1)
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _restrict(query, column, product_ids=None, category_id=None):
+    if product_ids:
+        query = query.filter(column.in_(product_ids))
+    if category_id is not None:
+        query = query.filter(column.in_(select(Product.product_id).where(Product.category_id == category_id)))
+    return query
+
+
+def _totals_before(db: Session, cutoff: datetime, product_ids=None, category_id=None) -> dict:
+    """(stock_in, stock_out) per product over the movements dated before cutoff.
+
+    Each product starts from its latest checkpoint at or before cutoff, and only
+    the movements between that checkpoint and cutoff are summed (all of them for
+    products without one).
+    """
+    latest = _restrict(
+        db.query(StockCheckpoint.product_id, func.max(StockCheckpoint.checkpoint_at).label("checkpoint_at")),
+        StockCheckpoint.product_id, product_ids, category_id,
+    ).filter(StockCheckpoint.checkpoint_at <= cutoff).group_by(StockCheckpoint.product_id).subquery()
+
+    checkpoints = db.query(
+        StockCheckpoint.product_id, StockCheckpoint.stock_in, StockCheckpoint.stock_out
+    ).join(latest, and_(
+        latest.c.product_id == StockCheckpoint.product_id,
+        latest.c.checkpoint_at == StockCheckpoint.checkpoint_at,
+    ))
+    totals = {product_id: (stock_in, stock_out) for product_id, stock_in, stock_out in checkpoints}
+
+    replay = _restrict(
+        db.query(InventoryMovement.product_id, InventoryMovement.movement_type, func.sum(InventoryMovement.quantity)),
+        InventoryMovement.product_id, product_ids, category_id,
+    ).outerjoin(
+        latest, latest.c.product_id == InventoryMovement.product_id
+    ).filter(
+        InventoryMovement.movement_date < cutoff,
+        or_(latest.c.checkpoint_at.is_(None), InventoryMovement.movement_date >= latest.c.checkpoint_at),
+    ).group_by(InventoryMovement.product_id, InventoryMovement.movement_type)
+    _add_movement_totals(totals, replay)
+    return totals
+
+
+def _add_movement_totals(totals: dict, rows):
+    for product_id, movement_type, total in rows:
+        d_in, d_out = movement_delta(movement_type, total)
+        stock_in, stock_out = totals.get(product_id, (ZERO, ZERO))
+        totals[product_id] = (stock_in + d_in, stock_out + d_out)
+
+
+def build_checkpoints(
+    db: Session, period: str = None, until: Optional[datetime] = None, rebuild: bool = False,
+    progress: Optional[Callable[[float], None]] = None,
+) -> dict:
+    """Write checkpoints for every period boundary since the last one (backfilling from the first movement).
+
+    Only boundaries up to until (default now) are written, so the current,
+    still open, period never gets one. Each boundary is committed on its own;
+    an interrupted backfill resumes where it stopped. progress, if given, is
+    called with the fraction of boundaries written after each one.
+    """
+    period = period or settings.STOCK_CHECKPOINT_PERIOD
+    if period not in CHECKPOINT_PERIODS:
+        raise ValueError(f"Unknown checkpoint period {period!r}")
+
+    if rebuild:
+        db.query(StockCheckpoint).delete(synchronize_session=False)
+        db.commit()
+
+    last = db.query(func.max(StockCheckpoint.checkpoint_at)).scalar()
+    if last is None:
+        first = db.query(func.min(InventoryMovement.movement_date)).scalar()
+        if first is None:
+            return {"checkpoints": 0, "rows": 0}
+        last = first
+    boundary = _next_period(_period_start(last, period), period)
+    end = _period_start(until or datetime.now(timezone.utc), period)
+
+    total, pending = 0, boundary
+    while pending <= end:
+        total, pending = total + 1, _next_period(pending, period)
+
+    checkpoints = rows = 0
+    totals, previous = None, None
+    while boundary <= end:
+        if totals is None:
+            totals = _totals_before(db, boundary)
+        else:
+            # roll the previous boundary forward instead of starting over
+            _add_movement_totals(totals, db.query(
+                InventoryMovement.product_id, InventoryMovement.movement_type, func.sum(InventoryMovement.quantity)
+            ).filter(
+                InventoryMovement.movement_date >= previous, InventoryMovement.movement_date < boundary
+            ).group_by(InventoryMovement.product_id, InventoryMovement.movement_type))
+
+        db.bulk_insert_mappings(StockCheckpoint, [
+            {"product_id": product_id, "checkpoint_at": boundary, "stock_in": stock_in, "stock_out": stock_out}
+            for product_id, (stock_in, stock_out) in totals.items()
+        ])
+        db.commit()
+        checkpoints += 1
+        rows += len(totals)
+        previous, boundary = boundary, _next_period(boundary, period)
+        if progress is not None:
+            progress(checkpoints / total)
+    return {"checkpoints": checkpoints, "rows": rows}
+
+
+def _ledger_totals(db: Session) -> dict:
+    """Recompute (stock_in, stock_out) per product from the movement ledger"""
+    rows = db.query(
+        InventoryMovement.product_id,
+        func.sum(case((InventoryMovement.movement_type.in_(STOCK_IN_TYPES), InventoryMovement.quantity), else_=0)),
+        func.sum(case((InventoryMovement.movement_type.in_(STOCK_OUT_TYPES), InventoryMovement.quantity), else_=0)),
+    ).group_by(InventoryMovement.product_id).all()
+    return {product_id: (Decimal(stock_in or 0), Decimal(stock_out or 0)) for product_id, stock_in, stock_out in rows}
+
+
+def rebuild_stock_balances(db: Session) -> int:
+    """Replace stock_balances with totals recomputed from the ledger"""
+    totals = _ledger_totals(db)
+    db.query(StockBalance).delete(synchronize_session=False)
+    db.bulk_insert_mappings(StockBalance, [
+        {"product_id": product_id, "stock_in": stock_in, "stock_out": stock_out}
+        for product_id, (stock_in, stock_out) in totals.items()
+    ])
+    db.commit()
+    return len(totals)
+
+
+def verify_stock_balances(db: Session) -> list:
+    """Compare stock_balances against the ledger and return every mismatch"""
+    totals = _ledger_totals(db)
+    balances = {b.product_id: (b.stock_in, b.stock_out) for b in db.query(StockBalance).all()}
+
+    mismatches = []
+    for product_id in sorted(set(totals) | set(balances)):
+        expected = totals.get(product_id, (ZERO, ZERO))
+        actual = balances.get(product_id, (ZERO, ZERO))
+        if expected != actual:
+            mismatches.append({
+                "product_id": product_id,
+                "expected_stock_in": float(expected[0]),
+                "expected_stock_out": float(expected[1]),
+                "stock_in": float(actual[0]),
+                "stock_out": float(actual[1]),
+            })
+    return mismatches
+
+
+def main():
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain the stock_balances and stock_checkpoints tables")
+    parser.add_argument("command", choices=["rebuild", "verify", "checkpoint"])
+    parser.add_argument("--period", choices=CHECKPOINT_PERIODS, default=None,
+                        help="checkpoint every day or month (default STOCK_CHECKPOINT_PERIOD)")
+    parser.add_argument("--rebuild", action="store_true", help="drop existing checkpoints and backfill from scratch")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            count = rebuild_stock_balances(db)
+            print(f"✅ Rebuilt stock balances for {count} products")
+        elif args.command == "checkpoint":
+            result = build_checkpoints(db, period=args.period, rebuild=args.rebuild)
+            print(f"✅ Wrote {result['checkpoints']} checkpoints ({result['rows']} product balances)")
+        else:
+            mismatches = verify_stock_balances(db)
+            for m in mismatches:
+                print(f"❌ product {m['product_id']}: "
+                      f"in {m['stock_in']} (ledger {m['expected_stock_in']}), "
+                      f"out {m['stock_out']} (ledger {m['expected_stock_out']})")
+            if mismatches:
+                raise SystemExit(1)
+            print("✅ Stock balances match the movement ledger")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
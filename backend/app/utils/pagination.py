@@ -0,0 +1,88 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+A cursor is the sort key of the last row on a page, base64-encoded so clients
+treat it as opaque. The next page filters on (key) > (cursor) instead of
+OFFSET, so every page costs the same no matter how deep it is.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json(value, column):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values) -> str:
+    """Encode a row's sort key as an opaque cursor"""
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns) -> list:
+    """Decode a cursor back into typed sort key values"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [_from_json(v, col) for v, col in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, order_by, limit: int, skip: int = 0, cursor: Optional[str] = None):
+    """Return one page of rows and the cursor for the next page.
+
+    order_by is the list of columns the page is sorted on; the last one must be
+    unique (normally the primary key) so the order is total. When a cursor is
+    given it replaces skip; offset mode is kept for older clients.
+    """
+    query = query.order_by(*order_by)
+    if cursor:
+        values = decode_cursor(cursor, order_by)
+        if len(order_by) == 1:
+            query = query.filter(order_by[0] > values[0])
+        else:
+            query = query.filter(tuple_(*order_by) > tuple_(*values))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit).all()
+
+    next_cursor = None
+    if limit and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, col.key) for col in order_by])
+    return rows, next_cursor
+
+
+def next_cursor_headers(next_cursor: Optional[str]) -> dict:
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+
+def set_next_cursor(response, next_cursor: Optional[str]):
+    """Expose the next page's cursor on the response, if there is one"""
+    response.headers.update(next_cursor_headers(next_cursor))
@@ -0,0 +1,15 @@
+from tempfile import SpooledTemporaryFile
+
+from fastapi import Request
+
+# Uploads bigger than this spill to a temp file instead of staying in memory
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+async def spool_request_body(request: Request) -> SpooledTemporaryFile:
+    """Read a raw request body into a rewound spooled temp file"""
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
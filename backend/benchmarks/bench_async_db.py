@@ -0,0 +1,83 @@
+"""Requests/sec of the sync and async database stacks under high concurrency.
+
+Each stack runs in its own subprocess (USE_ASYNC_DB is read at import time)
+and is driven in-process through httpx's ASGI transport with N concurrent
+clients. Point --database-url at Postgres to measure asyncpg against psycopg2.
+
+Usage (from backend/):
+    python -m benchmarks.bench_async_db --concurrency 200 --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import Timer, setup_database
+
+API = "/api/v1"
+
+
+async def _drive(total: int, concurrency: int, products: int) -> float:
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(products):
+            await client.post(f"{API}/products/", json={"product_name": f"Product {i}"})
+
+        queue = asyncio.Queue()
+        for i in range(total):
+            queue.put_nowait(i % products + 1)
+
+        async def worker():
+            while not queue.empty():
+                product_id = queue.get_nowait()
+                response = await client.get(f"{API}/products/{product_id}")
+                assert response.status_code == 200
+
+        with Timer() as timer:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / timer.elapsed
+
+
+def _run_stack(args):
+    setup_database(args.database_url)
+    rps = asyncio.run(_drive(args.requests, args.concurrency, args.products))
+    print(json.dumps({"rps": rps}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--stack", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stack:
+        return _run_stack(args)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    for stack in ("sync", "async"):
+        env = dict(os.environ, USE_ASYNC_DB="true" if stack == "async" else "false")
+        command = [sys.executable, "-m", "benchmarks.bench_async_db", "--stack", stack,
+                   "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+                   "--products", str(args.products)]
+        if args.database_url:
+            command += ["--database-url", args.database_url]
+        result = subprocess.run(command, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            # e.g. the sync stack deadlocking on pool checkout once threads run out
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+            print(f"{stack:>5}: failed ({error})")
+            continue
+        rps = json.loads(result.stdout.strip().splitlines()[-1])["rps"]
+        print(f"{stack:>5}: {rps:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
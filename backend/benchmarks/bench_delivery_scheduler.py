@@ -0,0 +1,90 @@
+"""How delivery scheduling scales with the number of deliveries in a day.
+
+For each size, times the planner alone (grouping + LPT heap) and the whole
+schedule_deliveries() call against a seeded database (read, plan, executemany
+UPDATE), and reports how even the resulting loads are.
+
+Usage (from backend/):
+    python -m benchmarks.bench_delivery_scheduler --sizes 1000,5000,20000 --staff 25 --locations 300
+"""
+import argparse
+import random
+from datetime import date, datetime
+
+from benchmarks.common import Timer, setup_database
+
+DAY = date(2026, 3, 2)
+
+
+def _seed(deliveries: int, staff: int, locations: int, rng: random.Random):
+    from sqlalchemy import delete, insert
+
+    from app.core.database import SessionLocal
+    from app.models.customer import Customer
+    from app.models.delivery import Delivery
+    from app.models.order import Order
+    from app.models.staff import Staff
+
+    db = SessionLocal()
+    for model in (Delivery, Order, Customer, Staff):
+        db.execute(delete(model))
+    db.execute(insert(Staff), [{"full_name": f"Driver {i}", "role": "logistics"} for i in range(staff)])
+    customer_ids = db.execute(
+        insert(Customer).returning(Customer.customer_id, sort_by_parameter_order=True),
+        # a few busy areas and a long tail, like real routes
+        [{"business_name": f"Customer {i}", "location": f"Area {int(rng.paretovariate(1.2)) % locations}"}
+         for i in range(deliveries // 2 or 1)],
+    ).scalars().all()
+    order_date = datetime.combine(DAY, datetime.min.time())
+    order_ids = db.execute(
+        insert(Order).returning(Order.order_id, sort_by_parameter_order=True),
+        [{"customer_id": rng.choice(customer_ids), "order_date": order_date, "total_amount": 0}
+         for _ in range(deliveries)],
+    ).scalars().all()
+    db.execute(insert(Delivery), [
+        {"order_id": order_id, "delivery_date": order_date, "delivery_status": "pending"} for order_id in order_ids
+    ])
+    db.commit()
+    db.close()
+
+
+def _groups(deliveries: int, locations: int, rng: random.Random) -> dict:
+    groups = {}
+    for delivery_id in range(deliveries):
+        groups.setdefault(f"Area {int(rng.paretovariate(1.2)) % locations}", []).append(delivery_id)
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,5000,20000")
+    parser.add_argument("--staff", type=int, default=25)
+    parser.add_argument("--locations", type=int, default=300)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    setup_database(args.database_url)
+    from app.core.database import SessionLocal
+    from app.services.delivery_scheduler import plan_assignments, schedule_deliveries
+
+    print(f"{args.staff} staff, up to {args.locations} locations")
+    print(f"{'deliveries':>10}  {'plan only':>10}  {'full run':>10}  {'min/max load':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        rng = random.Random(size)
+        groups = _groups(size, args.locations, rng)
+        with Timer() as plan:
+            plan_assignments(groups, {staff_id: 0 for staff_id in range(args.staff)})
+
+        _seed(size, args.staff, args.locations, rng)
+        db = SessionLocal()
+        with Timer() as run:
+            result = schedule_deliveries(db, DAY)
+        db.close()
+        loads = [staff["load"] for staff in result["staff"]]
+        assert result["assigned"] == size
+        print(f"{size:>10}  {plan.elapsed * 1000:>8.1f}ms  {run.elapsed * 1000:>8.1f}ms  "
+              f"{min(loads):>5}/{max(loads):<6}")
+
+
+if __name__ == "__main__":
+    main()
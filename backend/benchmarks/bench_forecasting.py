@@ -0,0 +1,137 @@
+"""Batch demand forecasting over many SKUs against a per-product ORM loop.
+
+Seeds --skus products with --days of synthetic order history (each SKU has
+its own level and weekday profile), then times:
+
+  * the vectorized run (one history query + NumPy), per method
+  * a second, cached read of the same run
+  * the old approach: one ORM query and a Python loop per product, timed on
+    --loop-sample products and extrapolated to all of them
+
+Usage (from backend/):
+    python -m benchmarks.bench_forecasting --skus 10000 --days 112
+"""
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from benchmarks.common import Timer, setup_database
+
+BATCH = 20000
+
+
+def _seed(skus: int, days: int, origin: date, rng: np.random.Generator) -> int:
+    from sqlalchemy import insert
+
+    from app.core.database import SessionLocal
+    from app.models.customer import Customer
+    from app.models.order import Order, OrderItem
+    from app.models.product import Product
+
+    level = rng.lognormal(mean=1.0, sigma=1.0, size=skus)
+    profile = rng.uniform(0.5, 1.5, size=(skus, 7))
+    start = origin - timedelta(days=days)
+
+    db = SessionLocal()
+    db.execute(insert(Customer), [{"business_name": "Bench Hotel"}])
+    db.execute(insert(Product), [{"product_name": f"SKU {i}"} for i in range(skus)])
+
+    lines = 0
+    for d in range(days):
+        day = start + timedelta(days=d)
+        expected = level * profile[:, day.weekday()]
+        sold = rng.poisson(expected)
+        products = np.flatnonzero(sold)
+        # one order per 50 lines, like a day of hotel orders
+        orders = max(1, len(products) // 50)
+        order_ids = db.execute(
+            insert(Order).returning(Order.order_id, sort_by_parameter_order=True),
+            [{"customer_id": 1, "order_date": datetime.combine(day, datetime.min.time()), "total_amount": 0}
+             for _ in range(orders)],
+        ).scalars().all()
+        items = [
+            {"order_id": order_ids[i % orders], "product_id": int(p) + 1, "quantity": int(sold[p]), "unit_price": 1}
+            for i, p in enumerate(products)
+        ]
+        for offset in range(0, len(items), BATCH):
+            db.execute(insert(OrderItem), items[offset:offset + BATCH])
+        lines += len(items)
+    db.commit()
+    db.close()
+    return lines
+
+
+def _per_product_loop(db, product_ids, origin: date, days: int) -> dict:
+    """The approach this replaces: fetch each product's lines as ORM rows and fold them in Python"""
+    from app.models.order import Order, OrderItem
+
+    start = origin - timedelta(days=days)
+    forecasts = {}
+    for product_id in product_ids:
+        items = db.query(OrderItem).join(Order).filter(
+            OrderItem.product_id == product_id,
+            Order.order_date >= start,
+            Order.order_date < origin,
+        ).all()
+        per_day = defaultdict(float)
+        for item in items:
+            per_day[item.order.order_date.date()] += float(item.quantity)
+        weekday_totals = defaultdict(float)
+        for day, units in per_day.items():
+            weekday_totals[day.weekday()] += units
+        recent = sum(u for d, u in per_day.items() if d >= origin - timedelta(days=28)) / 28
+        mean = sum(weekday_totals.values()) / 7 or 1
+        forecasts[product_id] = [
+            recent * weekday_totals[(origin + timedelta(days=h)).weekday()] / mean for h in range(7)
+        ]
+    return forecasts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skus", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=112)
+    parser.add_argument("--loop-sample", type=int, default=200)
+    parser.add_argument("--methods", default="moving_average,seasonal,catboost")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    setup_database(args.database_url)
+    from app.core.database import SessionLocal
+    from app.services import forecasting
+    from app.services.forecasting import ForecastMethod, forecast_demand
+
+    origin = date(2026, 6, 1)
+    with Timer() as seeding:
+        lines = _seed(args.skus, args.days, origin, np.random.default_rng(42))
+    print(f"{args.skus} SKUs, {args.days} days, {lines} order lines (seeded in {seeding.elapsed:.1f}s)")
+
+    db = SessionLocal()
+    with Timer() as loading:
+        forecasting.load_demand_history(db, origin - timedelta(days=args.days), origin)
+    print(f"history query -> matrix:  {loading.elapsed:8.2f}s")
+
+    for name in args.methods.split(","):
+        method = ForecastMethod(name)
+        if method == ForecastMethod.catboost and forecasting.CatBoostRegressor is None:
+            print(f"{name:24s}  skipped (catboost not installed)")
+            continue
+        with Timer() as run:
+            forecast_demand(db, method=method, origin=origin, history_days=args.days, refresh=True)
+        with Timer() as cached:
+            forecast_demand(db, method=method, origin=origin, history_days=args.days)
+        print(f"{name:24s}  {run.elapsed:8.2f}s  (cached read {cached.elapsed * 1000:.2f}ms)")
+
+    sample = list(range(1, min(args.loop_sample, args.skus) + 1))
+    with Timer() as loop:
+        _per_product_loop(db, sample, origin, args.days)
+    estimate = loop.elapsed / len(sample) * args.skus
+    print(f"{'per-product ORM loop':24s}  {loop.elapsed:8.2f}s for {len(sample)} SKUs "
+          f"-> ~{estimate:.0f}s for {args.skus}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
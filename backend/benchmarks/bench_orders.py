@@ -0,0 +1,65 @@
+"""Throughput of POST /orders/bulk against one POST /orders/ per order.
+
+Usage (from backend/):
+    python -m benchmarks.bench_orders --orders 2000 --items 5 --batch 200
+"""
+import argparse
+import random
+
+from benchmarks.common import Timer, make_client, setup_database
+
+API = "/api/v1"
+
+
+def _seed(client, products: int):
+    client.post(f"{API}/customers/", json={"business_name": "Bench Hotel"})
+    for i in range(products):
+        client.post(f"{API}/products/", json={"product_name": f"Product {i}"})
+
+
+def _payloads(count: int, items: int, products: int, rng: random.Random):
+    return [
+        {
+            "customer_id": 1,
+            "order_date": "2026-01-01T06:00:00",
+            "total_amount": "0",
+            "order_items": [
+                {"product_id": rng.randint(1, products), "quantity": "2", "unit_price": "3.50"}
+                for _ in range(items)
+            ],
+        }
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    setup_database(args.database_url)
+    client = make_client()
+    _seed(client, args.products)
+    payloads = _payloads(args.orders, args.items, args.products, random.Random(42))
+
+    with Timer() as single:
+        for payload in payloads:
+            assert client.post(f"{API}/orders/", json=payload).status_code == 201
+
+    with Timer() as bulk:
+        for start in range(0, len(payloads), args.batch):
+            response = client.post(f"{API}/orders/bulk", json={"orders": payloads[start:start + args.batch]})
+            assert response.json()["failed"] == 0
+
+    print(f"{args.orders} orders x {args.items} items, bulk batch size {args.batch}")
+    print(f"single: {single.elapsed:8.2f}s  {args.orders / single.elapsed:10.0f} orders/s")
+    print(f"bulk:   {bulk.elapsed:8.2f}s  {args.orders / bulk.elapsed:10.0f} orders/s")
+    print(f"speedup: {single.elapsed / bulk.elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
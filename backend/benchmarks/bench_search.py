@@ -0,0 +1,94 @@
+"""How the in-process search index scales with the number of records.
+
+Seeds --sizes products, customers and suppliers (a third each) with names made
+of random produce and business words, then times loading the index and the
+median and worst latency of --queries searches with typos in them, against a
+LIKE '%...%' scan of the same tables for comparison.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search --sizes 1000,10000,50000 --queries 200
+"""
+import argparse
+import random
+import statistics
+
+from benchmarks.common import Timer, setup_database
+
+WORDS = [
+    "tomato", "onion", "pepper", "garden", "egg", "plantain", "cassava", "yam", "cabbage", "carrot",
+    "hotel", "kitchen", "lodge", "grill", "catering", "farms", "market", "fresh", "royal", "golden",
+]
+PLACES = ["Accra", "Kumasi", "Osu", "Labadi", "Techiman", "Tamale", "Airport City", "Cantonments"]
+
+
+def _name(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(2, 3))) + f" {rng.randint(1, 999)}"
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    position = rng.randrange(len(word))
+    return word[:position] + word[position + 1:]
+
+
+def _seed(size: int, rng: random.Random):
+    from sqlalchemy import delete, insert
+
+    from app.core.database import SessionLocal
+    from app.models.customer import Customer
+    from app.models.product import Product
+    from app.models.supplier import Supplier
+
+    db = SessionLocal()
+    for model in (Product, Customer, Supplier):
+        db.execute(delete(model))
+    share = size // 3
+    db.execute(insert(Product), [{"product_name": _name(rng)} for _ in range(share)])
+    db.execute(insert(Customer), [{"business_name": _name(rng), "location": rng.choice(PLACES)} for _ in range(share)])
+    db.execute(insert(Supplier), [{"supplier_name": _name(rng), "location": rng.choice(PLACES)} for _ in range(share)])
+    db.commit()
+    db.close()
+
+
+def _like_scan(db, query: str):
+    from app.services.search import SEARCH_ENTITIES
+
+    for _, id_column, name_column, _ in SEARCH_ENTITIES.values():
+        db.query(id_column, name_column).filter(name_column.ilike(f"%{query}%")).limit(20).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    setup_database(args.database_url)
+    from app.core.database import SessionLocal
+    from app.services.search import search, search_index
+
+    print(f"{'records':>8}  {'load':>9}  {'search p50':>10}  {'search max':>10}  {'LIKE p50':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        rng = random.Random(size)
+        _seed(size, rng)
+        queries = [_typo(rng.choice(WORDS), rng) for _ in range(args.queries)]
+
+        db = SessionLocal()
+        search_index.clear()
+        with Timer() as load:
+            search_index.load(db)
+        timings, scans = [], []
+        for query in queries:
+            with Timer() as timer:
+                search(db, query)
+            timings.append(timer.elapsed)
+            with Timer() as scan:
+                _like_scan(db, query)
+            scans.append(scan.elapsed)
+        db.close()
+        print(f"{size:>8}  {load.elapsed * 1000:>7.1f}ms  {statistics.median(timings) * 1000:>8.2f}ms  "
+              f"{max(timings) * 1000:>8.2f}ms  {statistics.median(scans) * 1000:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
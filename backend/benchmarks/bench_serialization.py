@@ -0,0 +1,94 @@
+"""What the row fast path saves per list page, by page size.
+
+Generates --rows of data with benchmarks.datagen, then for each list endpoint
+and page size times building the response body two ways:
+
+  schema  ORM objects validated through the *Read schema and dumped to JSON
+          by Pydantic, which is what response_model does
+  rows    read_columns() row tuples rendered by RowsResponse (orjson)
+
+Both include the query. Reports the median per page over --repeat runs.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --rows 200000 --sizes 10,100,1000
+"""
+import argparse
+import statistics
+from typing import List
+
+from benchmarks.common import Timer, setup_database
+from benchmarks.datagen import generate
+
+
+def _cases():
+    from app.models.customer import Customer
+    from app.models.inventory import InventoryMovement
+    from app.models.order import Order
+    from app.models.product import Product
+    from app.schemas.customer import CustomerRead
+    from app.schemas.inventory import InventoryMovementRead
+    from app.schemas.order import OrderRead
+    from app.schemas.product import ProductRead
+
+    # (name, model, schema, sort key) as the list endpoints page them
+    return [
+        ("products", Product, ProductRead, [Product.product_id]),
+        ("customers", Customer, CustomerRead, [Customer.customer_id]),
+        ("orders", Order, OrderRead, [Order.order_date, Order.order_id]),
+        ("movements", InventoryMovement, InventoryMovementRead,
+         [InventoryMovement.movement_date, InventoryMovement.movement_id]),
+    ]
+
+
+def _median_ms(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        with Timer() as timer:
+            run()
+        timings.append(timer.elapsed)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000, help="size of the generated data (see benchmarks.datagen)")
+    parser.add_argument("--sizes", default="10,100,1000", help="page sizes")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    setup_database(args.database_url)
+    from pydantic import TypeAdapter
+
+    from app.core.database import SessionLocal
+    from app.core.serialization import RowsResponse, read_columns
+    from app.utils.pagination import paginate
+
+    generate(SessionLocal(), args.rows)
+
+    print(f"{'endpoint':<10} {'page':>5} {'returned':>8} {'schema ms':>10} {'rows ms':>8} {'speedup':>8}")
+    for name, model, schema, order_by in _cases():
+        adapter = TypeAdapter(List[schema])
+        for size in (int(s) for s in args.sizes.split(",")):
+            db = SessionLocal()
+
+            def schema_path():
+                objects, _ = paginate(db.query(model), order_by, size)
+                body = adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+                db.expunge_all()  # a request starts with an empty session
+                return body
+
+            def rows_path():
+                rows, _ = paginate(db.query(*read_columns(model, schema)), order_by, size)
+                return RowsResponse(rows).body
+
+            assert schema_path() == rows_path(), f"{name}: the two paths disagree"
+            returned = len(paginate(db.query(*read_columns(model, schema)), order_by, size)[0])
+            schema_ms = _median_ms(schema_path, args.repeat)
+            rows_ms = _median_ms(rows_path, args.repeat)
+            db.close()
+            print(f"{name:<10} {size:>5} {returned:>8} {schema_ms:>10.2f} {rows_ms:>8.2f} {schema_ms / rows_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
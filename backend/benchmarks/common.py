@@ -0,0 +1,40 @@
+"""Shared setup for the benchmark scripts.
+
+Benchmarks run the FastAPI app in-process against a throwaway database. The
+database URL has to be in the environment before anything under app/ is
+imported, so call setup_database() first.
+"""
+import os
+import tempfile
+import time
+
+
+def setup_database(url: str = None) -> str:
+    """Point the app at a benchmark database and create its tables"""
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="erp-bench-"), "bench.db")
+        url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = url
+
+    from app.core.database import Base, engine
+    import app.models  # noqa: F401 - registers every table on Base
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return url
+
+
+def make_client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app)
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,226 @@
+"""Per-endpoint latency and throughput of the API over generated data.
+
+Seeds a database with benchmarks.datagen (or reuses one via --database-url
+--no-generate), then drives the FastAPI app in-process through httpx's ASGI
+transport. Each scenario below runs --warmup unmeasured requests, then
+--requests measured ones from --concurrency concurrent clients. For every
+scenario it records throughput, p50/p95/p99/mean latency, error count and
+SQL statements per request (from app.core.metrics).
+
+Results are written as JSON together with the commit, database and data sizes
+so runs can be compared across commits:
+
+Usage (from backend/):
+    python -m benchmarks.suite --rows 100000 --output before.json
+    python -m benchmarks.suite --rows 100000 --output after.json
+    python -m benchmarks.suite --compare before.json after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import Timer, setup_database
+from benchmarks.datagen import END, generate, plan_sizes
+
+API = "/api/v1"
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+SEARCH_TERMS = ["tomatos", "onoin", "hotel", "royal kitchn", "accra", "plantian", "farms"]
+
+
+def scenarios(sizes: dict) -> list:
+    """(name, method, request factory) for every measured endpoint; factories take an rng"""
+    products, customers, orders = sizes["products"], sizes["customers"], sizes["orders"]
+
+    def new_order(rng):
+        items = [{"product_id": rng.randint(1, products), "quantity": "2", "unit_price": "3.50"}
+                 for _ in range(rng.randint(1, 6))]
+        return f"{API}/orders/", {
+            "customer_id": rng.randint(1, customers),
+            "order_date": f"{END.isoformat()}T08:00:00Z",
+            "total_amount": str(7 * len(items)),
+            "order_items": items,
+        }
+
+    return [
+        ("create_order", "POST", new_order),
+        ("get_order", "GET", lambda rng: (f"{API}/orders/{rng.randint(1, orders)}", None)),
+        ("get_order_with_items", "GET", lambda rng: (f"{API}/orders/{rng.randint(1, orders)}?include=items,payments", None)),
+        ("list_orders", "GET", lambda rng: (f"{API}/orders/?limit=50&skip={rng.randint(0, 20) * 50}", None)),
+        ("list_orders_with_items", "GET", lambda rng: (f"{API}/orders/?limit=50&include=items,payments,customer", None)),
+        ("get_product", "GET", lambda rng: (f"{API}/products/{rng.randint(1, products)}", None)),
+        ("list_products", "GET", lambda rng: (f"{API}/products/?limit=100&skip={rng.randint(0, 5) * 100}", None)),
+        ("list_customers", "GET", lambda rng: (f"{API}/customers/?limit=100", None)),
+        ("list_movements", "GET", lambda rng: (f"{API}/inventory/movements?limit=100", None)),
+        ("get_current_stock", "GET", lambda rng: (f"{API}/inventory/stock{rng.randint(1, products)}", None)),
+        ("get_stock_as_of", "GET", lambda rng: (
+            f"{API}/inventory/stock{rng.randint(1, products)}?as_of=2026-0{rng.randint(1, 6)}-15", None)),
+        ("stock_snapshot", "GET", lambda rng: (f"{API}/inventory/stock?category_id={rng.randint(1, 12)}", None)),
+        ("sales_by_day", "GET", lambda rng: (f"{API}/reports/sales/daily?start_date=2026-01-01", None)),
+        ("receivables_aging", "GET", lambda rng: (f"{API}/reports/receivables/aging?as_of={END.isoformat()}", None)),
+        ("search", "GET", lambda rng: (f"{API}/search/?q={rng.choice(SEARCH_TERMS)}", None)),
+        ("list_deliveries", "GET", lambda rng: (f"{API}/deliveries/?delivery_date={END.isoformat()}", None)),
+    ]
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+async def _run_scenario(client, method: str, factory, requests: int, warmup: int, concurrency: int,
+                        rng: random.Random) -> dict:
+    from app.core.metrics import metrics
+
+    calls = [factory(rng) for _ in range(warmup + requests)]
+    for path, body in calls[:warmup]:
+        await client.request(method, path, json=body)
+
+    metrics.reset()
+    latencies, errors = [], 0
+    pending = iter(calls[warmup:])
+
+    async def worker():
+        nonlocal errors
+        for path, body in pending:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    with Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    statements = sum(h.sum for h in metrics.statements.values())
+    counted = sum(sum(h.counts) for h in metrics.statements.values())
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / timer.elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "sql_per_request": round(statements / counted, 2) if counted else 0.0,
+    }
+
+
+async def _run(args, sizes: dict) -> dict:
+    import httpx
+    from app.main import app
+
+    selected = set(args.only.split(",")) if args.only else None
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, method, factory in scenarios(sizes):
+            if selected is not None and name not in selected:
+                continue
+            results[name] = await _run_scenario(
+                client, method, factory, args.requests, args.warmup, args.concurrency, random.Random(f"{args.seed}:{name}")
+            )
+            r = results[name]
+            print(f"  {name:<24} {r['throughput_rps']:>9.1f}/s  p50 {r['p50_ms']:>8.2f}ms  p95 {r['p95_ms']:>8.2f}ms  "
+                  f"p99 {r['p99_ms']:>8.2f}ms  sql {r['sql_per_request']:>5}  errors {r['errors']}")
+    return results
+
+
+def _commit() -> str:
+    def git(*args):
+        return subprocess.run(["git", *args], capture_output=True, text=True, cwd=os.path.dirname(__file__)).stdout.strip()
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    return commit + ("-dirty" if git("status", "--porcelain", "--untracked-files=no") else "")
+
+
+def compare(base_path: str, head_path: str):
+    """Print how every endpoint moved between two result files"""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+    print(f"{base['commit']} ({base['database']}, {base['rows']} rows) -> {head['commit']} ({head['database']}, {head['rows']} rows)")
+    print(f"{'endpoint':<24} {'p50 ms':>17} {'p95 ms':>17} {'rps':>17} {'sql':>11}")
+
+    def change(old, new):
+        return f"{(new - old) / old * 100:+6.1f}%" if old else "   new"
+
+    for name in sorted(set(base["results"]) | set(head["results"])):
+        old, new = base["results"].get(name), head["results"].get(name)
+        if old is None or new is None:
+            print(f"{name:<24} only in {'head' if old is None else 'base'}")
+            continue
+        print(f"{name:<24} {new['p50_ms']:>9.2f} {change(old['p50_ms'], new['p50_ms'])} "
+              f"{new['p95_ms']:>9.2f} {change(old['p95_ms'], new['p95_ms'])} "
+              f"{new['throughput_rps']:>9.1f} {change(old['throughput_rps'], new['throughput_rps'])} "
+              f"{old['sql_per_request']:>5}->{new['sql_per_request']:<5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="size of the generated data (see benchmarks.datagen)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--only", default=None, help="comma-separated scenario names")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--no-generate", action="store_true",
+                        help="use the data already in --database-url (generated with the same --rows and --seed)")
+    parser.add_argument("--output", default=None, help="result file (default benchmarks/results/<commit>-<db>-<rows>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    sizes = plan_sizes(args.rows)
+    if args.no_generate:
+        if not args.database_url:
+            parser.error("--no-generate needs --database-url")
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        setup_database(args.database_url)
+    from app.core.database import SessionLocal, engine
+
+    if not args.no_generate:
+        db = SessionLocal()
+        with Timer() as seeding:
+            generate(db, args.rows, args.seed)
+        db.close()
+        print(f"Generated {args.rows} rows in {seeding.elapsed:.1f}s")
+
+    database = engine.dialect.name
+    results = asyncio.run(_run(args, sizes))
+    report = {
+        "commit": _commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "database": database,
+        "rows": args.rows,
+        "seed": args.seed,
+        "sizes": sizes,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "async_db": os.environ.get("USE_ASYNC_DB", "false").lower() in ("1", "true"),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}-{database}-{args.rows}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Shared fixtures: a seeded throwaway database and query budgets that fail tests.
+
+The database URL and QUERY_BUDGET_MODE have to be in the environment before
+anything under app/ is imported, so they are set when pytest loads this file.
+Tests never touch DATABASE_URL: they use TEST_DATABASE_URL if it is set (to
+run against Postgres) and otherwise a new SQLite file. Its tables are dropped
+and rebuilt by the migrations.
+"""
+import os
+import tempfile
+
+import pytest
+
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or "sqlite:///" + os.path.join(
+    tempfile.mkdtemp(prefix="erp-tests-"), "test.db"
+)
+# every request that goes over its router's budget fails with the SQL it ran
+os.environ["QUERY_BUDGET_MODE"] = "raise"
+
+from app.core.metrics import count_queries  # noqa: E402
+
+# rows across the base tables; enough for every list route to fill a page
+SEED_ROWS = 3000
+
+
+@pytest.fixture(scope="session", autouse=True)
+def seeded_database():
+    """Build the schema with the Alembic migrations (what ships) and fill it with benchmarks.datagen data"""
+    from sqlalchemy import text
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.init_db import init_db
+    import app.models  # noqa: F401 - registers every table on Base
+    from benchmarks.datagen import generate
+
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    init_db()
+
+    db = SessionLocal()
+    try:
+        return generate(db, SEED_ROWS)
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def count_sql():
+    """count_queries(): count the SQL a block runs, failing with the statements once over a limit.
+
+        def test_something(db, count_sql):
+            with count_sql(statements=2, rows=100) as stats:
+                ...
+    """
+    return count_queries
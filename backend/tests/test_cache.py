@@ -0,0 +1,25 @@
+"""Cached reference data never outlives a write that commits while it loads."""
+from app.core import cache
+from app.routes import products
+
+API = "/api/v1"
+
+
+def test_write_during_load_is_not_cached_over(client, monkeypatch):
+    cache.cache.clear()
+    cached_response = products.cached_response
+
+    def write_while_loading(request, key, load):
+        def load_then_write():
+            content = load()
+            response = client.put(f"{API}/products/2", json={"product_name": "renamed while loading"})
+            assert response.status_code == 200, response.text
+            return content
+        return cached_response(request, key, load_then_write)
+
+    monkeypatch.setattr(products, "cached_response", write_while_loading)
+    stale = client.get(f"{API}/products/2").json()
+    assert stale["product_name"] != "renamed while loading"
+
+    monkeypatch.setattr(products, "cached_response", cached_response)
+    assert client.get(f"{API}/products/2").json()["product_name"] == "renamed while loading"
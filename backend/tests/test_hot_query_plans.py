@@ -0,0 +1,86 @@
+"""Every hot query is served by its index, according to EXPLAIN.
+
+The schema comes from the Alembic migrations (see conftest), so this checks
+the indexes that actually ship, not just the models. On Postgres sequential
+scans are disabled for the check, since small tables would otherwise always
+get one regardless of the available indexes.
+"""
+import json
+import re
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select, text, tuple_
+
+from app.core.database import engine
+from app.models.inventory import InventoryLot, InventoryMovement
+from app.models.order import Order, OrderItem
+
+# (name, expected index, statement)
+HOT_QUERIES = [
+    ("stock by product and movement type", "ix_inventory_movements_product_type",
+     select(func.sum(InventoryMovement.quantity)).where(
+         InventoryMovement.product_id == 1,
+         InventoryMovement.movement_type == "IN",
+     )),
+    ("movements keyset page", "ix_inventory_movements_date_id",
+     select(InventoryMovement).where(
+         tuple_(InventoryMovement.movement_date, InventoryMovement.movement_id) > tuple_(datetime(2026, 1, 1), 1)
+     ).order_by(InventoryMovement.movement_date, InventoryMovement.movement_id).limit(100)),
+    ("stock replay after a checkpoint", "ix_inventory_movements_product_date",
+     select(InventoryMovement.movement_type, func.sum(InventoryMovement.quantity)).where(
+         InventoryMovement.product_id == 1,
+         InventoryMovement.movement_date >= datetime(2026, 1, 1),
+         InventoryMovement.movement_date < datetime(2026, 1, 15),
+     ).group_by(InventoryMovement.movement_type)),
+    ("lots expiring soon", "ix_inventory_lots_expires_at",
+     select(InventoryLot).where(
+         InventoryLot.expires_at <= datetime(2026, 1, 4),
+         InventoryLot.quantity_remaining > 0,
+     ).order_by(InventoryLot.expires_at, InventoryLot.lot_id).limit(100)),
+    ("next open lots of a product", "ix_inventory_lots_product_expiry",
+     select(InventoryLot.lot_id, InventoryLot.expires_at, InventoryLot.quantity_remaining).where(
+         InventoryLot.product_id == 1,
+         InventoryLot.quantity_remaining > 0,
+         InventoryLot.expires_at.isnot(None),
+         tuple_(InventoryLot.expires_at, InventoryLot.lot_id) > tuple_(datetime(2026, 1, 1), 1),
+     ).order_by(InventoryLot.expires_at, InventoryLot.lot_id).limit(50)),
+    ("orders for a customer by date", "ix_orders_customer_date",
+     select(Order).where(
+         Order.customer_id == 1,
+         Order.order_date >= datetime(2026, 1, 1),
+     ).order_by(Order.order_date)),
+    ("orders keyset page", "ix_orders_date_id",
+     select(Order).where(
+         tuple_(Order.order_date, Order.order_id) > tuple_(datetime(2026, 1, 1), 1)
+     ).order_by(Order.order_date, Order.order_id).limit(100)),
+    ("items of an order", "ix_order_items_order_id",
+     select(OrderItem).where(OrderItem.order_id == 1)),
+]
+
+
+def explain(connection, statement) -> str:
+    """The query plan as text for the connection's dialect"""
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        return "\n".join(row[-1] for row in rows)
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        return json.dumps(connection.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar())
+    pytest.skip(f"EXPLAIN check not implemented for {connection.dialect.name}")
+
+
+def full_scans(plan: str) -> list:
+    """Tables the plan reads in full: SQLite's "SCAN table" without an index, Postgres' Seq Scan"""
+    return re.findall(r"^SCAN (\w+)$", plan, re.MULTILINE) + re.findall(r'"Seq Scan".*?"Relation Name": "(\w+)"', plan)
+
+
+@pytest.mark.parametrize("name, index, statement", [
+    pytest.param(name, index, statement, id=name) for name, index, statement in HOT_QUERIES
+])
+def test_hot_query_uses_index(name, index, statement):
+    with engine.connect() as connection, connection.begin():
+        plan = explain(connection, statement)
+    assert not full_scans(plan), f"{name} scans {full_scans(plan)} in full:\n{plan}"
+    assert index in plan, f"{name} does not use {index}:\n{plan}"
@@ -0,0 +1,124 @@
+"""Background jobs: polling and cancelling while they run, and cleaning up their files."""
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services import jobs
+
+API = "/api/v1"
+
+
+@pytest.fixture
+def slow_export(monkeypatch, tmp_path):
+    """Exports in small chunks with a pause after each, so a test can act while one runs"""
+    monkeypatch.setattr(settings, "JOB_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(jobs, "BATCH_SIZE", 50)
+    monkeypatch.setattr(jobs, "PROGRESS_INTERVAL", 0)
+    stream_export = jobs.stream_export
+
+    def slow(*args, **kwargs):
+        for chunk in stream_export(*args, **kwargs):
+            time.sleep(0.05)
+            yield chunk
+
+    monkeypatch.setattr(jobs, "stream_export", slow)
+
+
+def submit(client, kind: str, params: dict) -> int:
+    response = client.post(f"{API}/jobs/", json={"kind": kind, "params": params})
+    assert response.status_code == 202, response.text
+    return response.json()["job_id"]
+
+
+def poll(client, job_id: int, until, timeout: float = 60) -> list:
+    """GET the job until until(job) holds; returns every state seen"""
+    seen, deadline = [], time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get(f"{API}/jobs/{job_id}")
+        assert response.status_code == 200, response.text
+        seen.append(response.json())
+        if until(seen[-1]):
+            return seen
+        time.sleep(0.02)
+    pytest.fail(f"job {job_id} did not get there in {timeout}s: {seen[-1]}")
+
+
+def test_polling_while_export_runs(client, slow_export):
+    job_id = submit(client, "export", {"kind": "inventory-movements", "format": "csv"})
+    seen = poll(client, job_id, lambda job: job["status"] in jobs.FINISHED)
+
+    assert seen[-1]["status"] == jobs.SUCCEEDED, seen[-1]
+    assert any(job["status"] == jobs.RUNNING and 0 < job["progress"] < 1 for job in seen)
+    result = client.get(f"{API}/jobs/{job_id}/result")
+    assert result.status_code == 200
+    assert result.content == client.get(f"{API}/exports/inventory-movements?format=csv").content
+
+
+def test_cancel_reaches_running_export(client, slow_export):
+    job_id = submit(client, "export", {"kind": "inventory-movements", "format": "ndjson"})
+    poll(client, job_id, lambda job: job["status"] == jobs.RUNNING and job["progress"] > 0)
+
+    response = client.post(f"{API}/jobs/{job_id}/cancel")
+    assert response.status_code == 200, response.text
+    assert response.json()["cancel_requested"]
+    seen = poll(client, job_id, lambda job: job["status"] in jobs.FINISHED, timeout=10)
+    assert seen[-1]["status"] == jobs.CANCELLED
+    assert client.get(f"{API}/jobs/{job_id}/result").status_code == 409
+
+
+def test_submit_rejects_unknown_kinds_and_params(client):
+    assert client.post(f"{API}/jobs/", json={"kind": "nope"}).status_code == 400
+    response = client.post(f"{API}/jobs/", json={"kind": "sales_rollups_refresh", "params": {"fulll": True}})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "params", "fulll"]
+
+
+class RecordingContext:
+    """A JobContext stand-in that records progress and cancels after a number of reports"""
+
+    def __init__(self, cancel_after=None):
+        self.reports, self.cancel_after = [], cancel_after
+
+    def progress(self, fraction, message=None):
+        if self.cancel_after is not None and len(self.reports) >= self.cancel_after:
+            raise jobs.JobCancelled()
+        self.reports.append(fraction)
+
+
+def test_stock_rebuild_reports_while_it_rebuilds(db):
+    with pytest.raises(jobs.JobCancelled):
+        jobs._stock_rebuild(db, RecordingContext(cancel_after=3), jobs.JobParams())
+
+    context = RecordingContext()
+    jobs._stock_rebuild(db, context, jobs.JobParams())
+    checkpoint_reports = [fraction for fraction in context.reports if 0.1 < fraction <= 0.4]
+    assert len(checkpoint_reports) > 3
+    assert context.reports == sorted(context.reports) and context.reports[-1] == 1.0
+
+
+def test_cleanup_removes_old_outputs(client, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_OUTPUT_DIR", str(tmp_path))
+    now = datetime.now(timezone.utc)
+    old, recent, running = (
+        Job(kind="export", params={}, status=jobs.SUCCEEDED, finished_at=now - timedelta(days=10)),
+        Job(kind="export", params={}, status=jobs.SUCCEEDED, finished_at=now - timedelta(days=1)),
+        Job(kind="export", params={}, status=jobs.RUNNING),
+    )
+    db.add_all([old, recent, running])
+    db.commit()
+    for job in (old, recent):
+        path = tmp_path / f"job-{job.job_id}.csv"
+        path.write_text("x")
+        job.result = {"file": str(path), "filename": "orders.csv", "media_type": "text/csv"}
+    db.commit()
+    for name in (f"job-{running.job_id}.csv.partial", "job-999999999.csv", "notes.txt"):
+        (tmp_path / name).write_text("x")
+
+    assert jobs.remove_old_outputs(db, days=7) == 2
+    assert sorted(os.listdir(tmp_path)) == sorted([f"job-{recent.job_id}.csv", f"job-{running.job_id}.csv.partial", "notes.txt"])
+    assert client.get(f"{API}/jobs/{old.job_id}/result").status_code == 410
+    assert client.get(f"{API}/jobs/{recent.job_id}/result").status_code == 200
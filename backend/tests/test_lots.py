@@ -0,0 +1,114 @@
+"""Per product, open lots minus outstanding shortfalls always equal the stock balance."""
+from collections import defaultdict
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func
+
+from app.models.inventory import InventoryLot, InventoryLotAllocation, InventoryMovement, StockBalance
+from app.models.product import Product
+
+API = "/api/v1"
+
+
+def lot_mismatches(db) -> dict:
+    """product_id -> open lots minus shortfalls minus the stock balance, where that isn't zero"""
+    differences = defaultdict(Decimal)
+    for product_id, stock_in, stock_out in db.query(StockBalance.product_id, StockBalance.stock_in, StockBalance.stock_out):
+        differences[product_id] -= Decimal(stock_in) - Decimal(stock_out)
+    lots = db.query(InventoryLot.product_id, func.sum(InventoryLot.quantity_remaining)).group_by(InventoryLot.product_id)
+    for product_id, remaining in lots:
+        differences[product_id] += Decimal(remaining)
+    shortfalls = db.query(InventoryMovement.product_id, func.sum(InventoryLotAllocation.quantity)).join(
+        InventoryMovement, InventoryMovement.movement_id == InventoryLotAllocation.movement_id
+    ).filter(InventoryLotAllocation.lot_id.is_(None)).group_by(InventoryMovement.product_id)
+    for product_id, short in shortfalls:
+        differences[product_id] -= Decimal(short)
+    return {product_id: difference for product_id, difference in differences.items() if difference}
+
+
+def test_seeded_lots_match_stock_balances(db):
+    assert lot_mismatches(db) == {}
+
+
+@pytest.fixture
+def new_product(db):
+    product = Product(product_name="Shortfall test", perishability_days=5)
+    db.add(product)
+    db.commit()
+    return product.product_id
+
+
+def _move(client, product_id, movement_type, quantity, day):
+    response = client.post(f"{API}/inventory/movements", json={
+        "product_id": product_id, "movement_type": movement_type, "quantity": quantity,
+        "movement_date": f"2026-03-{day:02d}T08:00:00",
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["movement_id"]
+
+
+def _lots_and_shortfall(db, product_id):
+    db.expire_all()
+    remaining = db.query(func.sum(InventoryLot.quantity_remaining)).filter(InventoryLot.product_id == product_id).scalar()
+    short = db.query(func.sum(InventoryLotAllocation.quantity)).join(
+        InventoryMovement, InventoryMovement.movement_id == InventoryLotAllocation.movement_id
+    ).filter(InventoryLotAllocation.lot_id.is_(None), InventoryMovement.product_id == product_id).scalar()
+    return Decimal(remaining or 0), Decimal(short or 0)
+
+
+def test_next_receipt_settles_a_shortfall(client, db, new_product):
+    _move(client, new_product, "IN", 5, 1)
+    out = _move(client, new_product, "OUT", 8, 2)
+    assert _lots_and_shortfall(db, new_product) == (0, 3)
+
+    _move(client, new_product, "IN", 2, 3)
+    assert _lots_and_shortfall(db, new_product) == (0, 1)
+
+    receipt = _move(client, new_product, "IN", 10, 4)
+    assert _lots_and_shortfall(db, new_product) == (9, 0)
+
+    # the OUT's shortfall was drawn from the last receipt; deleting it opens the shortfall again
+    assert client.delete(f"{API}/inventory/movements/{receipt}").status_code == 204
+    assert _lots_and_shortfall(db, new_product) == (0, 1)
+
+    assert client.delete(f"{API}/inventory/movements/{out}").status_code == 204
+    assert _lots_and_shortfall(db, new_product) == (7, 0)
+    assert lot_mismatches(db) == {}
+
+
+def test_lots_are_read_in_expiry_order_a_batch_at_a_time(client, db, new_product, monkeypatch):
+    from app.services import lots
+
+    monkeypatch.setattr(lots, "LOT_BATCH", 2)
+    reads = []
+    read_more = lots.LotAllocator._read_more
+    monkeypatch.setattr(lots.LotAllocator, "_read_more", lambda self, product_id: reads.append(product_id) or read_more(self, product_id))
+
+    receipts = [_move(client, new_product, "IN", 4, day) for day in (5, 1, 4, 2, 3)]
+    reads.clear()
+    _move(client, new_product, "OUT", 1, 10)
+    assert len(reads) == 1
+
+    out = _move(client, new_product, "OUT", 10, 11)
+    assert len(reads) == 3
+    db.expire_all()
+    drawn = dict(db.query(InventoryLot.movement_id, InventoryLotAllocation.quantity).join(
+        InventoryLotAllocation, InventoryLotAllocation.lot_id == InventoryLot.lot_id
+    ).filter(InventoryLotAllocation.movement_id == out))
+    # received on days 1, 2 and 3, and day 1's lot had already given one to the first OUT
+    assert drawn == {receipts[1]: 3, receipts[3]: 4, receipts[4]: 3}
+    assert lot_mismatches(db) == {}
+
+
+def test_lots_that_never_expire_are_read_last(client, db, monkeypatch):
+    from app.services import lots
+
+    monkeypatch.setattr(lots, "LOT_BATCH", 1)
+    product = Product(product_name="Shelf stable test", perishability_days=None)
+    db.add(product)
+    db.commit()
+    for day in (1, 2, 3):
+        _move(client, product.product_id, "IN", 2, day)
+    _move(client, product.product_id, "OUT", 5, 4)
+    assert _lots_and_shortfall(db, product.product_id) == (1, 0)
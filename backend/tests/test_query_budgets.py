@@ -0,0 +1,85 @@
+"""Routes stay within their router's query budget; going over fails with the SQL listed."""
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.metrics import MetricsMiddleware, QueryBudget, QueryBudgetExceeded
+from app.core.routing import DatabaseRoute
+from app.models.order import Order
+
+API = "/api/v1"
+
+# list and get routes of every router with a budget, each run under QUERY_BUDGET_MODE=raise
+BUDGETED_ROUTES = {
+    "products": ["/products/", "/products/?limit=1000", "/products/1", "/products/categories"],
+    "customers": ["/customers/", "/customers/?limit=1000", "/customers/1"],
+    "suppliers": ["/suppliers/", "/suppliers/?limit=1000", "/suppliers/1"],
+    "orders": [
+        "/orders/", "/orders/?limit=1000", "/orders/1",
+        "/orders/?limit=100&include=items,customer,payments,delivery", "/orders/1?include=items,customer",
+    ],
+    "inventory": [
+        "/inventory/movements", "/inventory/movements?limit=1000", "/inventory/stock", "/inventory/stock1",
+        "/inventory/stock1?as_of=2025-06-30", "/inventory/lots/expiring?days=3650",
+    ],
+}
+
+
+@pytest.mark.parametrize("path", [
+    pytest.param(path, id=path) for paths in BUDGETED_ROUTES.values() for path in paths
+])
+def test_route_within_budget(client, path):
+    response = client.get(API + path)
+    assert response.status_code == 200, response.text
+
+
+def test_paging_through_orders_within_budget(client):
+    path, pages = API + "/orders/?limit=100", 0
+    while path and pages < 5:
+        response = client.get(path)
+        assert response.status_code == 200, response.text
+        cursor = response.headers.get("x-next-cursor")
+        path = f"{API}/orders/?limit=100&cursor={cursor}" if cursor else None
+        pages += 1
+    assert pages > 1
+
+
+def test_n_plus_one_fails_with_its_sql():
+    router = APIRouter(route_class=DatabaseRoute, dependencies=[Depends(QueryBudget(statements=5))])
+
+    @router.get("/orders-with-customers")
+    def orders_with_customers(db: Session = Depends(get_db)):
+        # one lazy load of order.customer per order
+        return [order.customer.business_name for order in db.query(Order).order_by(Order.order_id).limit(50)]
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router)
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        TestClient(app).get("/orders-with-customers")
+    message = str(excinfo.value)
+    assert "GET /orders-with-customers went over its query budget: 6 SQL statements (budget 5)" in message
+    assert "FROM orders" in message and "FROM customers" in message
+
+
+def test_column_rows_count_towards_budget(db, count_sql):
+    with count_sql() as stats:
+        rows = db.query(Order.order_id, Order.total_amount).limit(500).all()
+    assert stats.statements == 1
+    assert stats.rows == len(rows) > 5
+
+    with pytest.raises(QueryBudgetExceeded, match=r"rows \(budget 5\)[\s\S]*FROM orders"):
+        with count_sql(rows=5):
+            db.query(Order.order_id, Order.total_amount).limit(500).all()
+
+
+def test_rows_written_count_towards_budget(db, count_sql):
+    with count_sql() as stats:
+        updated = db.query(Order).filter(Order.order_id <= 3).update(
+            {Order.total_amount: Order.total_amount}, synchronize_session=False
+        )
+    db.rollback()
+    assert stats.rows == updated == 3
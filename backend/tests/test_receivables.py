@@ -0,0 +1,50 @@
+"""A customer's first balance row is created once, however its first orders and payments race."""
+from decimal import Decimal
+
+import pytest
+
+from app.models.customer import Customer
+from app.models.receivable import CustomerBalance
+from app.services import receivables
+
+
+@pytest.fixture
+def new_customer(db):
+    customer = Customer(business_name="First order customer")
+    db.add(customer)
+    db.commit()
+    yield customer.customer_id
+    db.rollback()
+    db.query(CustomerBalance).filter(CustomerBalance.customer_id == customer.customer_id).delete()
+    db.delete(customer)
+    db.commit()
+
+
+def _balance(db, customer_id):
+    balance = db.get(CustomerBalance, customer_id)
+    db.refresh(balance)
+    return balance.billed_amount, balance.amount_paid, balance.outstanding
+
+
+def test_first_deltas_upsert_one_row(db, new_customer):
+    receivables.apply_customer_delta(db, new_customer, Decimal("100"), Decimal("0"))
+    receivables.apply_customer_delta(db, new_customer, Decimal("0"), Decimal("40"))
+    db.commit()
+    assert _balance(db, new_customer) == (Decimal("100"), Decimal("40"), Decimal("60"))
+
+
+def test_losing_insert_falls_back_to_update(db, new_customer, monkeypatch):
+    monkeypatch.setattr(receivables, "UPSERT_INSERTS", {})
+    add_to_balance = receivables._add_to_customer_balance
+
+    def insert_lands_first(db, customer_id, billed, paid):
+        # another transaction creates the row between our update and insert
+        monkeypatch.setattr(receivables, "_add_to_customer_balance", add_to_balance)
+        db.add(CustomerBalance(customer_id=customer_id, billed_amount=10, amount_paid=0, outstanding=10))
+        db.flush()
+        return 0
+
+    monkeypatch.setattr(receivables, "_add_to_customer_balance", insert_lands_first)
+    receivables.apply_customer_delta(db, new_customer, Decimal("100"), Decimal("40"))
+    db.commit()
+    assert _balance(db, new_customer) == (Decimal("110"), Decimal("40"), Decimal("70"))
@@ -0,0 +1,54 @@
+"""Deleting an order or moving it to another day doesn't leave the old day's rollups stale."""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+
+from app.models.order import Order, OrderItem
+from app.services.sales_rollups import EXCLUDED_STATUSES, order_day
+
+API = "/api/v1"
+
+
+def _daily_report(client, day: date) -> dict:
+    response = client.get(f"{API}/reports/sales/daily?start_date={day}&end_date={day}")
+    assert response.status_code == 200, response.text
+    rows = response.json()
+    return rows[0] if rows else {"order_count": 0}
+
+
+def _sold_order(db, skip: int) -> Order:
+    """A seeded order that counts as a sale and has items"""
+    return (
+        db.query(Order)
+        .join(OrderItem, OrderItem.order_id == Order.order_id)
+        .filter(Order.order_status.notin_(EXCLUDED_STATUSES))
+        .group_by(Order.order_id)
+        .having(func.count(OrderItem.order_id) > 0)
+        .order_by(Order.order_id.desc())
+        .offset(skip)
+        .first()
+    )
+
+
+def test_moving_an_order_rebuilds_its_old_day(client, db):
+    assert client.post(f"{API}/reports/sales/refresh?full=true").status_code == 200
+    order = _sold_order(db, skip=0)
+    old_day = order_day(db, order.order_id)
+    before = _daily_report(client, old_day)["order_count"]
+
+    new_date = datetime.combine(old_day - timedelta(days=400), datetime.min.time())
+    response = client.put(f"{API}/orders/{order.order_id}", json={"order_date": new_date.isoformat()})
+    assert response.status_code == 200, response.text
+
+    assert _daily_report(client, old_day)["order_count"] == before - 1
+
+
+def test_deleting_an_order_rebuilds_its_day(client, db):
+    assert client.post(f"{API}/reports/sales/refresh?full=true").status_code == 200
+    order = _sold_order(db, skip=1)
+    day = order_day(db, order.order_id)
+    before = _daily_report(client, day)["order_count"]
+
+    assert client.delete(f"{API}/orders/{order.order_id}").status_code == 204
+
+    assert _daily_report(client, day)["order_count"] == before - 1